@@ -1,146 +1,437 @@
-from fastapi import APIRouter, HTTPException
-from typing import Optional
-from ..models.analysis import AnalysisRequest, AnalysisResponse, SaveMarkdownRequest
-from ..services.naver_crawler import NaverFinancialCrawler
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+from ..models.analysis import (
+    AnalysisJobResponse,
+    AnalysisRequest,
+    AnalysisResponse,
+    BatchAnalysisItem,
+    BatchAnalysisItemResult,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+    ReportFile,
+    SaveMarkdownRequest,
+)
+from ..services.container import services
+from ..services.analysis_cache import get_analysis_cache
+from ..services.financial_table import FinancialTable
+from ..services.job_queue import Job, QueueFullError
+from ..services.metrics import bind_timings, current_timings, stage
 from ..services.perplexity_service import PerplexityService
+from ..services.prompt_templates import DEFAULT_TEMPLATE
+from ..services.resilience import UpstreamBusyError, retry_after_headers
 from ..services.supabase_service import SupabaseReportStore
-import pandas as pd
-from pathlib import Path
+import asyncio
+import json
+import logging
 import os
+import time
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
-crawler = NaverFinancialCrawler(save_dir="temp")
 
-@router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_investment(request: AnalysisRequest, model: Optional[str] = None):
-    """
-    기업 재무정보를 크롤링하고 Perplexity API를 통해 투자 분석 보고서 생성
-    """
-    # 1. 재무 데이터 크롤링 (시장 구분)
+async def _crawl_financial_data(request: AnalysisRequest) -> FinancialTable:
+    """분석 요청에 필요한 재무 표 크롤링 (시장 구분)"""
     market = (request.market or "국내").strip()
-    if market == "국내":
-        csv_path, financial_data = await crawler.fetch_financials(
-            request.stock_code,
-            request.compare_periods
-        )
-    else:
+    if market != "국내":
         # 해외 시장: 현재는 네이버 크롤러가 국내만 지원. 임시로 재무데이터 없이 진행.
-        csv_path, financial_data = None, []
+        return FinancialTable()
 
-    if market == "국내" and not financial_data:
+    csv_path, table = await services.crawler.fetch_table(
+        request.stock_code,
+        request.compare_periods
+    )
+    if not table:
         # 상세 오류 파악 (예: lxml 미설치)
-        last_error = getattr(crawler, "last_error", None)
+        last_error = getattr(services.crawler, "last_error", None)
         if last_error and "lxml" in last_error.lower():
             raise HTTPException(
                 status_code=500,
                 detail="lxml 라이브러리가 설치되어 있지 않습니다. backend 디렉토리에서 'pip install lxml' 실행 후 다시 시도하세요."
             )
         raise HTTPException(status_code=404, detail="재무 데이터를 찾을 수 없습니다.")
+    return table
 
-    # 2. Perplexity API를 통한 분석
-    # 우선순위: 쿼리 파라미터 model > 요청 body model > 환경변수
-    effective_model = model or request.model
-    perplexity_service = PerplexityService(request.api_key, model=effective_model)
-    try:
-        api_response = await perplexity_service.generate_investment_analysis(
-            request.stock_name,
-            financial_data,
-            request.compare_periods,
-                stock_code=request.stock_code,
-                market=request.market,
-        )
-    except ValueError as e:  # 잘못된 요청 (모델 등)
-        raise HTTPException(status_code=400, detail=str(e))
-    except PermissionError as e:  # 인증 오류
-        raise HTTPException(status_code=401, detail=str(e))
-    except RuntimeError as e:  # 서버 / 네트워크 / rate limit 등
-        raise HTTPException(status_code=502, detail=str(e))
-    except Exception as e:  # 기타 예외
-        raise HTTPException(status_code=500, detail=f"예상치 못한 오류: {e}")
 
-    # 3. 응답 정리
-    formatted_response = perplexity_service.format_analysis_response(api_response)
+def _service_error_to_http(e: Exception) -> HTTPException:
+    """PerplexityService 예외를 HTTP 오류로 변환"""
+    if isinstance(e, UpstreamBusyError):  # rate limit (429) / 서킷 열림 (503)
+        return HTTPException(status_code=e.status_code, detail=str(e), headers=retry_after_headers(e))
+    if isinstance(e, ValueError):  # 잘못된 요청 (모델 등)
+        return HTTPException(status_code=400, detail=str(e))
+    if isinstance(e, PermissionError):  # 인증 오류
+        return HTTPException(status_code=401, detail=str(e))
+    if isinstance(e, RuntimeError):  # 서버 / 네트워크 / rate limit 등
+        return HTTPException(status_code=502, detail=str(e))
+    return HTTPException(status_code=500, detail=f"예상치 못한 오류: {e}")
 
-    # 재무 데이터 표 생성 (Markdown)
-    try:
-        # financial_data 는 period별 dict 리스트 -> key: "기간 - 항목" 형식
-        # 이를 기간/항목으로 재구조화
-        rows = {}
-        periods = set()
-        for entry in financial_data:
-            for k, v in entry.items():
-                if ' - ' in k:
-                    period, metric = k.split(' - ', 2)
-                else:
-                    # fallback
-                    period, metric = '기간', k
-                periods.add(period)
-                rows.setdefault(metric, {})[period] = v
-        periods = sorted(list(periods))
-        df = pd.DataFrame.from_dict(rows, orient='index')[periods]
-        df.index.name = '지표'
-        financial_table_md = df.reset_index().to_markdown(index=False)
-    except Exception:
-        financial_table_md = "(재무 표 생성 실패)"
-
-    response = AnalysisResponse(
+
+def _report_market(request: AnalysisRequest) -> str:
+    """reports 테이블의 market 값"""
+    return "KOSPI" if (request.market or "국내").strip() == "국내" else "NASDAQ"
+
+
+def _reuse_allowed(request: AnalysisRequest) -> bool:
+    return request.use_cache and not request.force_refresh
+
+
+async def _find_saved_report(request: AnalysisRequest, model: str) -> Optional[AnalysisResponse]:
+    """같은 시장/종목/모델/템플릿/기간으로 최근 저장된 보고서가 있으면 응답으로 변환"""
+    if not _reuse_allowed(request) or not SupabaseReportStore.configured():
+        return None
+    report = await services.report_lookup.find(
+        _report_market(request), request.stock_code, model,
+        request.template or DEFAULT_TEMPLATE, request.compare_periods,
+    )
+    if report is None:
+        return None
+    logger.info("저장된 보고서 재사용", extra={"stock_code": request.stock_code, "model": model})
+    return AnalysisResponse(
         stock_code=request.stock_code,
         stock_name=request.stock_name,
         compare_periods=request.compare_periods,
-    analysis=formatted_response["analysis"],
-    financial_table=financial_table_md,
-        citations=formatted_response["citations"],
-        model=formatted_response["model"],
-        usage=formatted_response["usage"],
-        created=formatted_response["created"]
+        analysis=report.get("analysis", ""),
+        financial_table=report.get("financial_table", ""),
+        citations=report.get("citations") or [],
+        model=report.get("model") or model,
+        usage={**(report.get("usage") or {}), "cache_hit": True, "cache_source": "supabase"},
+        created=int(report.get("created") or 0),
     )
-    # 4. Supabase 저장 (실패하더라도 API 응답은 반환)
-    try:
-        saved_market = "KOSPI" if market == "국내" else "NASDAQ"
-        SupabaseReportStore.save_report(
-            market=saved_market,
-            symbol=request.stock_code,
-            name=request.stock_name,
-            sector=None,
-            report={
-                "analysis": response.analysis,
-                "financial_table": response.financial_table,
-                "citations": response.citations,
-                "model": response.model,
-                "usage": response.usage,
-                "created": response.created,
-            },
-            user_id=None,
+
+
+def _save_report(request: AnalysisRequest, response: AnalysisResponse, model: str) -> None:
+    """Supabase 저장 대기열에 추가 (저장은 백그라운드에서 진행, 실패하더라도 API 응답은 반환)
+
+    model 은 요청한 모델명으로, 이후 같은 요청이 저장 완료 전에도 재사용할 수 있도록 로컬 LRU 에 넣는 키다.
+    """
+    if not SupabaseReportStore.configured():
+        logger.warning("Supabase 설정이 없어 보고서 저장 생략", extra={"stock_code": request.stock_code})
+        return
+    market = _report_market(request)
+    template = request.template or DEFAULT_TEMPLATE
+    report = {
+        "analysis": response.analysis,
+        "financial_table": response.financial_table,
+        "citations": response.citations,
+        "model": response.model,
+        "usage": response.usage,
+        "created": response.created,
+        "template": template,
+        "compare_periods": request.compare_periods,
+    }
+    row = SupabaseReportStore.build_row(
+        market=market,
+        symbol=request.stock_code,
+        name=request.stock_name,
+        sector=None,
+        report=report,
+        user_id=None,
+    )
+    services.reports.enqueue(row)
+    services.report_lookup.remember(market, request.stock_code, model, template, request.compare_periods, report)
+
+
+async def _run_analysis(
+    request: AnalysisRequest,
+    model: Optional[str] = None,
+    crawl_limit: Optional[asyncio.Semaphore] = None,
+    llm_limit: Optional[asyncio.Semaphore] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> AnalysisResponse:
+    """저장된 보고서 조회 -> 크롤링 -> Perplexity 분석 -> 재무 표 -> Supabase 저장 (실패 시 HTTPException)
+
+    crawl_limit / llm_limit 가 주어지면 해당 단계의 동시 실행 수를 제한한다 (배치 분석용).
+    timings 가 주어지면 단계별 소요 시간(초)을 기록한다 (작업 대기열용, 미지정 시 요청의 Server-Timing 으로).
+    """
+    with bind_timings(timings):
+        # 우선순위: 쿼리 파라미터 model > 요청 body model > 환경변수
+        effective_model = model or request.model
+        perplexity_service = PerplexityService(request.api_key, model=effective_model)
+
+        # 0. 최근 저장된 같은 보고서가 있으면 그대로 반환 (force_refresh 로 무시)
+        saved = await _find_saved_report(request, perplexity_service.model)
+        if saved is not None:
+            return saved
+
+        # 1. 재무 데이터 크롤링 (시장 구분)
+        with stage("crawl"):
+            async with crawl_limit or nullcontext():
+                table = await _crawl_financial_data(request)
+        financial_data = table.to_records()
+
+        # 2. Perplexity API를 통한 분석
+        try:
+            with stage("llm"):
+                async with llm_limit or nullcontext():
+                    api_response = await perplexity_service.generate_investment_analysis(
+                        request.stock_name,
+                        financial_data,
+                        request.compare_periods,
+                        stock_code=request.stock_code,
+                        market=request.market,
+                        use_cache=_reuse_allowed(request),
+                        template=request.template,
+                    )
+        except Exception as e:
+            raise _service_error_to_http(e)
+
+        # 3. 응답 정리
+        with stage("table"):
+            formatted_response = perplexity_service.format_analysis_response(api_response)
+            financial_table = table.to_markdown()
+
+        response = AnalysisResponse(
+            stock_code=request.stock_code,
+            stock_name=request.stock_name,
+            compare_periods=request.compare_periods,
+            analysis=formatted_response["analysis"],
+            financial_table=financial_table,
+            citations=formatted_response["citations"],
+            model=formatted_response["model"],
+            usage=formatted_response["usage"],
+            created=formatted_response["created"]
         )
-    except Exception as e:
-        print(f"[Supabase] 저장 실패: {e}")
+        # 4. Supabase 저장 대기열에 추가 (저장은 백그라운드, 실패하더라도 API 응답은 반환)
+        with stage("save"):
+            _save_report(request, response, perplexity_service.model)
     return response
 
 
+@router.post("/analyze", response_model=AnalysisResponse)
+async def analyze_investment(request: AnalysisRequest, model: Optional[str] = None):
+    """
+    기업 재무정보를 크롤링하고 Perplexity API를 통해 투자 분석 보고서 생성
+    """
+    return await _run_analysis(request, model)
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_investment_batch(batch: BatchAnalysisRequest, model: Optional[str] = None):
+    """
+    여러 종목의 투자 분석 보고서를 한 번에 생성
+
+    종목별 크롤링과 Perplexity 호출을 각각의 동시 실행 한도 안에서 병렬로 진행하므로
+    전체 소요 시간은 합계가 아니라 가장 느린 종목 수준에 가깝다. 종목별 실패는 결과에 담긴다.
+    """
+    crawl_limit = asyncio.Semaphore(batch.crawl_concurrency or int(os.getenv("BATCH_CRAWL_CONCURRENCY", "8")))
+    llm_limit = asyncio.Semaphore(batch.llm_concurrency or int(os.getenv("BATCH_LLM_CONCURRENCY", "4")))
+    started = time.perf_counter()
+
+    async def run_item(item: BatchAnalysisItem) -> BatchAnalysisItemResult:
+        item_started = time.perf_counter()
+        request = AnalysisRequest(
+            api_key=batch.api_key, use_cache=batch.use_cache, template=batch.template,
+            force_refresh=batch.force_refresh, **item.model_dump()
+        )
+        try:
+            result = await _run_analysis(request, model or item.model or batch.model, crawl_limit, llm_limit)
+            return BatchAnalysisItemResult(
+                stock_code=item.stock_code,
+                stock_name=item.stock_name,
+                ok=True,
+                status_code=200,
+                result=result,
+                elapsed=time.perf_counter() - item_started,
+            )
+        except Exception as e:
+            error = e if isinstance(e, HTTPException) else _service_error_to_http(e)
+            return BatchAnalysisItemResult(
+                stock_code=item.stock_code,
+                stock_name=item.stock_name,
+                ok=False,
+                status_code=error.status_code,
+                error=str(error.detail),
+                elapsed=time.perf_counter() - item_started,
+            )
+
+    results = await asyncio.gather(*(run_item(item) for item in batch.items))
+    succeeded = sum(1 for r in results if r.ok)
+    return BatchAnalysisResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def _job_response(job: Job) -> AnalysisJobResponse:
+    return AnalysisJobResponse(
+        job_id=job.id,
+        status=job.status,
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        timings=job.timings,
+        result=job.result,
+        error=job.error,
+        status_code=job.status_code,
+    )
+
+
+@router.post("/jobs", response_model=AnalysisJobResponse, status_code=202)
+async def submit_analysis_job(request: AnalysisRequest, model: Optional[str] = None):
+    """
+    /analyze 를 백그라운드 작업으로 등록하고 작업 ID를 즉시 반환
+
+    결과는 GET /jobs/{job_id} 로 조회(?wait=초 로 롱 폴링)하고 DELETE 로 취소한다.
+    """
+    try:
+        job = await services.jobs.submit(lambda timings: _run_analysis(request, model, timings=timings))
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(job_id: str, wait: float = Query(0, ge=0, le=60, description="완료까지 대기할 최대 시간(초)")):
+    """작업 상태 조회 (wait > 0 이면 완료되거나 시간이 지날 때까지 대기)"""
+    job = await services.jobs.wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _job_response(job)
+
+
+@router.delete("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def cancel_analysis_job(job_id: str):
+    """대기 중이거나 실행 중인 작업 취소"""
+    job = services.jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    # 실행 중 작업은 취소가 반영될 때까지 잠시 대기
+    job = await services.jobs.wait(job_id, 1.0)
+    return _job_response(job)
+
+
+@router.get("/stats")
+async def analysis_stats():
+    """Perplexity 응답 캐시 / 작업 대기열 / 보고서 저장 대기열 / 저장 보고서 재사용 통계"""
+    return {
+        "perplexity_cache": get_analysis_cache().stats(),
+        "jobs": services.jobs.stats(),
+        "reports": services.reports.stats(),
+        "report_lookup": services.report_lookup.stats(),
+    }
+
+
+def _sse(event: str, data: Dict) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/analyze/stream")
+async def analyze_investment_stream(request: AnalysisRequest, model: Optional[str] = None):
+    """
+    /analyze 의 스트리밍(SSE) 버전
+
+    이벤트 순서: financial (크롤링 직후 재무 표) -> token (분석 본문 조각, 반복)
+    -> done (citations/usage/model/created). 생성 중 오류는 error 이벤트로 전달된다.
+    """
+    # 크롤링 오류는 스트림 시작 전에 일반 HTTP 오류로 응답
+    with stage("crawl"):
+        table = await _crawl_financial_data(request)
+    with stage("table"):
+        financial_data = table.to_records()
+        financial_table = table.to_markdown()
+
+    effective_model = model or request.model
+    perplexity_service = PerplexityService(request.api_key, model=effective_model)
+    # 스트리밍 응답의 Server-Timing 헤더에는 생성 전 단계만 담기므로 전체 단계는 done 이벤트로 전달
+    timings = current_timings()
+    if timings is None:
+        timings = {}
+
+    async def events():
+        yield _sse("financial", {
+            "stock_code": request.stock_code,
+            "stock_name": request.stock_name,
+            "compare_periods": request.compare_periods,
+            "financial_data": financial_data,
+            "financial_table": financial_table,
+        })
+        try:
+            async for chunk in perplexity_service.stream_investment_analysis(
+                request.stock_name,
+                financial_data,
+                request.compare_periods,
+                stock_code=request.stock_code,
+                market=request.market,
+                use_cache=_reuse_allowed(request),
+                template=request.template,
+            ):
+                if chunk["type"] == "token":
+                    yield _sse("token", {"content": chunk["content"]})
+                    continue
+                response = AnalysisResponse(
+                    stock_code=request.stock_code,
+                    stock_name=request.stock_name,
+                    compare_periods=request.compare_periods,
+                    analysis=chunk["analysis"],
+                    financial_table=financial_table,
+                    citations=chunk["citations"],
+                    model=chunk["model"],
+                    usage=chunk["usage"],
+                    created=chunk["created"],
+                )
+                yield _sse("done", {
+                    "citations": response.citations,
+                    "model": response.model,
+                    "usage": response.usage,
+                    "created": response.created,
+                    "timings": dict(timings),
+                })
+                _save_report(request, response, perplexity_service.model)
+        except Exception as e:
+            error = _service_error_to_http(e)
+            yield _sse("error", {"status_code": error.status_code, "detail": error.detail})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/save_markdown")
 async def save_markdown(payload: SaveMarkdownRequest):
-    """프로젝트 루트 하위 outputs 디렉토리에 마크다운 저장"""
+    """보고서 파일 저장소(기본: 프로젝트 루트 하위 outputs)에 마크다운 저장"""
+    # 서버 저장 활성 여부 (기본: 활성). 비활성화 시 저장하지 않고 안내만 반환
+    save_enabled = os.getenv("ENABLE_SERVER_SAVE", "true").lower() in ("1", "true", "yes", "on")
+    if not save_enabled:
+        return {"saved": False, "path": None, "disabled": True, "message": "Server-side saving disabled by config."}
     try:
-        # 서버 저장 활성 여부 (기본: 활성). 비활성화 시 저장하지 않고 안내만 반환
-        save_enabled = os.getenv("ENABLE_SERVER_SAVE", "true").lower() in ("1", "true", "yes", "on")
-        if not save_enabled:
-            return {"saved": False, "path": None, "disabled": True, "message": "Server-side saving disabled by config."}
-
-        # backend/app/api/analysis.py 기준으로 상위 3단계를 올라가 프로젝트 루트 추정
-        project_root = Path(__file__).resolve().parents[3]
-        outputs_dir = project_root / "outputs"
-        outputs_dir.mkdir(parents=True, exist_ok=True)
-
-        # 파일명 결정
-        filename = payload.filename or "investment-report.md"
-        # 간단한 파일명 보호
-        safe_name = filename.replace("../", "").replace("..\\", "").strip()
-        if not safe_name.endswith(".md"):
-            safe_name += ".md"
-
-        target = outputs_dir / safe_name
-        target.write_text(payload.content, encoding="utf-8")
-        rel = target.relative_to(project_root)
-        return {"saved": True, "path": str(rel), "message": "Saved to outputs"}
+        saved = await services.report_files.save(payload.filename, payload.content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 저장 실패: {e}")
+    return {
+        "saved": True,
+        "path": saved.path,
+        "message": "Saved to outputs",
+        "sha256": saved.sha256,
+        "size": saved.size,
+        "deduplicated": saved.deduplicated,
+    }
+
+
+@router.get("/reports", response_model=List[ReportFile])
+async def list_report_files(limit: int = Query(100, ge=1, le=1000)):
+    """저장된 보고서 파일 목록 (최신순)"""
+    infos = await services.report_files.list(limit)
+    return [ReportFile(name=i.name, size=i.size, modified=i.modified, compressed=i.compressed) for i in infos]
+
+
+@router.get("/reports/{name}")
+async def download_report_file(name: str):
+    """보고서 파일 다운로드 (파일에서 바로 스트리밍, gzip 저장본은 Content-Encoding: gzip)"""
+    info = await services.report_files.find(name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="보고서 파일을 찾을 수 없습니다.")
+    headers = {"Content-Encoding": "gzip"} if info.compressed else None
+    return FileResponse(
+        info.path,
+        media_type="text/markdown; charset=utf-8",
+        filename=name[: -len(".gz")] if info.compressed else name,
+        headers=headers,
+    )
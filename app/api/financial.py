@@ -1,30 +1,180 @@
-from fastapi import APIRouter, HTTPException
-from ..models.financial import FinancialRequest, FinancialResponse
-from ..services.naver_crawler import NaverFinancialCrawler
+import asyncio
+from dataclasses import asdict
+from typing import List, Optional, Union
+
+import pandas as pd
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from ..models.financial import (
+    ColumnarFinancialResponse,
+    FinancialHistoryResponse,
+    FinancialRequest,
+    FinancialResponse,
+    FinancialSnapshot,
+    PrewarmStatus,
+    ScreenRequest,
+    ScreenResponse,
+    ScreenRow,
+)
+from ..services.container import services
+from ..services.resilience import UpstreamBusyError
 
 router = APIRouter()
-crawler = NaverFinancialCrawler(save_dir="temp")
 
-@router.post("/crawl", response_model=FinancialResponse)
-async def crawl_financial_data(request: FinancialRequest):
+# 표 형식 -> 응답 Content-Type
+_TABLE_MEDIA_TYPES = {
+    "markdown": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.post(
+    "/crawl",
+    response_model=FinancialResponse,
+    responses={200: {"description": "format=columnar 이면 ColumnarFinancialResponse",
+                     "model": Union[FinancialResponse, ColumnarFinancialResponse]}},
+)
+async def crawl_financial_data(
+    request: FinancialRequest,
+    fmt: str = Query("json", alias="format", pattern="^(json|columnar|markdown|html|csv)$",
+                     description="json (기본) | columnar | markdown | html | csv"),
+):
     """
     네이버 증권에서 기업 재무정보를 크롤링하여 반환
+
+    format 이 columnar 이면 periods / metrics / values 행렬(ColumnarFinancialResponse)로,
+    markdown / html / csv 이면 기간 x 지표 표를 해당 형식으로 반환한다.
     """
     try:
-        csv_path, financial_data = await crawler.fetch_financials(
+        csv_path, table = await services.crawler.fetch_table(
             request.stock_code,
             request.compare_periods
         )
         
-        if not financial_data:
+        if not table:
             raise HTTPException(status_code=404, detail="재무 데이터를 찾을 수 없습니다.")
+
+        if fmt == "columnar":
+            # 직접 만든 값이라 검증은 가볍고, 직렬화는 pydantic 에서 한 번에 처리
+            columnar = ColumnarFinancialResponse(
+                stock_code=request.stock_code,
+                stock_name=request.stock_name,
+                compare_periods=request.compare_periods,
+                periods=table.periods,
+                metrics=table.metrics,
+                values=table.numeric_values(),
+                csv_path=csv_path,
+            )
+            return Response(content=columnar.model_dump_json(), media_type="application/json")
+        if fmt != "json":
+            return Response(content=table.render(fmt), media_type=_TABLE_MEDIA_TYPES[fmt])
         
         return FinancialResponse(
             stock_code=request.stock_code,
             stock_name=request.stock_name,
             compare_periods=request.compare_periods,
-            financial_data=financial_data,
+            financial_data=table.to_records(),
             csv_path=csv_path
         )
+    except UpstreamBusyError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def crawler_stats():
+    """크롤러 캐시 / 요청 병합 / 스냅샷 저장 통계"""
+    return services.crawler.stats()
+
+
+@router.get("/snapshots/{stock_code}", response_model=List[FinancialSnapshot])
+async def list_snapshots(stock_code: str, limit: int = Query(20, ge=1, le=500)):
+    """종목의 저장된 재무표 스냅샷 목록 (최신순)"""
+    history = await asyncio.to_thread(services.crawler.snapshots.history, stock_code, None, limit)
+    return [FinancialSnapshot(**asdict(info)) for info in history]
+
+
+@router.get("/prewarm/status", response_model=PrewarmStatus)
+async def prewarm_status():
+    """사전 워밍 진행 상황과 종목별 캐시 신선도"""
+    return services.prewarm.snapshot()
+
+
+def _matrix(frame: pd.DataFrame) -> List[List[Optional[float]]]:
+    return frame.astype(object).where(frame.notna(), None).values.tolist()
+
+
+@router.get("/history/{stock_code}", response_model=FinancialHistoryResponse)
+async def financial_history(
+    stock_code: str,
+    freq: str = Query("Y", pattern="^[YyQq]$", description="Y (연간) | Q (분기)"),
+    periods: List[str] = Query([], description="조회할 기간 (반복 또는 쉼표 구분, 예: 2021.12,2024.12)"),
+    start: Optional[str] = Query(None, description="periods 미지정 시 시작 기간 (포함)"),
+    end: Optional[str] = Query(None, description="periods 미지정 시 끝 기간 (포함)"),
+    refresh: bool = Query(False, description="저장된 시계열과 상관없이 페이지를 다시 받기"),
+):
+    """
+    종목의 재무 시계열과 직전 기간(분기는 전년 동기 포함) 대비 증감률
+
+    재무제표 페이지를 증분 크롤링해 로컬에 쌓은 시계열에서 응답하므로, 이미 받은 기간은 다시 요청하지 않는다.
+    """
+    requested = [period.strip() for value in periods for period in value.split(",") if period.strip()]
+    try:
+        series = await services.history.series(stock_code, freq, requested or None, start, end, refresh=refresh)
+    except UpstreamBusyError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"재무 시계열 수집 실패: {e}")
+    if not series.periods:
+        raise HTTPException(status_code=404, detail="요청한 기간의 재무 데이터가 없습니다.")
+    return FinancialHistoryResponse(
+        stock_code=series.stock_code,
+        freq=series.freq,
+        periods=series.periods,
+        metrics=series.metrics,
+        values=_matrix(series.values),
+        growth=_matrix(series.growth),
+        yoy_growth=_matrix(series.yoy_growth) if series.yoy_growth is not None else None,
+        missing_periods=series.missing_periods,
+        fetched_at=series.fetched_at,
+        refreshed=series.refreshed,
+    )
+
+
+@router.post("/screen", response_model=ScreenResponse)
+async def screen(request: ScreenRequest):
+    """
+    캐시된 종목 전체에서 지표 조건으로 걸러 정렬한 상위 N 개
+
+    크롤러 캐시(사전 워밍 포함)에 있는 종목만 대상이며, 업스트림 요청은 하지 않는다.
+    """
+    try:
+        result = await asyncio.to_thread(
+            services.screener.screen,
+            [(f.metric, f.op, f.value) for f in request.filters],
+            request.sort_by,
+            request.descending,
+            request.limit,
+            request.freq,
+            request.period,
+            request.tickers,
+            request.metrics,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    values = _matrix(result.rows[result.metrics]) if result.metrics else [[] for _ in range(len(result.rows))]
+    return ScreenResponse(
+        metrics=result.metrics,
+        rows=[
+            ScreenRow(stock_code=code, period=period, values=row)
+            for code, period, row in zip(result.rows["stock_code"], result.rows["period"], values)
+        ],
+        universe=result.universe,
+        matched=result.matched,
+        cache_version=result.version,
+        built_at=result.built_at,
+    )
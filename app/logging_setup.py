@@ -0,0 +1,112 @@
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from typing import Dict, Optional
+
+# LogRecord 기본 속성 (이외의 속성은 extra 로 넘긴 구조화 필드로 취급)
+_RESERVED = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime", "taskName"}
+
+# 프롬프트/응답 본문을 INFO 로그에 함께 남길 비율 (0~1). DEBUG 레벨이면 항상 남긴다
+PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0"))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def _fields(record: logging.LogRecord) -> Dict:
+    return {k: v for k, v in record.__dict__.items() if k not in _RESERVED and not k.startswith("_")}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (ts, level, logger, message + 구조화 필드)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """기존 텍스트 형식 뒤에 구조화 필드를 key=value 로 덧붙인다"""
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = _fields(record)
+        if not fields:
+            return text
+        pairs = " ".join(f"{k}={v}" for k, v in fields.items() if k != "body")
+        if "body" in fields:
+            return f"{text} {pairs}\n{fields['body']}"
+        return f"{text} {pairs}"
+
+
+def setup_logging() -> None:
+    """루트 로거를 큐 기반 비동기 핸들러로 구성 (LOG_LEVEL, LOG_FORMAT=text|json)
+
+    요청 처리 코드는 큐에 레코드를 넣기만 하고, 실제 stdout 출력은 QueueListener 스레드가 한다.
+    여러 번 호출해도 한 번만 설정된다.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if os.getenv("LOG_FORMAT", "text").lower() == "json" else KeyValueFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    _handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_handler)
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 출력하고 리스너 종료"""
+    global _listener, _handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    _listener = _handler = None
+
+
+atexit.register(shutdown_logging)
+
+
+def payload_fields(name: str, body: str) -> Dict:
+    """본문 대신 남기는 길이/해시 필드"""
+    return {
+        f"{name}_length": len(body),
+        f"{name}_sha256": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+    }
+
+
+def log_payload(logger: logging.Logger, level: int, msg: str, name: str, body: str, **fields) -> None:
+    """프롬프트/응답 같은 큰 본문 로그
+
+    길이와 SHA-256 은 항상 남기고, 본문은 DEBUG 레벨이 켜져 있거나
+    LOG_PAYLOAD_SAMPLE_RATE 비율로 샘플링된 경우에만 body 필드로 남긴다.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    extra = {**fields, **payload_fields(name, body)}
+    if logger.isEnabledFor(logging.DEBUG) or (PAYLOAD_SAMPLE_RATE > 0 and random.random() < PAYLOAD_SAMPLE_RATE):
+        extra["body"] = body
+    logger.log(level, msg, extra=extra)
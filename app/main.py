@@ -1,18 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .api import financial, analysis
-import logging
+from .services.container import services
+from .services.analysis_cache import get_analysis_cache
+from .services.metrics import REGISTRY, MetricsMiddleware
+from .services.resilience import UpstreamBusyError, retry_after_headers, upstream_stats
+from .logging_setup import setup_logging, shutdown_logging
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 로깅 설정 (큐 기반 비동기 출력, LOG_LEVEL / LOG_FORMAT)
+    setup_logging()
+    # 공유 서비스(크롤러, 업스트림 커넥션 풀, Supabase)는 시작 시 한 번 생성하고 종료 시 정리
+    await services.startup()
+    app.state.services = services
+    try:
+        yield
+    finally:
+        await services.shutdown()
+        # 종료 직전 로그까지 출력되도록 큐를 비운다 (다음 시작 시 다시 구성)
+        shutdown_logging()
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 
 app = FastAPI(
     title="Investor Routiner API",
     description="기업 재무분석 자동화 블로그 글 생성 서비스 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -24,6 +42,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 수/처리 시간/동시 처리 수 메트릭 + Server-Timing 헤더
+app.add_middleware(MetricsMiddleware)
+
+# 캐시/작업 대기열 통계는 /metrics 조회 시점에 읽어 온다
+REGISTRY.register_stats("naver_crawler", lambda: services.crawler.stats())
+REGISTRY.register_stats("perplexity_cache", lambda: get_analysis_cache().stats())
+REGISTRY.register_stats("jobs", lambda: services.jobs.stats())
+REGISTRY.register_stats("reports", lambda: services.reports.stats())
+REGISTRY.register_stats("report_lookup", lambda: services.report_lookup.stats())
+REGISTRY.register_stats("report_files", lambda: services.report_files.stats())
+REGISTRY.register_stats("upstream", upstream_stats)
+REGISTRY.register_stats("prewarm", lambda: services.prewarm.stats())
+REGISTRY.register_stats("financial_history", lambda: services.history.stats())
+REGISTRY.register_stats("screener", lambda: services.screener.stats())
+
+
+@app.exception_handler(UpstreamBusyError)
+async def upstream_busy_handler(request, exc: UpstreamBusyError):
+    """업스트림 속도 제한(429) / 서킷 열림(503)을 Retry-After 와 함께 응답"""
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)}, headers=retry_after_headers(exc))
+
+
 # 라우터 등록
 app.include_router(financial.router, prefix="/api/financial", tags=["financial"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["analysis"])
@@ -31,3 +71,9 @@ app.include_router(analysis.router, prefix="/api/analysis", tags=["analysis"])
 @app.get("/")
 async def root():
     return {"message": "Investor Routiner API"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
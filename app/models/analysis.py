@@ -12,6 +12,9 @@ class AnalysisRequest(BaseModel):
         "국내",
         description="분석 시장 구분: 국내 | 해외 (국내: KOSPI/KOSDAQ, 해외: 미국 등)"
     )
+    use_cache: bool = Field(True, description="같은 프롬프트로 최근 생성된 분석 결과 재사용 여부")
+    template: Optional[str] = Field(None, description="프롬프트 템플릿 이름 (미지정 시 기본 템플릿)")
+    force_refresh: bool = Field(False, description="저장된 보고서/캐시를 무시하고 새로 생성")
 
 class AnalysisResponse(BaseModel):
     stock_code: str
@@ -25,6 +28,65 @@ class AnalysisResponse(BaseModel):
     created: int
 
 
+# 배치 분석 1회당 최대 종목 수
+MAX_BATCH_ITEMS = 100
+
+
+class BatchAnalysisItem(BaseModel):
+    stock_code: str = Field(..., description="네이버 증권 종목 코드")
+    stock_name: str = Field(..., description="기업 이름")
+    compare_periods: List[str] = Field(..., description="비교할 기간 리스트")
+    model: Optional[str] = Field(None, description="종목별 Perplexity 모델명 (미지정 시 배치 설정)")
+    market: Optional[str] = Field("국내", description="분석 시장 구분: 국내 | 해외")
+
+
+class BatchAnalysisRequest(BaseModel):
+    items: List[BatchAnalysisItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS, description="분석할 종목 리스트")
+    api_key: str = Field(..., description="Perplexity API 키")
+    model: Optional[str] = Field(None, description="Perplexity 모델명 (미지정 시 기본값)")
+    crawl_concurrency: Optional[int] = Field(None, ge=1, le=32, description="동시 크롤링 수 (미지정 시 BATCH_CRAWL_CONCURRENCY)")
+    llm_concurrency: Optional[int] = Field(None, ge=1, le=16, description="동시 Perplexity 호출 수 (미지정 시 BATCH_LLM_CONCURRENCY)")
+    use_cache: bool = Field(True, description="같은 프롬프트로 최근 생성된 분석 결과 재사용 여부")
+    template: Optional[str] = Field(None, description="프롬프트 템플릿 이름 (미지정 시 기본 템플릿)")
+    force_refresh: bool = Field(False, description="저장된 보고서/캐시를 무시하고 새로 생성")
+
+
+class BatchAnalysisItemResult(BaseModel):
+    stock_code: str
+    stock_name: str
+    ok: bool
+    status_code: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+    elapsed: float
+
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchAnalysisItemResult]
+    succeeded: int
+    failed: int
+    elapsed: float
+
+
+class AnalysisJobResponse(BaseModel):
+    job_id: str
+    status: str = Field(..., description="queued | running | succeeded | failed | cancelled")
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    timings: Dict[str, float] = Field(default_factory=dict, description="단계별 소요 시간(초)")
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+
+
 class SaveMarkdownRequest(BaseModel):
     content: str
     filename: Optional[str] = None
+
+
+class ReportFile(BaseModel):
+    name: str
+    size: int = Field(..., description="파일 크기(byte, 압축 저장이면 압축 후 크기)")
+    modified: float = Field(..., description="마지막 저장 시각 (epoch 초)")
+    compressed: bool = Field(..., description="gzip 저장 여부 (다운로드 시 Content-Encoding: gzip)")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 
 class FinancialRequest(BaseModel):
     stock_code: str = Field(..., description="네이버 증권 종목 코드 (예: 005930)")
@@ -12,3 +12,94 @@ class FinancialResponse(BaseModel):
     compare_periods: List[str]
     financial_data: List[Dict]
     csv_path: Optional[str]
+
+
+class ColumnarFinancialResponse(BaseModel):
+    """기간/지표 이름을 한 번씩만 담고 값은 지표 x 기간 행렬로 담는 응답 (?format=columnar)"""
+    stock_code: str
+    stock_name: Optional[str]
+    compare_periods: List[str]
+    periods: List[str] = Field(..., description="값이 있는 기간 (열)")
+    metrics: List[str] = Field(..., description="지표 이름 (행)")
+    # 단일 float 타입이라 검증이 가볍다 (int | float 유니온 대비 약 3배)
+    values: List[List[Optional[float]]] = Field(
+        ..., description="values[i][j] = metrics[i] 의 periods[j] 값 (없거나 숫자가 아니면 null)"
+    )
+    csv_path: Optional[str]
+
+
+class FinancialHistoryResponse(BaseModel):
+    """재무 시계열 (값과 증감률 모두 지표 x 기간 행렬)"""
+    stock_code: str
+    freq: str = Field(..., description="Y (연간) | Q (분기)")
+    periods: List[str]
+    metrics: List[str]
+    values: List[List[Optional[float]]]
+    growth: List[List[Optional[float]]] = Field(..., description="직전 기간 대비 증감률(%)")
+    yoy_growth: Optional[List[List[Optional[float]]]] = Field(None, description="분기: 전년 동기 대비 증감률(%)")
+    missing_periods: List[str] = Field(default_factory=list, description="저장된 시계열에 없는 요청 기간")
+    fetched_at: Optional[float] = Field(None, description="마지막 수집 시각 (epoch 초)")
+    refreshed: bool = Field(..., description="이번 요청에서 페이지를 새로 받았는지")
+
+
+class FinancialSnapshot(BaseModel):
+    stock_code: str
+    fetched_at: float = Field(..., description="수집 시각 (epoch 초)")
+    path: str
+    format: str = Field(..., description="csv | parquet | feather")
+    size: int = Field(..., description="파일 크기(byte)")
+
+
+class PrewarmTickerStatus(BaseModel):
+    stock_code: str
+    warm: bool = Field(..., description="캐시에 TTL 안의 데이터가 있는지")
+    cache_age: Optional[float] = Field(None, description="캐시된 데이터의 경과 시간(초)")
+    last_attempt: Optional[float] = Field(None, description="마지막 시도 시각 (epoch 초)")
+    last_success: Optional[float] = Field(None, description="마지막 성공 시각 (epoch 초)")
+    last_error: Optional[str] = None
+    duration: Optional[float] = Field(None, description="마지막 시도 소요 시간(초)")
+    consecutive_failures: int = 0
+
+
+class PrewarmStatus(BaseModel):
+    enabled: bool
+    running: bool = Field(..., description="지금 한 바퀴를 도는 중인지")
+    interval: float
+    concurrency: int
+    cycles: int
+    last_cycle_started: Optional[float] = None
+    last_cycle_duration: Optional[float] = None
+    next_run_at: Optional[float] = None
+    tickers: List[PrewarmTickerStatus]
+
+
+class ScreenFilter(BaseModel):
+    metric: str = Field(..., description="지표 이름 (예: ROE 또는 ROE(지배주주))")
+    op: Literal[">", ">=", "<", "<=", "==", "!="]
+    value: float
+
+
+class ScreenRequest(BaseModel):
+    filters: List[ScreenFilter] = Field(default_factory=list, description="모두 만족하는 종목만 (값이 없으면 제외)")
+    sort_by: Optional[str] = Field(None, description="정렬 지표 (값이 없는 종목은 뒤로)")
+    descending: bool = True
+    limit: int = Field(50, ge=1, le=1000)
+    freq: Literal["Y", "Q"] = Field("Y", description="Y (연간) | Q (분기)")
+    period: Optional[str] = Field(None, description="기간 (예: 2024.12). 없으면 종목별 최신 확정치 기간")
+    tickers: Optional[List[str]] = Field(None, description="대상 종목 제한")
+    metrics: Optional[List[str]] = Field(None, description="결과에 담을 지표 (기본: 조건/정렬 지표)")
+
+
+class ScreenRow(BaseModel):
+    stock_code: str
+    period: str
+    values: List[Optional[float]] = Field(..., description="metrics 순서의 값")
+
+
+class ScreenResponse(BaseModel):
+    metrics: List[str]
+    rows: List[ScreenRow]
+    universe: int = Field(..., description="기간/종목 조건에 해당하는 캐시된 종목 수")
+    matched: int = Field(..., description="필터를 통과한 종목 수 (limit 적용 전)")
+    cache_version: int
+    built_at: float = Field(..., description="패널을 만든 시각 (epoch 초)")
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class AnalysisResultCache:
+    """Perplexity 응답 캐시 (내용 주소 기반, 디스크 저장)
+
+    키는 모델과 완성된 프롬프트(요청 페이로드 전체)의 SHA-256 해시다. 같은 날 같은 종목/기간으로
+    만들어진 프롬프트는 같은 키가 되므로 Perplexity 를 다시 호출하지 않고 저장된 응답을 돌려준다.
+    파일 입출력은 동기 함수이므로 이벤트 루프에서는 asyncio.to_thread 로 호출한다.
+    """
+
+    def __init__(self, directory: str, ttl: float = 86400.0, max_bytes: int = 200 * 1024 * 1024) -> None:
+        """
+        Args:
+            directory: 캐시 디렉토리
+            ttl: 항목 유효 시간(초). 0 이하이면 캐시 비활성화
+            max_bytes: 디스크 사용량 상한 (초과 시 오래된 항목부터 삭제)
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.saved_tokens = 0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisResultCache":
+        """환경변수(PERPLEXITY_CACHE_DIR, PERPLEXITY_CACHE_TTL, PERPLEXITY_CACHE_MAX_MB)로 생성"""
+        return cls(
+            directory=os.getenv("PERPLEXITY_CACHE_DIR", "cache/perplexity"),
+            ttl=float(os.getenv("PERPLEXITY_CACHE_TTL", "86400")),
+            max_bytes=int(float(os.getenv("PERPLEXITY_CACHE_MAX_MB", "200")) * 1024 * 1024),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        """요청 페이로드(모델 + 메시지 + 생성 옵션)의 해시. stream 여부는 키에 포함하지 않는다"""
+        canonical = {k: v for k, v in payload.items() if k != "stream"}
+        encoded = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.ttl:
+                self._delete(path, stat.st_size)
+                raise FileNotFoundError(path)
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.saved_tokens += int((data.get("usage") or {}).get("total_tokens") or 0)
+        return data
+
+    def put(self, key: str, data: Dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        if len(encoded) > self.max_bytes:
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(encoded)
+        previous = path.stat().st_size if path.exists() else 0
+        os.replace(tmp, path)
+        with self._lock:
+            self.writes += 1
+            self._total_bytes = self._scan_total() if self._total_bytes is None else self._total_bytes + len(encoded) - previous
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _delete(self, path: Path, size: int) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """오래된 항목부터 삭제해 용량 상한 아래로 맞춘다 (만료 항목 우선)"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes and now - mtime <= self.ttl:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+        with self._lock:
+            self._total_bytes = total
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "bytes": self._total_bytes,
+            "saved_tokens": self.saved_tokens,
+            "ttl": self.ttl,
+        }
+
+
+_cache: Optional[AnalysisResultCache] = None
+
+
+def get_analysis_cache() -> AnalysisResultCache:
+    """프로세스 공유 Perplexity 응답 캐시"""
+    global _cache
+    if _cache is None:
+        _cache = AnalysisResultCache.from_env()
+    return _cache
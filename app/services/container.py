@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from . import http_client
+from .financial_history import FinancialHistory
+from .job_queue import JobQueue
+from .naver_crawler import NaverFinancialCrawler
+from .perplexity_service import PerplexityService
+from .prewarm import PrewarmScheduler
+from .prompt_templates import get_prompt_registry
+from .report_files import ReportFileStore
+from .report_lookup import RecentReportLookup
+from .report_writer import ReportWriter
+from .screener import Screener
+from .supabase_service import SupabaseReportStore
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """앱 전역에서 공유하는 서비스 묶음
+
+    FastAPI lifespan 에서 startup()/shutdown() 으로 관리한다. 라우터는 모두 같은 크롤러
+    (같은 캐시)와 업스트림별 커넥션 풀을 사용한다. 환경변수 설정은 startup() 에서 읽으며,
+    lifespan 없이 동작하는 경우(예: with 블록 없는 TestClient)에는 첫 접근 시 지연 생성된다.
+    """
+
+    def __init__(self, save_dir: str = "temp") -> None:
+        self.save_dir = save_dir
+        self._crawler: Optional[NaverFinancialCrawler] = None
+        self.configured = False
+        self.started = False
+
+    def configure(self) -> None:
+        """환경변수 설정을 읽어 서비스 생성 (import 시점이 아니라 startup() 또는 첫 접근 시 한 번)"""
+        # 오래 걸리는 분석을 HTTP 연결과 분리하는 작업 대기열
+        self.jobs = JobQueue.from_env()
+        # 분석 보고서를 응답 경로 밖에서 모아 저장하는 write-behind 저장기
+        self.reports = ReportWriter.from_env()
+        # 최근 저장된 보고서 재사용 (Supabase read-through + 로컬 LRU)
+        self.report_lookup = RecentReportLookup.from_env()
+        # /save_markdown 보고서 파일 (원자적 교체, 중복 제거, 보관 정책)
+        self.report_files = ReportFileStore.from_env()
+        # 자주 조회하는 종목의 재무 데이터를 주기적으로 미리 가져와 캐시를 채움
+        self.prewarm = PrewarmScheduler.from_env(lambda: self.crawler)
+        # 재무제표 페이지를 증분 크롤링해 쌓는 종목별 시계열
+        self.history = FinancialHistory.from_env(lambda: self.crawler, self.save_dir)
+        # 캐시된 재무 데이터 전체를 대상으로 하는 지표 스크리닝
+        self.screener = Screener(lambda: self.crawler.cache)
+        self.configured = True
+
+    def __getattr__(self, name: str):
+        # lifespan 없이 동작하는 경우 첫 접근 시 설정을 읽는다
+        if name.startswith("_") or self.__dict__.get("configured", True):
+            raise AttributeError(name)
+        self.configure()
+        return getattr(self, name)
+
+    @property
+    def crawler(self) -> NaverFinancialCrawler:
+        if self._crawler is None:
+            self._crawler = NaverFinancialCrawler(save_dir=self.save_dir)
+        return self._crawler
+
+    async def startup(self) -> None:
+        """크롤러, 업스트림 커넥션 풀, 프롬프트 템플릿, Supabase 클라이언트 준비 및 워밍업"""
+        if not self.configured:
+            self.configure()
+        crawler = self.crawler
+        # 업스트림 커넥션 풀은 프로세스당 한 번 생성
+        perplexity_client = PerplexityService.get_client()
+        # 프롬프트 템플릿은 요청마다 읽지 않도록 미리 로드
+        get_prompt_registry().preload()
+
+        # Supabase 클라이언트 (미설정 환경에서는 저장 시점에 다시 오류가 보고됨)
+        try:
+            await asyncio.to_thread(SupabaseReportStore.get_client)
+        except Exception as e:
+            logger.warning("Supabase 클라이언트 초기화 생략", extra={"error": str(e)})
+
+        # 첫 요청이 TCP/TLS 연결 비용을 치르지 않도록 미리 연결
+        if os.getenv("SERVICE_WARMUP", "true").lower() in ("1", "true", "yes", "on"):
+            await asyncio.gather(
+                crawler.warm_up(),
+                http_client.warm(perplexity_client, PerplexityService.origin()),
+            )
+        else:
+            await crawler.warm_up(connect=False)
+        await self.jobs.start()
+        self.reports.start()
+        self.prewarm.start()
+        self.started = True
+
+    async def shutdown(self) -> None:
+        """사전 워밍, 작업 대기열, 남은 보고서/스냅샷 쓰기, 커넥션 풀 및 클라이언트 정리"""
+        await self.prewarm.stop()
+        await self.jobs.stop()
+        await self.reports.stop()
+        if self._crawler is not None:
+            await self._crawler.snapshots.flush()
+        await http_client.close_all()
+        SupabaseReportStore.close()
+        self.started = False
+
+
+services = ServiceContainer()
+
+
+def get_services() -> ServiceContainer:
+    return services
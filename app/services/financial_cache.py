@@ -0,0 +1,137 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+class FinancialDataCache:
+    """stock_code -> 파싱된 재무 DataFrame 캐시 (TTL + LRU + 메모리 상한)
+
+    네이버 기업실적분석 표는 하루 몇 번 정도만 바뀌므로, 같은 종목에 대한 요청은
+    compare_periods 가 달라도 캐시된 프레임에서 바로 투영한다.
+    캐시된 DataFrame 은 여러 요청이 공유하므로 호출 측에서 수정하면 안 된다.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1800.0,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            ttl: 항목 유효 시간(초). 0 이하이면 캐시 비활성화
+            max_entries: 최대 종목 수
+            max_bytes: DataFrame 메모리 사용량 합계 상한
+            clock: 시간 함수 (테스트용)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        # key -> (저장 시각, 메모리 크기, DataFrame). 끝쪽이 최근 사용
+        self._entries: "OrderedDict[str, Tuple[float, int, pd.DataFrame]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # 항목이 추가/삭제될 때마다 증가 (캐시에서 파생된 데이터의 재구성 판단용)
+        self.version = 0
+
+    @classmethod
+    def from_env(cls) -> "FinancialDataCache":
+        """환경변수(NAVER_CACHE_TTL, NAVER_CACHE_MAX_ENTRIES, NAVER_CACHE_MAX_MB)로 생성"""
+        return cls(
+            ttl=float(os.getenv("NAVER_CACHE_TTL", "1800")),
+            max_entries=int(os.getenv("NAVER_CACHE_MAX_ENTRIES", "512")),
+            max_bytes=int(float(os.getenv("NAVER_CACHE_MAX_MB", "64")) * 1024 * 1024),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """유효한 항목이 있으면 반환 (LRU 갱신), 없으면 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, _, df = entry
+        if self._clock() - stored_at > self.ttl:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return df
+
+    def age(self, key: str) -> Optional[float]:
+        """항목이 저장된 후 경과 시간(초). 없으면 None (통계에 반영되지 않음)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return self._clock() - entry[0]
+
+    def items(self) -> List[Tuple[str, pd.DataFrame]]:
+        """유효한 (종목, DataFrame) 목록 (LRU 순서와 통계는 바꾸지 않음)
+
+        워커 스레드에서 호출될 수 있으므로 항목을 먼저 복사한 뒤 거른다.
+        """
+        now = self._clock()
+        entries = list(self._entries.items())
+        return [(key, df) for key, (stored_at, _, df) in entries if now - stored_at <= self.ttl]
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        if not self.enabled:
+            return
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (self._clock(), size, df)
+        self._bytes += size
+        self.version += 1
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """특정 종목 또는 전체 캐시 무효화"""
+        if key is None:
+            self._entries.clear()
+            self._bytes = 0
+            self.version += 1
+        elif key in self._entries:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .metrics import stage
+from .naver_crawler import NaverFinancialCrawler
+from .singleflight import SingleFlight
+from .table_extractor import extract_statement_table, statement_period
+
+logger = logging.getLogger(__name__)
+
+FREQS = ("Y", "Q")
+# 직전 기간까지의 개월 수
+_STEP_MONTHS = {"Y": 12, "Q": 3}
+COLUMNS = ["period", "metric", "value", "fetched_at"]
+
+
+def period_ordinal(period: str) -> Optional[int]:
+    """"2024.12" / "2024.12(E)" / "2024/12" -> 연 * 12 + 월 (기간 형식이 아니면 None)"""
+    label = statement_period(str(period))
+    if label is None:
+        return None
+    return int(label[:4]) * 12 + int(label[5:7])
+
+
+def is_estimate(period: str) -> bool:
+    return str(period).endswith("(E)")
+
+
+def growth_rate(wide: pd.DataFrame, months: int) -> pd.DataFrame:
+    """months 개월 전 기간 대비 증감률(%) (지표 x 기간, 열은 기간 서수)
+
+    직전 기간이 저장되어 있지 않으면 NaN. 음수 기준값은 절댓값으로 나눠 부호가 개선/악화를 따르게 한다.
+    """
+    prev = wide.reindex(columns=wide.columns - months)
+    prev.columns = wide.columns
+    change = (wide - prev) / prev.abs() * 100
+    return change.replace([np.inf, -np.inf], np.nan)
+
+
+@dataclass
+class HistorySeries:
+    stock_code: str
+    freq: str
+    periods: List[str]
+    metrics: List[str]
+    values: pd.DataFrame
+    growth: pd.DataFrame
+    yoy_growth: Optional[pd.DataFrame]
+    missing_periods: List[str]
+    fetched_at: Optional[float]
+    refreshed: bool
+
+
+class FinancialHistoryStore:
+    """종목별 재무 시계열 저장소
+
+    {directory}/history/{종목코드}_{Y|Q}.csv 에 (period, metric, value, fetched_at) long 형식으로 보관한다.
+    새로 받은 페이지의 기간은 저장된 같은 기간(추정치 포함)을 통째로 대체하고, 페이지에서 빠진
+    과거 기간은 그대로 남아 시계열이 점점 길어진다. 최근 읽은 종목은 메모리 LRU 에 둔다.
+    load / save 는 동기 함수이므로 이벤트 루프에서는 asyncio.to_thread 로 호출한다.
+    """
+
+    def __init__(self, directory: str = "temp", max_entries: int = 256) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        # load/save 는 to_thread 워커에서 동시에 실행되므로 LRU 변경은 잠금 안에서
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.saves = 0
+
+    def path(self, stock_code: str, freq: str) -> Path:
+        return Path(self.directory) / "history" / f"{stock_code}_{freq}.csv"
+
+    def _remember(self, key: str, frame: pd.DataFrame) -> None:
+        with self._lock:
+            self._entries[key] = frame
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self, stock_code: str, freq: str) -> pd.DataFrame:
+        """저장된 시계열 (없으면 빈 프레임). 반환값은 공유되므로 수정하지 않는다"""
+        key = f"{stock_code}_{freq}"
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is not None:
+                self._entries.move_to_end(key)
+                return frame
+        path = self.path(stock_code, freq)
+        if path.exists():
+            with self._lock:
+                self.loads += 1
+            frame = pd.read_csv(path, encoding="utf-8-sig", dtype={"period": str, "metric": str})
+        else:
+            frame = pd.DataFrame(columns=COLUMNS)
+        self._remember(key, frame)
+        return frame
+
+    @staticmethod
+    def merge(existing: pd.DataFrame, wide: pd.DataFrame, fetched_at: float) -> pd.DataFrame:
+        """지표 x 기간 표를 저장된 시계열에 병합 (받은 기간이 앞, 저장만 되어 있던 과거 기간이 뒤)"""
+        fetched = (
+            wide.rename_axis(index="metric", columns="period")
+            .reset_index()
+            .melt(id_vars="metric", var_name="period", value_name="value")
+            .dropna(subset=["value"])
+        )
+        fetched["fetched_at"] = fetched_at
+        fetched = fetched[COLUMNS]
+        if existing.empty:
+            return fetched.reset_index(drop=True)
+        replaced = set(fetched["period"].map(period_ordinal))
+        kept = existing[~existing["period"].map(period_ordinal).isin(replaced)]
+        return pd.concat([fetched, kept], ignore_index=True)
+
+    def save(self, stock_code: str, freq: str, frame: pd.DataFrame) -> None:
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+        path = self.path(stock_code, freq)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        frame.to_csv(tmp, index=False, encoding="utf-8-sig")
+        os.replace(tmp, path)
+        with self._lock:
+            self.saves += 1
+        self._remember(f"{stock_code}_{freq}", frame)
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "loads": self.loads, "saves": self.saves}
+
+
+class FinancialHistory:
+    """재무제표 페이지를 증분 크롤링해 종목별 시계열을 쌓고, 임의 기간 조회와 증감률을 제공
+
+    이미 확정치가 저장된 기간만 요청하면 네트워크를 쓰지 않는다. 저장된 최신 확정치보다 새 기간
+    (또는 추정치)을 요청하면 min_refetch 초에 한 번까지만 페이지를 다시 받는다. 기간 지정이 없으면
+    max_age 초가 지난 시계열을 갱신한다. 갱신에 실패해도 저장된 시계열이 있으면 그것으로 응답한다.
+    """
+
+    def __init__(
+        self,
+        crawler: Callable[[], NaverFinancialCrawler],
+        store: FinancialHistoryStore,
+        max_age: float = 86400.0,
+        min_refetch: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            crawler: 크롤러를 돌려주는 함수 (컨테이너의 공유 크롤러 사용)
+            store: 시계열 저장소
+            max_age: 기간 지정 없는 조회에서 시계열을 갱신하는 주기(초)
+            min_refetch: 아직 없는 기간을 요청할 때 같은 종목을 다시 받는 최소 간격(초)
+            clock: 시간 함수 (테스트용)
+        """
+        self._crawler = crawler
+        self.store = store
+        self.max_age = max_age
+        self.min_refetch = min_refetch
+        self._clock = clock
+        self.flight: SingleFlight[pd.DataFrame] = SingleFlight()
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.served_from_store = 0
+
+    @classmethod
+    def from_env(cls, crawler: Callable[[], NaverFinancialCrawler], directory: str = "temp") -> "FinancialHistory":
+        """환경변수(HISTORY_DIR, HISTORY_MAX_AGE, HISTORY_MIN_REFETCH, HISTORY_CACHE_ENTRIES)로 생성"""
+        store = FinancialHistoryStore(
+            directory=os.getenv("HISTORY_DIR", directory),
+            max_entries=int(os.getenv("HISTORY_CACHE_ENTRIES", "256")),
+        )
+        return cls(
+            crawler,
+            store,
+            max_age=float(os.getenv("HISTORY_MAX_AGE", "86400")),
+            min_refetch=float(os.getenv("HISTORY_MIN_REFETCH", "3600")),
+        )
+
+    def _needs_fetch(self, stored: pd.DataFrame, wanted: Sequence[int]) -> bool:
+        if stored.empty:
+            return True
+        age = self._clock() - float(stored["fetched_at"].max())
+        if not wanted:
+            return age > self.max_age
+        actual = {
+            ordinal for period in pd.unique(stored["period"]) if not is_estimate(period)
+            for ordinal in [period_ordinal(period)] if ordinal is not None
+        }
+        latest = max(actual, default=None)
+        # 확정치가 있는 기간과, 최신 확정치보다 오래되어 페이지에 없는 기간은 다시 받지 않는다
+        pending = [o for o in wanted if o not in actual and (latest is None or o > latest)]
+        return bool(pending) and age > self.min_refetch
+
+    async def _refresh(self, stock_code: str, freq: str) -> pd.DataFrame:
+        self.fetches += 1
+        html = await self._crawler().fetch_statement_html(stock_code, freq)
+        with stage("html_parse"):
+            wide = await asyncio.to_thread(extract_statement_table, html)
+        if wide is None or wide.empty:
+            raise ValueError("재무제표 표를 찾을 수 없습니다 (페이지 구조 변경 가능성).")
+        fetched_at = self._clock()
+
+        def merge_and_save() -> pd.DataFrame:
+            merged = self.store.merge(self.store.load(stock_code, freq), wide, fetched_at)
+            self.store.save(stock_code, freq, merged)
+            return merged
+
+        return await asyncio.to_thread(merge_and_save)
+
+    async def series(
+        self,
+        stock_code: str,
+        freq: str = "Y",
+        periods: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        refresh: bool = False,
+    ) -> HistorySeries:
+        """종목 시계열 조회
+
+        periods 를 주면 그 기간만 요청 순서대로, 아니면 start ~ end (포함) 기간을 시간순으로 반환한다.
+        저장소에 없는 요청 기간은 missing_periods 에 담긴다.
+        """
+        freq = freq.upper()
+        if freq not in FREQS:
+            raise ValueError(f"알 수 없는 주기: {freq} ({' | '.join(FREQS)})")
+        wanted = [o for o in (period_ordinal(p) for p in [*(periods or []), *([end] if end else [])]) if o is not None]
+
+        stored = await asyncio.to_thread(self.store.load, stock_code, freq)
+        refreshed = False
+        if refresh or self._needs_fetch(stored, wanted):
+            try:
+                stored = await self.flight.do(f"{stock_code}_{freq}", lambda: self._refresh(stock_code, freq))
+                refreshed = True
+            except Exception as e:
+                self.fetch_errors += 1
+                if stored.empty:
+                    raise
+                logger.warning("재무 시계열 갱신 실패, 저장된 시계열로 응답",
+                               extra={"stock_code": stock_code, "freq": freq, "error": str(e)})
+        if not refreshed:
+            self.served_from_store += 1
+
+        with stage("history_select"):
+            return self._select(stock_code, freq, stored, periods, start, end, refreshed)
+
+    def _select(
+        self,
+        stock_code: str,
+        freq: str,
+        stored: pd.DataFrame,
+        periods: Optional[Sequence[str]],
+        start: Optional[str],
+        end: Optional[str],
+        refreshed: bool,
+    ) -> HistorySeries:
+        long = stored.assign(ordinal=stored["period"].map(period_ordinal)).dropna(subset=["ordinal"])
+        long["ordinal"] = long["ordinal"].astype(int)
+        # 같은 기간/지표가 여러 번 있으면 (예: 표에 반복된 지표명, 추정치와 확정치 라벨) 앞쪽(최근 받은) 값을 사용
+        long = long.drop_duplicates(subset=["metric", "ordinal"], keep="first")
+        labels = long.groupby("ordinal")["period"].first()
+        wide = (
+            long.pivot(index="metric", columns="ordinal", values="value")
+            .reindex(index=pd.unique(long["metric"]))
+            .sort_index(axis=1)
+            .astype(float)
+        )
+        growth = growth_rate(wide, _STEP_MONTHS[freq])
+        yoy = growth_rate(wide, 12) if freq == "Q" else None
+
+        missing: List[str] = []
+        if periods:
+            columns = []
+            for period in periods:
+                ordinal = period_ordinal(period)
+                if ordinal in wide.columns and ordinal not in columns:
+                    columns.append(ordinal)
+                else:
+                    missing.append(period)
+        else:
+            lower = period_ordinal(start) if start else None
+            upper = period_ordinal(end) if end else None
+            columns = [
+                o for o in wide.columns
+                if (lower is None or o >= lower) and (upper is None or o <= upper)
+            ]
+
+        values = wide[columns]
+        rows = values.notna().any(axis=1)
+        period_labels = [labels[o] for o in columns]
+
+        def frame(source: pd.DataFrame) -> pd.DataFrame:
+            selected = source.loc[rows, columns]
+            selected.columns = period_labels
+            return selected
+
+        return HistorySeries(
+            stock_code=stock_code,
+            freq=freq,
+            periods=period_labels,
+            metrics=values.index[rows].tolist(),
+            values=frame(wide),
+            growth=frame(growth).round(2),
+            yoy_growth=frame(yoy).round(2) if yoy is not None else None,
+            missing_periods=missing,
+            fetched_at=float(stored["fetched_at"].max()) if not stored.empty else None,
+            refreshed=refreshed,
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "served_from_store": self.served_from_store,
+            "store": self.store.stats(),
+        }
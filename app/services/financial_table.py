@@ -0,0 +1,229 @@
+import csv
+import logging
+import math
+from dataclasses import dataclass, field
+from html import escape
+from io import StringIO
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 셀 값에서 제거할 단위/구분 문자와, 벡터 변환 대상인 단순 십진수 형태
+_CLEAN_PATTERN = r"[,원%억]"
+_PLAIN_NUMBER = r"[+-]?(?:\d+\.?\d*|\.\d+)"
+
+_NUMBER_TYPES = (int, float)
+
+METRIC_HEADER = "지표"
+FORMATS = ("markdown", "html", "csv")
+
+
+def parse_cell(value_str: str, raw: str):
+    """정리된 문자열 하나를 숫자로 변환 (실패 시 원본 문자열)"""
+    try:
+        value = float(value_str) if '.' in value_str else int(float(value_str))
+        return int(value) if isinstance(value, float) and value.is_integer() else float(value)
+    except Exception:
+        return raw
+
+
+def parse_column(raw: pd.Series) -> List:
+    """셀 문자열 컬럼을 한 번에 정리/숫자 변환
+
+    `,` `원` `%` `억` 을 한 번에 제거하고, 단순 십진수 형태는 벡터 연산으로 변환한다.
+    소수점이 있고 정수값이면 int, 그 외 숫자는 float 으로 기존 셀 단위 변환과 같은 타입을 만든다.
+    그 밖의 형태(지수 표기, '-' 등)는 셀 단위 변환으로 처리한다.
+    """
+    raw = raw.astype(str)
+    cleaned = raw.str.replace(_CLEAN_PATTERN, "", regex=True).str.strip()
+    values = raw.tolist()
+
+    plain = cleaned.str.fullmatch(_PLAIN_NUMBER).to_numpy(dtype=bool)
+    if plain.any():
+        plain_str = cleaned[plain]
+        numbers = plain_str.astype(float).to_numpy()
+        as_int = plain_str.str.contains(".", regex=False).to_numpy(dtype=bool) & (numbers == np.trunc(numbers))
+        for pos, number, to_int in zip(np.flatnonzero(plain).tolist(), numbers.tolist(), as_int.tolist()):
+            values[pos] = int(number) if to_int else number
+    for pos in np.flatnonzero(~plain).tolist():
+        values[pos] = parse_cell(cleaned.iat[pos], values[pos])
+    return values
+
+
+def format_value(value: Any) -> str:
+    """표 셀 문자열 (없는 값은 빈 문자열, 정수값 float 은 소수점 없이)"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+def _markdown_cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+@dataclass
+class FinancialTable:
+    """기간 x 지표 재무 표
+
+    values[i][j] 는 metrics[i] 의 periods[j] 값 (int / float / 숫자로 읽지 못한 문자열, 없으면 None).
+    크롤러 DataFrame 에서 바로 만들고, 기존 응답 형식(기간별 "기간 - 지표" dict 목록)과
+    Markdown / HTML / CSV 표는 모두 이 구조에서 만든다.
+    """
+
+    periods: List[str] = field(default_factory=list)
+    metrics: List[str] = field(default_factory=list)
+    values: List[List[Any]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.periods) and bool(self.metrics)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, compare_periods: List[str]) -> "FinancialTable":
+        """기업실적분석 DataFrame 에서 요청한 기간 컬럼만 뽑아 표 생성
+
+        첫 행은 기간, 둘째 행은 회계 기준, 셋째 행부터 지표이다. 요청한 기간이 하나도 없으면
+        앞의 두 컬럼을 사용하고 기간 이름은 요청 값을 따른다 (기존 응답과 동일). 값이 하나도 없는 기간/지표는 제외한다.
+        """
+        if len(df) < 1:
+            logger.error("데이터가 충분하지 않습니다.")
+            return cls()
+
+        cells = df.to_numpy(dtype=object)
+        period_row = cells[0]
+
+        # 기간 문자열 -> 첫 번째로 등장하는 컬럼 위치
+        period_index: Dict[str, int] = {}
+        for col_idx, col_value in enumerate(period_row.tolist()):
+            period_index.setdefault(str(col_value), col_idx)
+
+        # 요청한 기간과 일치하는 컬럼 찾기
+        matching_columns = []
+        for period in compare_periods:
+            col_idx = period_index.get(str(period))
+            if col_idx is None:
+                logger.warning("요청한 기간을 찾을 수 없습니다.", extra={"period": period})
+            else:
+                matching_columns.append((period, col_idx))
+
+        if not matching_columns:
+            logger.warning("요청한 기간들이 데이터에 없습니다.")
+            if len(df.columns) > 2:
+                matching_columns = [(period_row[1], 1), (period_row[2], 2)]
+        if not matching_columns:
+            return cls()
+
+        body = cells[2:]
+        metric_valid = pd.notna(body[:, 0])
+        block = body[:, [col_idx for _, col_idx in matching_columns]]
+        mask = metric_valid[:, None] & pd.notna(block)
+        if not mask.any():
+            return cls()
+
+        # 매칭된 컬럼들의 셀을 컬럼 순서대로 이어 붙여 한 번에 정리/변환한 뒤 같은 위치에 채운다
+        matrix = np.full(block.shape, None, dtype=object)
+        matrix.T[mask.T] = np.array(parse_column(pd.Series(block.T[mask.T], dtype=object)), dtype=object)
+
+        rows = mask.any(axis=1)
+        cols = np.flatnonzero(mask.any(axis=0)).tolist()
+        periods = [
+            str(compare_periods[i]) if i < len(compare_periods) else str(matching_columns[i][0])
+            for i in cols
+        ]
+        return cls(
+            periods=periods,
+            metrics=body[rows, 0].astype(str).tolist(),
+            values=matrix[rows][:, cols].tolist(),
+        )
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "FinancialTable":
+        """기존 형식(기간별 "기간 - 지표" dict 목록)에서 표 생성 (기간/지표는 처음 나온 순서)"""
+        periods: Dict[str, int] = {}
+        cells: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            for key, value in record.items():
+                period, sep, metric = key.partition(" - ")
+                if not sep:
+                    period, metric = "기간", key
+                periods.setdefault(period, len(periods))
+                cells.setdefault(metric, {})[period] = value
+        return cls(
+            periods=list(periods),
+            metrics=list(cells),
+            values=[[row.get(period) for period in periods] for row in cells.values()],
+        )
+
+    def to_records(self) -> List[Dict]:
+        """기존 응답 형식: 기간마다 {"기간 - 지표": 값} (값이 없는 지표는 생략)"""
+        records = []
+        for j, period in enumerate(self.periods):
+            prefix = f"{period} - "
+            record = {}
+            for metric, row in zip(self.metrics, self.values):
+                value = row[j]
+                if value is not None:
+                    # 같은 지표명이 반복되면 뒤의 값이 앞 위치를 덮어쓴다
+                    record[prefix + metric] = value
+            records.append(record)
+        return records
+
+    def numeric_values(self) -> List[List[Any]]:
+        """숫자만 남긴 값 행렬 (숫자로 읽지 못한 문자열은 None)"""
+        return [[value if type(value) in _NUMBER_TYPES else None for value in row] for row in self.values]
+
+    def to_markdown(self) -> str:
+        """GitHub 형식 Markdown 표 (지표 왼쪽 정렬, 값 오른쪽 정렬). 빈 표는 빈 문자열"""
+        if not self:
+            return ""
+        lines = [
+            "| " + " | ".join(_markdown_cell(h) for h in [METRIC_HEADER, *self.periods]) + " |",
+            "|:---|" + "---:|" * len(self.periods),
+        ]
+        for metric, row in zip(self.metrics, self.values):
+            lines.append("| " + " | ".join(_markdown_cell(format_value(v)) for v in [metric, *row]) + " |")
+        return "\n".join(lines)
+
+    def to_html(self) -> str:
+        """<table> 조각 (빈 표는 빈 문자열)"""
+        if not self:
+            return ""
+        out = ["<table><thead><tr><th scope=\"col\">", escape(METRIC_HEADER), "</th>"]
+        for period in self.periods:
+            out += ["<th scope=\"col\">", escape(period), "</th>"]
+        out.append("</tr></thead><tbody>")
+        for metric, row in zip(self.metrics, self.values):
+            out += ["<tr><th scope=\"row\">", escape(metric), "</th>"]
+            for value in row:
+                out += ["<td>", escape(format_value(value)), "</td>"]
+            out.append("</tr>")
+        out.append("</tbody></table>")
+        return "".join(out)
+
+    def to_csv(self) -> str:
+        """CSV (첫 행은 지표 + 기간, 빈 표는 빈 문자열)"""
+        if not self:
+            return ""
+        buffer = StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow([METRIC_HEADER, *self.periods])
+        writer.writerows([metric, *map(format_value, row)] for metric, row in zip(self.metrics, self.values))
+        return buffer.getvalue()
+
+    def render(self, fmt: str) -> str:
+        """fmt: markdown | html | csv"""
+        if fmt == "markdown":
+            return self.to_markdown()
+        if fmt == "html":
+            return self.to_html()
+        if fmt == "csv":
+            return self.to_csv()
+        raise ValueError(f"알 수 없는 표 형식: {fmt} ({' | '.join(FORMATS)})")
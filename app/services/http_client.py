@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 업스트림별 기본 커넥션 풀 설정
+DEFAULT_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+DEFAULT_TIMEOUT = httpx.Timeout(10.0)
+
+# name -> (생성된 이벤트 루프, 클라이언트)
+_clients: Dict[str, Tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]] = {}
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_client(
+    name: str,
+    *,
+    timeout: Optional[httpx.Timeout] = None,
+    limits: Optional[httpx.Limits] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.AsyncClient:
+    """업스트림 이름별로 공유되는 AsyncClient 반환 (keep-alive 풀 재사용)
+
+    커넥션 풀은 생성된 이벤트 루프에 묶이므로, 다른 루프에서 호출되면
+    (예: lifespan 없이 동작하는 TestClient) 이전 클라이언트를 정리하고 새 클라이언트를 만든다.
+    """
+    loop = _current_loop()
+    entry = _clients.get(name)
+    if entry is not None:
+        owner_loop, client = entry
+        if not client.is_closed and owner_loop is loop:
+            return client
+        if not client.is_closed:
+            _discard(name, owner_loop, client)
+    client = httpx.AsyncClient(
+        timeout=timeout or DEFAULT_TIMEOUT,
+        limits=limits or DEFAULT_LIMITS,
+        headers=headers,
+    )
+    _clients[name] = (loop, client)
+    return client
+
+
+def _discard(name: str, owner_loop: Optional[asyncio.AbstractEventLoop], client: httpx.AsyncClient) -> None:
+    """다른 루프에 묶인 클라이언트 정리 (그 루프가 실행 중이면 그 루프에서 닫고, 아니면 닫지 못한 채 버린다)"""
+    if owner_loop is not None and owner_loop.is_running():
+        owner_loop.call_soon_threadsafe(lambda: owner_loop.create_task(client.aclose()))
+        return
+    # 루프가 끝나 커넥션을 정상 종료할 수 없다. 소켓은 가비지 컬렉션 때 정리된다
+    logger.warning("이벤트 루프가 바뀌어 이전 HTTP 클라이언트를 닫지 않고 교체", extra={"client": name})
+
+
+async def warm(client: httpx.AsyncClient, url: str, timeout: float = 3.0) -> None:
+    """연결을 미리 열어 keep-alive 풀에 넣어둔다 (실패는 무시)"""
+    try:
+        await client.head(url, timeout=timeout)
+    except Exception as e:
+        logger.warning("워밍업 실패", extra={"url": url, "error": str(e)})
+
+
+async def close_client(name: str) -> None:
+    """지정한 업스트림 클라이언트 종료"""
+    entry = _clients.pop(name, None)
+    if entry is None:
+        return
+    owner_loop, client = entry
+    if owner_loop is None or owner_loop is _current_loop():
+        await client.aclose()
+
+
+async def close_all() -> None:
+    """모든 공유 클라이언트 종료 (앱 종료 시 호출)"""
+    for name in list(_clients):
+        await close_client(name)
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# 작업 함수는 단계별 소요 시간(초)을 기록할 dict 를 받는다
+JobFunc = Callable[[Dict[str, float]], Awaitable[Any]]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class QueueFullError(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+@dataclass
+class Job:
+    id: str
+    submitted_at: float
+    status: str = QUEUED
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    func: Optional[JobFunc] = field(default=None, repr=False)
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    task: Optional["asyncio.Task"] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+class JobQueue:
+    """프로세스 내 비동기 작업 대기열 + 워커 풀
+
+    오래 걸리는 분석을 HTTP 연결과 분리하기 위해 사용한다. 대기열 깊이를 제한하고,
+    작업별 대기/실행 시간과 단계별 시간을 기록하며, 대기 중/실행 중 작업을 취소할 수 있다.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 100,
+        job_timeout: float = 600.0,
+        retention: float = 3600.0,
+    ) -> None:
+        """
+        Args:
+            workers: 동시에 실행할 작업 수
+            max_queue: 대기 중인 작업 최대 수 (초과 시 QueueFullError)
+            job_timeout: 작업 1건 최대 실행 시간(초)
+            retention: 완료된 작업 상태를 보관하는 시간(초)
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self.retention = retention
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        """환경변수(JOB_WORKERS, JOB_QUEUE_SIZE, JOB_TIMEOUT, JOB_RETENTION)로 생성"""
+        return cls(
+            workers=int(os.getenv("JOB_WORKERS", "2")),
+            max_queue=int(os.getenv("JOB_QUEUE_SIZE", "100")),
+            job_timeout=float(os.getenv("JOB_TIMEOUT", "600")),
+            retention=float(os.getenv("JOB_RETENTION", "3600")),
+        )
+
+    async def start(self) -> None:
+        """워커 시작 (이미 현재 루프에서 실행 중이면 무시)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """워커 종료. 대기/실행 중인 작업은 취소 처리"""
+        self._stopping = True
+        running = []
+        for job in self._jobs.values():
+            if not job.finished:
+                # _finish() 가 job.task 를 비우므로 먼저 취소
+                if job.task is not None:
+                    job.task.cancel()
+                    running.append(job.task)
+                self._finish(job, CANCELLED, error="서버 종료로 작업이 취소되었습니다.")
+        await asyncio.gather(*running, return_exceptions=True)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    async def submit(self, func: JobFunc) -> Job:
+        """작업 등록 후 즉시 반환 (대기열이 가득 차면 QueueFullError)"""
+        await self.start()
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, submitted_at=time.time(), func=func)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"작업 대기열이 가득 찼습니다 (최대 {self.max_queue}건).")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """작업이 끝나거나 timeout 이 지날 때까지 대기 (롱 폴링)"""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished or timeout <= 0:
+            return job
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """대기 중이면 건너뛰도록 표시하고, 실행 중이면 태스크를 취소"""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, CANCELLED)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job: Job = await self._queue.get()
+            try:
+                if job.finished:  # 대기 중 취소됨
+                    continue
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.timings["queue_wait"] = job.started_at - job.submitted_at
+        # _finish() 가 job.task 를 비우므로 지역 변수로 참조
+        task = job.task = asyncio.create_task(job.func(job.timings))
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), self.job_timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+            self._finish(job, FAILED, error=f"작업 시간 초과 ({self.job_timeout:.0f}s)", status_code=504)
+        except asyncio.CancelledError:
+            if not task.cancelled() or self._stopping:
+                raise  # 워커 자체가 종료되는 경우
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            status_code = getattr(e, "status_code", None) or 500
+            detail = getattr(e, "detail", None) or str(e)
+            self._finish(job, FAILED, error=str(detail), status_code=status_code)
+        else:
+            job.result = result
+            self._finish(job, SUCCEEDED, status_code=200)
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None, status_code: Optional[int] = None) -> None:
+        if job.finished:
+            return
+        job.status = status
+        job.error = error
+        job.status_code = status_code
+        job.finished_at = time.time()
+        if job.started_at is not None:
+            job.timings["run"] = job.finished_at - job.started_at
+        job.timings["total"] = job.finished_at - job.submitted_at
+        # 요청 정보(API 키 등)는 완료 후 보관하지 않는다
+        job.func = None
+        job.task = None
+        job.done.set()
+
+    def _prune(self) -> None:
+        """보관 기간이 지난 완료 작업 제거"""
+        cutoff = time.time() - self.retention
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "jobs": counts,
+        }
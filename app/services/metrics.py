@@ -0,0 +1,276 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 요청(또는 작업)별 단계 소요 시간(초). 미들웨어/작업 실행부가 바인딩한다
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}", *self._samples()]
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """블록 실행 중에만 1 증가 (동시 실행 수)"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # label -> [버킷별 개수(누적 아님)..., +Inf 개수, 합계]
+        self._series: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', repr(float(bound))))} {_format_value(cumulative)}")
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Prometheus 텍스트 형식으로 내보내는 최소 메트릭 저장소
+
+    기록은 잠금 하나와 dict 갱신뿐이라 요청 처리 경로에서의 비용이 작다.
+    캐시 통계처럼 이미 다른 곳에서 세고 있는 값은 register_stats 로 조회 시점에 읽어 온다.
+    """
+
+    def __init__(self, prefix: str = "investor") -> None:
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._stats: Dict[str, Callable[[], Dict]] = {}
+
+    def _get_or_create(self, cls, name: str, help: str, **kwargs) -> _Metric:
+        full_name = f"{self.prefix}_{name}"
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            metric = self._metrics[full_name] = cls(full_name, help, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get_or_create(Counter, name, help)
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help)
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, buckets=buckets)
+
+    def register_stats(self, name: str, fn: Callable[[], Dict]) -> None:
+        """stats() 형태의 dict 를 조회 시점에 게이지로 내보낸다 (숫자 값만, 중첩 키는 _ 로 연결)"""
+        self._stats[name] = fn
+
+    def _render_stats(self) -> List[str]:
+        lines = []
+        for name, fn in self._stats.items():
+            try:
+                stats = fn()
+            except Exception:
+                continue
+            for key, value in _flatten(stats):
+                metric = f"{self.prefix}_{name}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {_format_value(value)}")
+        return lines
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        lines.extend(self._render_stats())
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(stats: Dict, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram("stage_duration_seconds", "단계별 소요 시간(초)")
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP 요청 수 (method, route, status)")
+HTTP_SECONDS = REGISTRY.histogram("http_request_duration_seconds", "HTTP 요청 처리 시간(초)")
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수")
+UPSTREAM_REQUESTS = REGISTRY.counter("upstream_requests_total", "업스트림 호출 결과 (upstream, status)")
+UPSTREAM_IN_FLIGHT = REGISTRY.gauge("upstream_requests_in_flight", "진행 중인 업스트림 호출 수")
+
+
+@contextmanager
+def bind_timings(timings: Optional[Dict[str, float]]) -> Iterator[Optional[Dict[str, float]]]:
+    """블록 안의 stage() 기록을 timings 에 모은다 (None 이면 기존 바인딩 유지)"""
+    if timings is None:
+        yield _timings.get()
+        return
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def current_timings() -> Optional[Dict[str, float]]:
+    """현재 요청(또는 작업)의 단계별 소요 시간 (바인딩이 없으면 None)"""
+    return _timings.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """단계 소요 시간을 히스토그램과 현재 요청의 timings 에 기록 (같은 이름은 합산)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def record_upstream(upstream: str, status) -> None:
+    UPSTREAM_REQUESTS.inc(upstream=upstream, status=status)
+
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """Server-Timing 헤더 값 (밀리초)"""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """요청 수/처리 시간/동시 처리 수 기록 + Server-Timing 응답 헤더 (ASGI 미들웨어)
+
+    응답 헤더는 응답 시작 시점에 보내므로, 스트리밍 응답은 그 전에 끝난 단계만 포함된다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        status = {"code": 500}
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                header = server_timing_header(timings, time.perf_counter() - start)
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        token = _timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+            HTTP_REQUESTS.inc(status=status["code"], **labels)
+            HTTP_SECONDS.observe(time.perf_counter() - start, **labels)
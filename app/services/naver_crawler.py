@@ -1,9 +1,13 @@
 import os
+import re
 import json
+import asyncio
+import logging
 from io import StringIO
 from typing import List, Dict, Tuple, Optional
+from urllib.parse import urlsplit
 
-import requests
+import httpx
 try:
     import pandas as pd
 except ImportError as e:
@@ -13,53 +17,212 @@ try:
 except ImportError as e:
     raise ImportError("beautifulsoup4가 설치되어 있지 않습니다. backend 디렉토리에서 'pip install -r requirements.txt' 실행 후 재시도하세요.") from e
 
+from .financial_cache import FinancialDataCache
+from .financial_table import FinancialTable
+from .http_client import get_client, warm
+from .metrics import UPSTREAM_IN_FLIGHT, record_upstream, stage
+from .resilience import RateLimitError, UpstreamBusyError, get_upstream_policy, parse_retry_after
+from .singleflight import SingleFlight
+from .snapshot_store import SnapshotStore
+from .table_extractor import extract_financial_table
+
+
+logger = logging.getLogger(__name__)
+
+NAVER_FINANCE_BASE_URL = "https://finance.naver.com"
+# 네이버 증권 종목분석(기업현황/재무제표) 페이지
+NAVER_STATEMENT_BASE_URL = "https://navercomp.wisereport.co.kr"
+_ENCPARAM_RE = re.compile(r"encparam\s*:\s*['\"]([^'\"]+)['\"]")
+NAVER_FETCH_TIMEOUT = 10.0
+
 
 class NaverFinancialCrawler:
-    def __init__(self, save_dir: str = "temp") -> None:
+    def __init__(
+        self,
+        save_dir: str = "temp",
+        base_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[FinancialDataCache] = None,
+        snapshots: Optional[SnapshotStore] = None,
+        statement_base_url: Optional[str] = None,
+    ) -> None:
         """네이버 증권 크롤러 초기화
 
         Args:
             save_dir: 임시 파일 저장 디렉토리
+            base_url: 네이버 증권 주소 (미지정 시 환경변수 NAVER_FINANCE_BASE_URL 또는 기본값)
+            client: 사용할 AsyncClient (미지정 시 프로세스 공유 풀 사용)
+            cache: 재무 데이터 캐시 (미지정 시 환경변수 설정으로 생성)
+            snapshots: 스냅샷 저장소 (미지정 시 save_dir 과 환경변수 설정으로 생성)
+            statement_base_url: 재무제표 페이지 주소 (미지정 시 환경변수 NAVER_STATEMENT_BASE_URL 또는 기본값)
         """
         self.save_dir = save_dir
         os.makedirs(save_dir, exist_ok=True)
+        self.base_url = (base_url or os.getenv("NAVER_FINANCE_BASE_URL", NAVER_FINANCE_BASE_URL)).rstrip("/")
+        self.statement_base_url = (
+            statement_base_url or os.getenv("NAVER_STATEMENT_BASE_URL", NAVER_STATEMENT_BASE_URL)
+        ).rstrip("/")
+        self._client = client
+        self.cache = cache if cache is not None else FinancialDataCache.from_env()
+        self.snapshots = snapshots if snapshots is not None else SnapshotStore.from_env(save_dir)
+        # 같은 종목의 동시 크롤링은 하나의 네트워크 요청/파싱으로 합친다
+        self.flight: SingleFlight[Optional[pd.DataFrame]] = SingleFlight()
         # 마지막 오류 메시지 (최근 실패 원인 저장)
         self.last_error: Optional[str] = None
 
-    async def fetch_financials(self, stock_code: str, compare_periods: List[str]) -> Tuple[Optional[str], Optional[List[Dict]]]:
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is not None:
+            return self._client
+        return get_client("naver", timeout=httpx.Timeout(NAVER_FETCH_TIMEOUT))
+
+    async def warm_up(self, connect: bool = True) -> None:
+        """업스트림 커넥션 풀 준비 (connect 이면 첫 요청이 TCP/TLS 연결 비용을 치르지 않도록 미리 연결)"""
+        client = self._get_client()
+        if connect:
+            await warm(client, self.base_url)
+
+    async def _get_text(
+        self, url: str, params: Dict[str, str], headers: Optional[Dict[str, str]] = None, stage_name: str = "naver_fetch"
+    ) -> str:
+        """업스트림 정책(호스트별 속도 제한 + 재시도 + 서킷)을 거친 GET 본문"""
+        client = self._get_client()
+
+        async def send() -> httpx.Response:
+            try:
+                res = await client.get(url, params=params, headers=headers)
+            except httpx.HTTPError:
+                record_upstream("naver", "error")
+                raise
+            record_upstream("naver", res.status_code)
+            return res
+
+        with UPSTREAM_IN_FLIGHT.track_inprogress(upstream="naver"), stage(stage_name):
+            res = await get_upstream_policy("naver").call(urlsplit(url).netloc, send)
+        if res.status_code == 429:
+            raise RateLimitError("네이버 증권 요청 제한 (429) - 잠시 후 재시도",
+                                 retry_after=parse_retry_after(res.headers.get("retry-after")))
+        res.raise_for_status()
+        return res.text
+
+    async def _fetch_html(self, stock_code: str) -> str:
+        """종목 메인 페이지 HTML 비동기 다운로드"""
+        return await self._get_text(f"{self.base_url}/item/main.nhn", {"code": stock_code})
+
+    async def fetch_statement_html(self, stock_code: str, freq: str = "Y") -> str:
+        """재무제표 페이지(기업현황 > 주요재무정보, 연간 Y / 분기 Q) HTML
+
+        메인 페이지보다 긴 기간을 담고 있다. 표 요청에는 기업현황 페이지에 포함된 encparam 이 필요해
+        기업현황 페이지를 먼저 받는다.
         """
-        네이버 증권에서 특정 기업의 재무제표를 가져와 CSV로 저장하고 JSON 형식으로 출력
-        stock_code: 네이버 증권 종목 코드 (예: 삼성전자 005930)
-        compare_periods: 비교할 기간 리스트 (예: ["2024.06", "2025.06"])
+        company_url = f"{self.statement_base_url}/v2/company/c1010001.aspx"
+        company_page = await self._get_text(company_url, {"cmp_cd": stock_code}, stage_name="statement_fetch")
+        params = {"cmp_cd": stock_code, "fin_typ": "0", "freq_typ": freq}
+        match = _ENCPARAM_RE.search(company_page)
+        if match is not None:
+            params["encparam"] = match.group(1)
+        return await self._get_text(
+            f"{self.statement_base_url}/v2/company/ajax/cF1001.aspx",
+            params,
+            headers={"Referer": f"{company_url}?cmp_cd={stock_code}"},
+            stage_name="statement_fetch",
+        )
+
+    @classmethod
+    def _parse_financial_table(cls, html: str) -> pd.DataFrame:
+        """HTML에서 기업실적분석 표 추출 (CPU 작업이므로 스레드에서 실행)
+
+        기업실적분석 영역만 잘라 lxml 로 한 번 파싱해 DataFrame 을 만든다.
+        영역을 찾지 못하면 기존 방식(전체 페이지 BeautifulSoup + read_html)으로 처리한다.
         """
-        url = f"https://finance.naver.com/item/main.nhn?code={stock_code}"
-        
-        try:
-            res = requests.get(url, timeout=10)
-            res.raise_for_status()
-            soup = BeautifulSoup(res.text, "html.parser")
+        with stage("html_parse"):
+            financial_df = extract_financial_table(html)
+        if financial_df is not None:
+            return financial_df
+        return cls._parse_financial_table_full(html)
+
+    @staticmethod
+    def _parse_financial_table_full(html: str) -> pd.DataFrame:
+        """전체 페이지를 BeautifulSoup 으로 파싱한 뒤 read_html 로 표 추출 (대체 경로)"""
+        with stage("html_parse_full"):
+            soup = BeautifulSoup(html, "html.parser")
 
             # 재무제표 테이블 선택
             finance_html = soup.select_one("div.section.cop_analysis div.sub_section")
             if finance_html is None:
                 raise ValueError("재무제표 영역을 찾을 수 없습니다 (페이지 구조 변경 가능성).")
+        with stage("read_html"):
             dfs = pd.read_html(StringIO(str(finance_html)), header=0)
+            return dfs[0].dropna(axis=1, how="all")
+
+    async def fetch_frame(self, stock_code: str) -> Optional[pd.DataFrame]:
+        """종목의 기업실적분석 표 DataFrame 반환 (캐시 우선, 실패 시 None)
+
+        반환된 DataFrame 은 캐시와 공유되므로 수정하지 않는다.
+        """
+        cached = self.cache.get(stock_code)
+        if cached is not None:
+            return cached
+        return await self.flight.do(stock_code, lambda: self._load_frame(stock_code))
+
+    async def refresh_frame(self, stock_code: str) -> pd.DataFrame:
+        """캐시/스냅샷을 건너뛰고 네트워크에서 다시 가져와 캐시를 갱신 (사전 워밍용, 실패 시 예외)"""
+        return await self._load_frame(stock_code, use_snapshot=False, raise_errors=True)
+
+    async def _load_frame(
+        self, stock_code: str, use_snapshot: bool = True, raise_errors: bool = False
+    ) -> Optional[pd.DataFrame]:
+        """캐시 유효 시간 안의 스냅샷 또는 네트워크에서 표를 가져와 캐시에 저장"""
+        if use_snapshot and self.cache.enabled and self.snapshots.enabled:
+            with stage("snapshot_read"):
+                snapshot = await asyncio.to_thread(self.snapshots.latest, stock_code, self.cache.ttl)
+            if snapshot is not None:
+                self.cache.put(stock_code, snapshot)
+                return snapshot
+
+        try:
+            html = await self._fetch_html(stock_code)
+            # 파싱은 CPU 바운드이므로 이벤트 루프를 막지 않도록 스레드로 분리
+            financial_df = await asyncio.to_thread(self._parse_financial_table, html)
+        except UpstreamBusyError:
+            # 속도 제한/서킷 오류는 "데이터 없음" 이 아니라 429/503 으로 응답하도록 전달
+            raise
         except Exception as e:
             self.last_error = str(e)
-            print(f"[Error] 재무제표 추출 실패: {e}")
+            logger.error("재무제표 추출 실패", extra={"stock_code": stock_code, "error": str(e)})
+            if raise_errors:
+                raise
+            return None
+
+        self.cache.put(stock_code, financial_df)
+        # 스냅샷은 응답을 기다리게 하지 않도록 백그라운드에서 저장
+        self.snapshots.schedule(stock_code, financial_df)
+        return financial_df
+
+    async def fetch_table(self, stock_code: str, compare_periods: List[str]) -> Tuple[Optional[str], Optional[FinancialTable]]:
+        """요청한 기간의 재무 표와 스냅샷 경로 (데이터가 없으면 표는 None)"""
+        financial_df = await self.fetch_frame(stock_code)
+        if financial_df is None:
             return None, None
 
-        # 데이터프레임 저장
-        financial_df = dfs[0].dropna(axis=1, how="all")
-        filename = os.path.join(self.save_dir, f"{stock_code}_financials.csv")
-        financial_df.to_csv(filename, index=False, encoding="utf-8-sig")
+        filename = self.snapshots.path_for(stock_code)
+        if not compare_periods:
+            return filename, None
+        with stage("convert"):
+            table = await asyncio.to_thread(FinancialTable.from_frame, financial_df, compare_periods)
+        return filename, table
+
+    async def fetch_financials(self, stock_code: str, compare_periods: List[str]) -> Tuple[Optional[str], Optional[List[Dict]]]:
+        """
+        네이버 증권에서 특정 기업의 재무제표를 가져와 CSV로 저장하고 JSON 형식으로 출력
+        stock_code: 네이버 증권 종목 코드 (예: 삼성전자 005930)
+        compare_periods: 비교할 기간 리스트 (예: ["2024.06", "2025.06"])
+        """
+        filename, table = await self.fetch_table(stock_code, compare_periods)
+        return filename, table.to_records() if table is not None else None
 
-        # JSON 형식으로 데이터 변환
-        if compare_periods:
-            json_result = self._convert_to_json_by_period(financial_df, compare_periods)
-            return filename, json_result
-        
-        return filename, None
+    def stats(self) -> Dict:
+        """캐시, 요청 병합(single-flight), 스냅샷 저장 통계"""
+        return {"cache": self.cache.stats(), "singleflight": self.flight.stats(), "snapshots": self.snapshots.stats()}
 
     def _convert_to_json_by_period(self, df: pd.DataFrame, compare_periods: List[str]) -> List[Dict]:
         """
@@ -67,56 +230,7 @@ class NaverFinancialCrawler:
         df: 재무제표 데이터프레임
         compare_periods: 비교할 기간 리스트
         """
-        result = []
-        
-        if len(df) < 1:
-            print("[Error] 데이터가 충분하지 않습니다.")
-            return []
-        
-        period_row = df.iloc[0]
-        
-        # 요청한 기간과 일치하는 컬럼 찾기
-        matching_columns = []
-        for period in compare_periods:
-            for col_idx, col_value in enumerate(period_row):
-                if str(col_value) == str(period):
-                    col_name = df.columns[col_idx]
-                    matching_columns.append((period, col_name))
-                    break
-            else:
-                print(f"[Warning] 요청한 기간 '{period}'을 찾을 수 없습니다.")
-        
-        if not matching_columns:
-            print(f"[Warning] 요청한 기간들이 데이터에 없습니다.")
-            if len(df.columns) > 2:
-                matching_columns = [
-                    (period_row.iloc[1], df.columns[1]),
-                    (period_row.iloc[2], df.columns[2])
-                ]
-        
-        # 각 매칭된 컬럼에 대해 JSON 데이터 생성
-        for i, (period_value, col_name) in enumerate(matching_columns):
-            period_data = {}
-            original_period = compare_periods[i] if i < len(compare_periods) else str(period_value)
-            
-            for index in range(2, len(df)):
-                row = df.iloc[index]
-                if pd.notna(row.iloc[0]) and pd.notna(row[col_name]):
-                    key = f"{original_period} - {row.iloc[0]}"
-                    try:
-                        value_str = str(row[col_name]).replace(',', '').replace('원', '').replace('%', '').replace('억', '').strip()
-                        try:
-                            value = float(value_str) if '.' in value_str else int(float(value_str))
-                            period_data[key] = int(value) if isinstance(value, float) and value.is_integer() else float(value)
-                        except (ValueError, TypeError):
-                            period_data[key] = str(row[col_name])
-                    except Exception:
-                        period_data[key] = str(row[col_name])
-            
-            if period_data:
-                result.append(period_data)
-        
-        return result
+        return FinancialTable.from_frame(df, compare_periods).to_records()
 
     def cleanup(self):
         """임시 파일 정리"""
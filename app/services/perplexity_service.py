@@ -1,20 +1,47 @@
 import os
 import json
-from typing import Dict, List, Optional
-from pathlib import Path
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
-import requests
+
+import httpx
+
+from .analysis_cache import AnalysisResultCache, get_analysis_cache
+from .http_client import get_client
+from .metrics import UPSTREAM_IN_FLIGHT, record_upstream, stage
+from .prompt_templates import get_prompt_registry
+from .resilience import RateLimitError, get_upstream_policy, key_fingerprint, parse_retry_after
+from ..logging_setup import log_payload
+
+logger = logging.getLogger(__name__)
+
+PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+# 보고서 생성은 수 분이 걸릴 수 있으므로 읽기 타임아웃은 길게, 연결 타임아웃은 짧게
+PERPLEXITY_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+PERPLEXITY_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
 
 class PerplexityService:
-    def __init__(self, api_key: str, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        model: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[AnalysisResultCache] = None,
+    ):
         """Perplexity API 서비스 초기화
 
         Args:
             api_key: Perplexity API 키
             model: 사용할 모델명 (미지정 시 환경변수 PERPLEXITY_MODEL 또는 기본값)
+            client: 사용할 AsyncClient (미지정 시 프로세스 공유 풀 사용)
+            cache: 응답 캐시 (미지정 시 프로세스 공유 디스크 캐시 사용)
         """
         self.api_key = api_key
-        self.base_url = "https://api.perplexity.ai/chat/completions"
+        self.base_url = self.origin() + "/chat/completions"
+        self._client = client
+        self.cache = cache if cache is not None else get_analysis_cache()
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
@@ -22,29 +49,46 @@ class PerplexityService:
         # 기본 온라인 접근 가능한 모델 (환경변수 PERPLEXITY_MODEL 로 재정의 가능)
         self.model = model or os.getenv("PERPLEXITY_MODEL", "sonar-pro")
 
-    async def generate_investment_analysis(
+    @staticmethod
+    def origin() -> str:
+        """Perplexity API 주소 (환경변수 PERPLEXITY_BASE_URL 로 재정의 가능)"""
+        return os.getenv("PERPLEXITY_BASE_URL", PERPLEXITY_BASE_URL).rstrip("/")
+
+    @staticmethod
+    def get_client() -> httpx.AsyncClient:
+        """프로세스 공유 Perplexity AsyncClient (keep-alive 커넥션 풀)
+
+        요청마다 서비스 객체가 만들어져도 TCP/TLS 연결은 이 풀에서 재사용된다.
+        앱 시작 시 생성하고 종료 시 http_client.close_all() 로 정리한다.
+        """
+        return get_client("perplexity", timeout=PERPLEXITY_TIMEOUT, limits=PERPLEXITY_LIMITS)
+
+    def build_prompt(
         self,
         stock_name: str,
         financial_data: List[Dict],
-        compare_periods: List[str],
         stock_code: Optional[str] = None,
         market: Optional[str] = None,
-    ) -> Dict:
-        """투자 분석 보고서 생성"""
-        # 1. 템플릿 로드
-        template_path = Path(__file__).parent.parent.parent / "docs" / "invest-by-perplexity-api2.md"
-        with open(template_path, "r", encoding="utf-8") as f:
-            template = f.read()
+        template: Optional[str] = None,
+    ) -> str:
+        """템플릿과 재무 데이터로 분석 프롬프트 구성
+
+        template 은 등록된 프롬프트 템플릿 이름 (미지정 시 기본 템플릿, 없는 이름이면 ValueError)
+        """
+        # 1. 템플릿 조회 (앱 시작 시 미리 읽어 둔 것을 사용)
+        try:
+            prompt_template = get_prompt_registry().get(template)
+        except KeyError:
+            raise ValueError(f"알 수 없는 프롬프트 템플릿: {template}")
 
-        # 2. 재무데이터 JSON 직렬화
-        financial_json = json.dumps(financial_data, ensure_ascii=False, indent=2)
+        # 2. 재무데이터 JSON 직렬화 (공백 없는 형식으로 프롬프트 토큰 절약)
+        financial_json = json.dumps(financial_data, ensure_ascii=False, separators=(",", ":"))
 
         # 3. 프롬프트 구성
-        prompt = (
-            template
-            .replace("[company name]", stock_name)
-            .replace("{financial-json}", financial_json)
-            .replace("YYYY-MM-DD", datetime.now().strftime("%Y-%m-%d"))
+        prompt = prompt_template.render(
+            company_name=stock_name,
+            financial_json=financial_json,
+            date=datetime.now().strftime("%Y-%m-%d"),
         )
 
         # 시장/종목코드에 따른 모호성 제거 컨텍스트 추가
@@ -60,12 +104,13 @@ class PerplexityService:
             "- 종목코드가 제공된 경우 해당 종목코드를 최우선으로 기업을 특정합니다.\n"
         )
 
-        # 4. 전체 프롬프트 로그 (전체 길이 출력)
-        print(f"[Prompt Log] ===== BEGIN PROMPT (length={len(prompt)}) =====")
-        print(prompt)
-        print("[Prompt Log] ===== END PROMPT =====")
+        # 4. 프롬프트 로그 (길이/해시만, 본문은 DEBUG 또는 샘플링 시)
+        log_payload(logger, logging.INFO, "프롬프트 생성", "prompt", prompt,
+                    template=prompt_template.name, stock_code=stock_code_hint)
+        return prompt
 
-        # 5. API 페이로드
+    def _build_payload(self, prompt: str, stream: bool = False) -> Dict:
+        """chat/completions 요청 페이로드"""
         payload = {
             "model": self.model,
             "messages": [
@@ -77,45 +122,210 @@ class PerplexityService:
             "top_p": 0.9,
             "return_citations": True
         }
+        if stream:
+            payload["stream"] = True
+        return payload
 
-        # 6. 호출 & 예외 처리
+    @staticmethod
+    def _raise_for_status(status_code: int, data, retry_after: Optional[float] = None) -> None:
+        """HTTP 상태 코드를 서비스 예외로 변환 (400/401/429/5xx)"""
+        if status_code == 400:
+            message = data.get("error", {}).get("message") if isinstance(data, dict) else None
+            raise ValueError(message or "잘못된 요청 (400)")
+        if status_code == 401:
+            raise PermissionError("Perplexity API 인증 실패 (401) - API 키를 확인하세요.")
+        if status_code == 429:
+            raise RateLimitError("Perplexity API rate limit 초과 (429) - 잠시 후 재시도", retry_after=retry_after)
+        if status_code >= 500:
+            raise RuntimeError(f"Perplexity 서버 오류 ({status_code})")
+
+    async def generate_investment_analysis(
+        self,
+        stock_name: str,
+        financial_data: List[Dict],
+        compare_periods: List[str],
+        stock_code: Optional[str] = None,
+        market: Optional[str] = None,
+        use_cache: bool = True,
+        template: Optional[str] = None,
+    ) -> Dict:
+        """투자 분석 보고서 생성
+
+        use_cache 가 참이면 같은 모델/프롬프트로 만든 최근 응답을 재사용한다.
+        응답의 usage.cache_hit 으로 캐시 적중 여부를 알 수 있다.
+        """
+        prompt = self.build_prompt(stock_name, financial_data, stock_code=stock_code, market=market, template=template)
+        payload = self._build_payload(prompt)
+
+        cache_key = self._cache_lookup_key(payload, use_cache)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                logger.info("분석 결과 캐시 적중", extra={"model": self.model, "cache_key": cache_key[:12]})
+                return self._mark_cache(cached, hit=True)
+
+        # 호출 & 예외 처리
         try:
-            print(f"[Perplexity] Sending request to model={self.model}, timeout=300s...")
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=300  # extended to 300s (5 minutes)
-            )
-            print(f"[Perplexity] Received response: status={response.status_code} body={response.text[:500]}")
+            logger.info("Perplexity 요청", extra={"model": self.model, "stream": False})
+            client = self._client or self.get_client()
+
+            async def send() -> httpx.Response:
+                return await self._record(client.post(self.base_url, headers=self.headers, json=payload))
+
+            with UPSTREAM_IN_FLIGHT.track_inprogress(upstream="perplexity"), stage("perplexity"):
+                # API 키별 속도 제한 + 재시도 + 서킷 (보고서 생성은 비멱등이므로 연결 오류만 재시도)
+                response = await get_upstream_policy("perplexity").call(
+                    key_fingerprint(self.api_key), send, idempotent=False
+                )
+            log_payload(logger, logging.INFO, "Perplexity 응답 수신", "response", response.text,
+                        model=self.model, status=response.status_code)
             try:
                 data = response.json()
             except Exception:
                 data = {"raw": response.text}
-            if response.status_code == 400:
-                message = data.get("error", {}).get("message") if isinstance(data, dict) else None
-                raise ValueError(message or "잘못된 요청 (400)")
-            if response.status_code == 401:
-                raise PermissionError("Perplexity API 인증 실패 (401) - API 키를 확인하세요.")
-            if response.status_code == 429:
-                raise RuntimeError("Perplexity API rate limit 초과 (429) - 잠시 후 재시도")
-            if response.status_code >= 500:
-                raise RuntimeError(f"Perplexity 서버 오류 ({response.status_code})")
+            self._raise_for_status(response.status_code, data, self._retry_after(response))
+        except (ValueError, PermissionError, RuntimeError):
+            raise
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Perplexity API 네트워크 오류: {e}")
+        except Exception as e:
+            raise RuntimeError(f"Perplexity API 알 수 없는 오류: {e}")
+
+        if cache_key is not None and response.status_code == 200 and "choices" in data:
+            await self._cache_store(cache_key, data)
+        return self._mark_cache(data, hit=False)
+
+    @staticmethod
+    async def _record(request) -> httpx.Response:
+        """업스트림 호출 결과를 메트릭에 기록 (재시도마다 한 번)"""
+        try:
+            response = await request
+        except httpx.HTTPError:
+            record_upstream("perplexity", "error")
+            raise
+        record_upstream("perplexity", response.status_code)
+        return response
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        return parse_retry_after(response.headers.get("retry-after"))
+
+    def _cache_lookup_key(self, payload: Dict, use_cache: bool) -> Optional[str]:
+        """캐시를 사용할 경우 페이로드 해시 키 반환"""
+        if not use_cache or not self.cache.enabled:
+            return None
+        return self.cache.make_key(payload)
+
+    async def _cache_store(self, cache_key: str, data: Dict) -> None:
+        try:
+            await asyncio.to_thread(self.cache.put, cache_key, data)
+        except Exception as e:  # 캐시 저장 실패는 응답에 영향을 주지 않는다
+            logger.warning("분석 결과 캐시 저장 실패", extra={"error": str(e)})
+
+    @staticmethod
+    def _mark_cache(data: Dict, hit: bool) -> Dict:
+        """usage 에 캐시 적중 여부 표시 (원본 dict 는 변경하지 않음)"""
+        if not isinstance(data, dict):
             return data
+        usage = data.get("usage") if isinstance(data.get("usage"), dict) else {}
+        return {**data, "usage": {**usage, "cache_hit": hit}}
+
+    async def stream_investment_analysis(
+        self,
+        stock_name: str,
+        financial_data: List[Dict],
+        compare_periods: List[str],
+        stock_code: Optional[str] = None,
+        market: Optional[str] = None,
+        use_cache: bool = True,
+        template: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """스트리밍 모드로 투자 분석 보고서 생성
+
+        토큰이 도착할 때마다 {"type": "token", "content": ...} 를 내보내고,
+        마지막에 format_analysis_response 와 같은 필드를 담은 {"type": "done", ...} 를 내보낸다.
+        캐시에 같은 프롬프트의 응답이 있으면 본문 전체를 토큰 하나로 내보낸다.
+        """
+        prompt = self.build_prompt(stock_name, financial_data, stock_code=stock_code, market=market, template=template)
+        payload = self._build_payload(prompt, stream=True)
+
+        cache_key = self._cache_lookup_key(payload, use_cache)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                formatted = self.format_analysis_response(self._mark_cache(cached, hit=True))
+                yield {"type": "token", "content": formatted["analysis"]}
+                yield {"type": "done", **formatted}
+                return
+
+        parts: List[str] = []
+        meta: Dict = {"citations": [], "model": "", "usage": {}, "created": 0}
+        response: Optional[httpx.Response] = None
+        try:
+            logger.info("Perplexity 요청", extra={"model": self.model, "stream": True})
+            client = self._client or self.get_client()
+
+            async def send() -> httpx.Response:
+                request = client.build_request("POST", self.base_url, headers=self.headers, json=payload)
+                return await self._record(client.send(request, stream=True))
+
+            # 본문 수신이 끝날 때까지를 업스트림 시간으로 기록 (응답 헤더 이후라 Server-Timing 대신 done 이벤트에 담김)
+            with UPSTREAM_IN_FLIGHT.track_inprogress(upstream="perplexity"), stage("perplexity"):
+                # 재시도는 본문을 받기 시작하기 전(응답 헤더 단계)까지만
+                response = await get_upstream_policy("perplexity").call(
+                    key_fingerprint(self.api_key), send, idempotent=False
+                )
+                try:
+                    if response.status_code >= 400:
+                        body = await response.aread()
+                        try:
+                            data = json.loads(body)
+                        except Exception:
+                            data = {"raw": body.decode("utf-8", errors="replace")}
+                        self._raise_for_status(response.status_code, data, self._retry_after(response))
+                        raise RuntimeError(f"Perplexity API 오류 ({response.status_code})")
+
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        chunk_text = line[5:].strip()
+                        if not chunk_text or chunk_text == "[DONE]":
+                            continue
+                        chunk = json.loads(chunk_text)
+                        for key in ("citations", "model", "usage", "created"):
+                            if chunk.get(key):
+                                meta[key] = chunk[key]
+                        choices = chunk.get("choices") or []
+                        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                        if delta:
+                            parts.append(delta)
+                            yield {"type": "token", "content": delta}
+                finally:
+                    await response.aclose()
         except (ValueError, PermissionError, RuntimeError):
             raise
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            if response is not None:  # 본문 수신 중 오류 (연결 단계 오류는 send 에서 기록)
+                record_upstream("perplexity", "error")
             raise RuntimeError(f"Perplexity API 네트워크 오류: {e}")
         except Exception as e:
             raise RuntimeError(f"Perplexity API 알 수 없는 오류: {e}")
 
+        analysis = "".join(parts)
+        if cache_key is not None and analysis:
+            # 비스트리밍 응답과 같은 형태로 저장해 두 모드가 캐시를 공유
+            await self._cache_store(cache_key, {"choices": [{"message": {"role": "assistant", "content": analysis}}], **meta})
+        meta["usage"] = {**(meta["usage"] or {}), "cache_hit": False}
+        yield {"type": "done", "analysis": analysis, **meta}
+
     def format_analysis_response(self, api_response: Dict) -> Dict:
         """Perplexity API 응답을 단일 dict 형태로 정리"""
         try:
             # 응답 구조 방어적 파싱
             if "choices" not in api_response:
-                # choices가 없으면 원본 응답 전체를 로그하고 오류 상세 전달
-                print(f"[Perplexity Response Error] Missing 'choices' key. Full response: {json.dumps(api_response, ensure_ascii=False, indent=2)}")
+                # choices가 없으면 응답 키/해시를 로그하고 오류 상세 전달 (본문은 DEBUG 또는 샘플링 시)
+                log_payload(logger, logging.ERROR, "Perplexity 응답에 choices 없음", "response",
+                            json.dumps(api_response, ensure_ascii=False), keys=list(api_response.keys()))
                 
                 # error 필드가 있으면 명확한 메시지 반환
                 if "error" in api_response:
@@ -140,7 +350,7 @@ class PerplexityService:
             if isinstance(e, ValueError):
                 raise
             # KeyError는 상세 응답과 함께 ValueError로 변환
-            print(f"[Response Parse Error] {e}. Response keys: {list(api_response.keys())}")
+            logger.error("Perplexity 응답 파싱 실패", extra={"error": str(e), "keys": list(api_response.keys())})
             raise ValueError(f"응답 파싱 실패: {e}. 받은 키: {list(api_response.keys())}")
         except Exception as e:
             raise Exception(f"응답 처리 중 알 수 없는 오류: {e}")
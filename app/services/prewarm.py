@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .naver_crawler import NaverFinancialCrawler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TickerStatus:
+    stock_code: str
+    last_attempt: Optional[float] = None
+    last_success: Optional[float] = None
+    last_error: Optional[str] = None
+    duration: Optional[float] = None
+    consecutive_failures: int = 0
+
+
+def parse_tickers(value: str) -> List[str]:
+    """쉼표/공백 구분 종목 코드 목록 (중복 제거, 순서 유지)"""
+    tickers: List[str] = []
+    for token in (value or "").replace(",", " ").split():
+        if token not in tickers:
+            tickers.append(token)
+    return tickers
+
+
+class PrewarmScheduler:
+    """설정한 종목 목록의 재무 데이터를 주기적으로 미리 크롤링해 캐시를 채워 두는 백그라운드 작업
+
+    interval 초마다 전체 종목을 concurrency 개씩 병렬로 새로 가져온다 (캐시/스냅샷을 건너뛰고 네트워크에서).
+    interval 을 캐시 TTL 보다 짧게 두면 사용자 요청은 항상 캐시에 적중한다.
+    네이버 호출량은 업스트림 정책(NAVER_RATE_LIMIT)으로 함께 제한된다.
+    """
+
+    def __init__(
+        self,
+        crawler: Callable[[], NaverFinancialCrawler],
+        tickers: List[str],
+        interval: float = 1200.0,
+        concurrency: int = 4,
+    ) -> None:
+        """
+        Args:
+            crawler: 크롤러를 돌려주는 함수 (컨테이너의 지연 생성 크롤러를 그대로 쓰기 위함)
+            tickers: 미리 가져올 종목 코드 목록 (비어 있으면 비활성)
+            interval: 한 바퀴 시작 간격(초)
+            concurrency: 동시에 크롤링할 종목 수
+        """
+        self._crawler = crawler
+        self.tickers = tickers
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.status: Dict[str, TickerStatus] = {code: TickerStatus(code) for code in tickers}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.cycles = 0
+        self.running = False
+        self.last_cycle_started: Optional[float] = None
+        self.last_cycle_duration: Optional[float] = None
+        self.next_run_at: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, crawler: Callable[[], NaverFinancialCrawler]) -> "PrewarmScheduler":
+        """환경변수(PREWARM_TICKERS, PREWARM_INTERVAL, PREWARM_CONCURRENCY)로 생성"""
+        return cls(
+            crawler,
+            tickers=parse_tickers(os.getenv("PREWARM_TICKERS", "")),
+            interval=float(os.getenv("PREWARM_INTERVAL", "1200")),
+            concurrency=int(os.getenv("PREWARM_CONCURRENCY", "4")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.tickers) and self.interval > 0
+
+    def start(self) -> None:
+        """현재 루프에서 주기 작업 시작 (비활성이거나 이미 실행 중이면 무시)"""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        crawler = self._crawler()
+        if len(self.tickers) > crawler.cache.max_entries:
+            logger.warning("사전 워밍 종목 수가 캐시 최대 항목 수보다 많습니다",
+                           extra={"tickers": len(self.tickers), "max_entries": crawler.cache.max_entries})
+        if self.interval >= crawler.cache.ttl > 0:
+            logger.warning("사전 워밍 간격이 캐시 TTL 이상이라 만료된 캐시가 생길 수 있습니다",
+                           extra={"interval": self.interval, "ttl": crawler.cache.ttl})
+        self._loop = loop
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._loop = None
+        self.running = False
+        self.next_run_at = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_cycle()
+            except Exception as e:  # 한 바퀴 실패로 스케줄이 멈추지 않도록
+                logger.error("사전 워밍 실패", extra={"error": str(e)})
+            delay = max(0.0, self.interval - (time.monotonic() - started))
+            self.next_run_at = time.time() + delay
+            await asyncio.sleep(delay)
+
+    async def run_cycle(self) -> None:
+        """전체 종목을 한 번 새로 가져온다"""
+        crawler = self._crawler()
+        limit = asyncio.Semaphore(self.concurrency)
+        self.running = True
+        self.last_cycle_started = time.time()
+        started = time.perf_counter()
+
+        async def warm(code: str) -> None:
+            async with limit:
+                await self._warm_one(crawler, code)
+
+        try:
+            await asyncio.gather(*(warm(code) for code in self.tickers))
+        finally:
+            self.running = False
+            self.last_cycle_duration = time.perf_counter() - started
+            self.cycles += 1
+        failed = sum(1 for s in self.status.values() if s.consecutive_failures)
+        logger.info("사전 워밍 완료", extra={"tickers": len(self.tickers), "failed": failed,
+                                          "elapsed": round(self.last_cycle_duration, 3)})
+
+    async def _warm_one(self, crawler: NaverFinancialCrawler, code: str) -> None:
+        status = self.status.setdefault(code, TickerStatus(code))
+        status.last_attempt = time.time()
+        started = time.perf_counter()
+        try:
+            await crawler.refresh_frame(code)
+        except Exception as e:
+            status.last_error = str(e)
+            status.consecutive_failures += 1
+        else:
+            status.last_success = time.time()
+            status.last_error = None
+            status.consecutive_failures = 0
+        finally:
+            status.duration = time.perf_counter() - started
+
+    def snapshot(self) -> Dict:
+        """진행 상황과 종목별 캐시 신선도"""
+        cache = self._crawler().cache
+        tickers = []
+        for code in self.tickers:
+            status = self.status[code]
+            age = cache.age(code)
+            tickers.append({
+                "stock_code": code,
+                "warm": age is not None and age <= cache.ttl,
+                "cache_age": age,
+                "last_attempt": status.last_attempt,
+                "last_success": status.last_success,
+                "last_error": status.last_error,
+                "duration": status.duration,
+                "consecutive_failures": status.consecutive_failures,
+            })
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "interval": self.interval,
+            "concurrency": self.concurrency,
+            "cycles": self.cycles,
+            "last_cycle_started": self.last_cycle_started,
+            "last_cycle_duration": self.last_cycle_duration,
+            "next_run_at": self.next_run_at,
+            "tickers": tickers,
+        }
+
+    def stats(self) -> Dict:
+        tickers = self.snapshot()["tickers"] if self.tickers else []
+        ages = [t["cache_age"] for t in tickers if t["cache_age"] is not None]
+        return {
+            "tickers": len(self.tickers),
+            "warm": sum(1 for t in tickers if t["warm"]),
+            "failing": sum(1 for t in tickers if t["consecutive_failures"]),
+            "cycles": self.cycles,
+            "max_cache_age": max(ages) if ages else 0.0,
+        }
@@ -0,0 +1,119 @@
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_TEMPLATE = "invest-by-perplexity-api2"
+DEFAULT_TEMPLATE_PATH = PROJECT_ROOT / "docs" / "invest-by-perplexity-api2.md"
+
+# 템플릿 문자열의 자리표시자 -> render() 인자 이름
+PLACEHOLDERS = {
+    "[company name]": "company_name",
+    "{financial-json}": "financial_json",
+    "YYYY-MM-DD": "date",
+}
+_PLACEHOLDER_RE = re.compile("|".join(re.escape(p) for p in PLACEHOLDERS))
+
+
+class PromptTemplate:
+    """자리표시자 위치를 미리 분해해 둔 프롬프트 템플릿
+
+    로드 시점에 본문을 [텍스트, 슬롯, 텍스트, 슬롯, ...] 으로 나눠 두고,
+    렌더링은 슬롯 값을 끼워 한 번의 join 으로 끝낸다. 치환된 값 안의 문자열은 다시 치환되지 않는다.
+    """
+
+    def __init__(self, name: str, text: str, path: Optional[Path] = None, mtime: Optional[float] = None) -> None:
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self._parts: List[str] = []
+        self._slots: List[int] = []  # _parts 에서 슬롯이 들어갈 위치
+        self._slot_names: List[str] = []
+        last = 0
+        for match in _PLACEHOLDER_RE.finditer(text):
+            self._parts.append(text[last:match.start()])
+            self._slots.append(len(self._parts))
+            self._slot_names.append(PLACEHOLDERS[match.group(0)])
+            self._parts.append("")
+            last = match.end()
+        self._parts.append(text[last:])
+
+    @classmethod
+    def from_file(cls, name: str, path: Path) -> "PromptTemplate":
+        path = Path(path)
+        return cls(name, path.read_text(encoding="utf-8"), path=path, mtime=path.stat().st_mtime)
+
+    @property
+    def slot_names(self) -> List[str]:
+        return list(self._slot_names)
+
+    def render(self, **values: str) -> str:
+        parts = list(self._parts)
+        for index, slot in zip(self._slots, self._slot_names):
+            parts[index] = values[slot]
+        return "".join(parts)
+
+
+class PromptTemplateRegistry:
+    """이름별 프롬프트 템플릿 저장소
+
+    앱 시작 시 preload() 로 한 번 읽어 두고, reload=True 이면 조회 때 파일 수정 시각을 확인해
+    바뀐 템플릿만 다시 읽는다.
+    """
+
+    def __init__(self, reload: bool = False) -> None:
+        self.reload = reload
+        self._paths: Dict[str, Path] = {}
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PromptTemplateRegistry":
+        """기본 템플릿 + PROMPT_TEMPLATE_DIR 의 *.md (파일명이 템플릿 이름), PROMPT_TEMPLATE_RELOAD"""
+        registry = cls(reload=os.getenv("PROMPT_TEMPLATE_RELOAD", "false").lower() in ("1", "true", "yes", "on"))
+        registry.register(DEFAULT_TEMPLATE, DEFAULT_TEMPLATE_PATH)
+        template_dir = os.getenv("PROMPT_TEMPLATE_DIR")
+        if template_dir:
+            for path in sorted(Path(template_dir).glob("*.md")):
+                registry.register(path.stem, path)
+        return registry
+
+    def register(self, name: str, path: Path) -> None:
+        with self._lock:
+            self._paths[name] = Path(path)
+            self._templates.pop(name, None)
+
+    def names(self) -> List[str]:
+        return sorted(self._paths)
+
+    def preload(self) -> None:
+        """등록된 템플릿을 모두 읽어 둔다"""
+        for name in self.names():
+            self.get(name)
+
+    def get(self, name: Optional[str] = None) -> PromptTemplate:
+        """템플릿 조회 (없는 이름이면 KeyError)"""
+        name = name or DEFAULT_TEMPLATE
+        template = self._templates.get(name)
+        if template is not None and not self.reload:
+            return template
+        path = self._paths[name]
+        if template is not None and path.stat().st_mtime == template.mtime:
+            return template
+        with self._lock:
+            template = PromptTemplate.from_file(name, path)
+            self._templates[name] = template
+        return template
+
+
+_registry: Optional[PromptTemplateRegistry] = None
+
+
+def get_prompt_registry() -> PromptTemplateRegistry:
+    """프로세스 공유 템플릿 저장소"""
+    global _registry
+    if _registry is None:
+        _registry = PromptTemplateRegistry.from_env()
+    return _registry
@@ -0,0 +1,363 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# app/services/report_files.py 기준으로 상위 3단계를 올라가 프로젝트 루트 추정 (기존 save_markdown 과 같은 위치)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+# 내용 해시로 저장한 원본 파일 디렉토리 (보고서 이름 파일은 여기에 하드 링크)
+OBJECTS_DIR = ".objects"
+GZIP_SUFFIX = ".gz"
+# 보고서 이름별 저장 시각 (하드 링크는 수정 시각을 공유하므로 따로 기록)
+INDEX_FILE = ".index.json"
+# 방금 만든 원본은 링크되기 전이므로 이 시간(초) 동안은 정리하지 않는다
+OBJECT_GRACE = 60.0
+
+
+@dataclass
+class ReportFileInfo:
+    name: str
+    path: str
+    size: int
+    modified: float
+    compressed: bool
+
+
+@dataclass
+class SavedReport:
+    name: str
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+def safe_report_name(filename: Optional[str]) -> str:
+    """디렉토리 구분자를 뺀 .md 파일명 (비었거나 숨김 파일 형태면 ValueError)"""
+    name = Path((filename or "investment-report.md").replace("\\", "/")).name.strip()
+    if name.endswith(GZIP_SUFFIX):
+        name = name[: -len(GZIP_SUFFIX)]
+    if not name or name.startswith("."):
+        raise ValueError(f"사용할 수 없는 파일명입니다: {filename}")
+    return name if name.endswith(".md") else name + ".md"
+
+
+class ReportFileStore:
+    """마크다운 보고서 파일 저장소 (outputs/)
+
+    - 임시 파일에 쓴 뒤 os.replace 로 교체하므로 같은 이름을 덮어써도 읽는 쪽에 반쯤 쓴 파일이 보이지 않는다.
+    - 내용의 SHA-256 으로 .objects/ 에 한 번만 저장하고 보고서 이름은 하드 링크로 만든다.
+      같은 내용을 여러 이름으로 저장해도 디스크는 한 벌만 쓴다 (하드 링크를 지원하지 않으면 복사).
+      링크된 이름들은 수정 시각을 공유하므로 이름별 저장 시각은 .index.json 에 따로 기록한다.
+    - compress 이면 gzip 으로 저장하고 이름에 .gz 를 붙인다.
+    - 저장 후 max_age 초보다 오래된 보고서, 그리고 전체 크기가 max_bytes 를 넘으면 오래된 보고서부터 지운다.
+    파일 입출력은 동기 함수이므로 이벤트 루프에서는 save()/list()/find() (to_thread) 를 사용한다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        compress: bool = False,
+        dedupe: bool = True,
+        max_bytes: int = 0,
+        max_age: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            directory: 저장 디렉토리
+            compress: gzip 압축 저장 여부
+            dedupe: 내용이 같은 보고서를 한 벌만 저장할지
+            max_bytes: 전체 크기 상한 (0 이하이면 제한 없음)
+            max_age: 보관 기간(초) (0 이하이면 제한 없음)
+            clock: 시간 함수 (테스트용)
+        """
+        self.directory = Path(directory)
+        self.compress = compress
+        self.dedupe = dedupe
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._clock = clock
+        self._prune_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        # 이름 -> 저장 시각 (처음 사용할 때 INDEX_FILE 에서 읽음)
+        self._index: Optional[Dict[str, float]] = None
+        self.saves = 0
+        self.deduplicated = 0
+        self.bytes_written = 0
+        self.pruned = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls) -> "ReportFileStore":
+        """환경변수(REPORT_FILES_DIR, REPORT_FILES_GZIP, REPORT_FILES_DEDUPE, REPORT_FILES_MAX_MB,
+        REPORT_FILES_MAX_AGE)로 생성"""
+        def flag(name: str, default: str) -> bool:
+            return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+        return cls(
+            directory=os.getenv("REPORT_FILES_DIR") or str(PROJECT_ROOT / "outputs"),
+            compress=flag("REPORT_FILES_GZIP", "false"),
+            dedupe=flag("REPORT_FILES_DEDUPE", "true"),
+            max_bytes=int(float(os.getenv("REPORT_FILES_MAX_MB", "0")) * 1024 * 1024),
+            max_age=float(os.getenv("REPORT_FILES_MAX_AGE", "0")),
+        )
+
+    def display_path(self, path: Path) -> str:
+        """응답에 담을 경로 (프로젝트 루트 기준, 바깥이면 절대 경로)"""
+        try:
+            return str(path.resolve().relative_to(PROJECT_ROOT))
+        except ValueError:
+            return str(path.resolve())
+
+    # 쓰기
+
+    def write(self, filename: Optional[str], content: str) -> SavedReport:
+        """보고서 저장 (동기, 스레드에서 실행)"""
+        name = safe_report_name(filename)
+        if self.compress:
+            name += GZIP_SUFFIX
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.directory / name
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        deduplicated = False
+        if self.dedupe:
+            blob = self.directory / OBJECTS_DIR / (digest + (".md" + GZIP_SUFFIX if self.compress else ".md"))
+            if blob.exists():
+                deduplicated = True
+                # 원본 정리 유예 시간만 갱신 (보고서 이름의 저장 시각은 인덱스에 기록)
+                os.utime(blob)
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                self._write_atomic(blob, data)
+            try:
+                self._link_atomic(blob, target)
+            except FileNotFoundError:
+                # 다른 스레드의 정리와 겹쳐 원본이 지워진 경우
+                self._write_atomic(target, data)
+            self._update_index(saved={name: self._clock()})
+        else:
+            self._write_atomic(target, data)
+
+        size = target.stat().st_size
+        self.saves += 1
+        if deduplicated:
+            self.deduplicated += 1
+        self.prune(keep=name)
+        return SavedReport(name, self.display_path(target), digest, size, deduplicated)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            if self.compress:
+                # 같은 내용이면 같은 바이트가 되도록 mtime 을 고정
+                with open(tmp, "wb") as raw, gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) as f:
+                    f.write(data)
+            else:
+                tmp.write_bytes(data)
+            self.bytes_written += tmp.stat().st_size
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _link_atomic(self, blob: Path, target: Path) -> None:
+        """target 을 blob 의 하드 링크로 교체 (이미 같은 파일이면 그대로 둔다)"""
+        try:
+            if os.path.samefile(blob, target):
+                return
+        except OSError:
+            pass
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            try:
+                os.link(blob, tmp)
+            except OSError:
+                shutil.copyfile(blob, tmp)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _load_index(self) -> Dict[str, float]:
+        """_index_lock 을 잡은 상태에서 호출"""
+        if self._index is None:
+            try:
+                raw = json.loads((self.directory / INDEX_FILE).read_text(encoding="utf-8"))
+                self._index = {str(name): float(saved_at) for name, saved_at in raw.items()}
+            except (OSError, ValueError, AttributeError, TypeError):
+                self._index = {}
+        return self._index
+
+    def _update_index(self, saved: Optional[Dict[str, float]] = None, removed: Sequence[str] = ()) -> None:
+        with self._index_lock:
+            index = self._load_index()
+            index.update(saved or {})
+            for name in removed:
+                index.pop(name, None)
+            path = self.directory / INDEX_FILE
+            tmp = path.with_name(f"{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                tmp.write_text(json.dumps(index), encoding="utf-8")
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+    def saved_times(self) -> Dict[str, float]:
+        """이름 -> 저장 시각 (인덱스에 없는 이름은 파일 수정 시각을 사용)"""
+        with self._index_lock:
+            return dict(self._load_index())
+
+    async def save(self, filename: Optional[str], content: str) -> SavedReport:
+        try:
+            return await asyncio.to_thread(self.write, filename, content)
+        except ValueError:
+            raise
+        except Exception as e:
+            self.failures += 1
+            logger.error("보고서 파일 저장 실패", extra={"filename": filename, "error": str(e)})
+            raise
+
+    # 보관 정책
+
+    def prune(self, keep: Optional[str] = None) -> int:
+        """보관 기간/전체 크기 상한을 넘는 보고서와 참조가 없는 원본 삭제 (다른 스레드가 정리 중이면 건너뜀)
+
+        Args:
+            keep: 지우지 않을 보고서 이름 (방금 저장한 보고서)
+        """
+        if not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            removed = 0
+            if self.max_age > 0 or self.max_bytes > 0:
+                removed = self._apply_retention(keep)
+            if self.dedupe:
+                self._collect_objects()
+            self.pruned += removed
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    def _apply_retention(self, keep: Optional[str]) -> int:
+        # 하드 링크로 공유하는 파일은 마지막 이름이 지워질 때 전체 크기가 줄어든다
+        links: Dict[tuple, int] = {}
+        sizes: Dict[tuple, int] = {}
+        inodes = []
+        for info in self.entries():
+            try:
+                stat = os.stat(info.path)
+            except OSError:
+                stat = None
+            inode = (stat.st_dev, stat.st_ino) if stat is not None else info.path
+            links[inode] = links.get(inode, 0) + 1
+            sizes[inode] = info.size
+            if info.name != keep:
+                inodes.append((info, inode))
+        inodes.sort(key=lambda item: item[0].modified)
+        total = sum(sizes.values())
+        now = self._clock()
+        removed: List[str] = []
+        for info, inode in inodes:
+            expired = self.max_age > 0 and now - info.modified > self.max_age
+            if not expired and (self.max_bytes <= 0 or total <= self.max_bytes):
+                break
+            if not self._remove(info):
+                continue
+            removed.append(info.name)
+            links[inode] -= 1
+            if not links[inode]:
+                total -= sizes[inode]
+        if removed and self.dedupe:
+            self._update_index(removed=removed)
+        return len(removed)
+
+    def _remove(self, info: ReportFileInfo) -> bool:
+        try:
+            os.remove(info.path)
+        except OSError:
+            return False
+        logger.info("보고서 파일 정리", extra={"report": info.name, "size": info.size})
+        return True
+
+    def _collect_objects(self) -> None:
+        """어떤 보고서 이름도 가리키지 않는 원본 삭제"""
+        objects = self.directory / OBJECTS_DIR
+        if not objects.is_dir():
+            return
+        now = time.time()
+        for entry in os.scandir(objects):
+            try:
+                stat = entry.stat()
+                if entry.is_file() and stat.st_nlink <= 1 and now - stat.st_mtime > OBJECT_GRACE:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+    # 읽기
+
+    def entries(self) -> List[ReportFileInfo]:
+        """저장된 보고서 목록 (임시 파일/원본 디렉토리 제외)"""
+        if not self.directory.is_dir():
+            return []
+        saved_times = self.saved_times()
+        infos = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            if not (entry.name.endswith(".md") or entry.name.endswith(".md" + GZIP_SUFFIX)):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            infos.append(ReportFileInfo(
+                name=entry.name,
+                path=entry.path,
+                size=stat.st_size,
+                modified=saved_times.get(entry.name, stat.st_mtime),
+                compressed=entry.name.endswith(GZIP_SUFFIX),
+            ))
+        return infos
+
+    def lookup(self, name: str) -> Optional[ReportFileInfo]:
+        """이름으로 보고서 찾기 (없거나 목록에 나오지 않는 이름이면 None)"""
+        if not name or name != Path(name).name or name.startswith("."):
+            return None
+        path = self.directory / name
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if not path.is_file() or not (name.endswith(".md") or name.endswith(".md" + GZIP_SUFFIX)):
+            return None
+        modified = self.saved_times().get(name, stat.st_mtime)
+        return ReportFileInfo(name, str(path), stat.st_size, modified, name.endswith(GZIP_SUFFIX))
+
+    async def list(self, limit: Optional[int] = None) -> List[ReportFileInfo]:
+        """최신순 보고서 목록"""
+        infos = await asyncio.to_thread(self.entries)
+        infos.sort(key=lambda info: info.modified, reverse=True)
+        return infos[:limit] if limit is not None else infos
+
+    async def find(self, name: str) -> Optional[ReportFileInfo]:
+        return await asyncio.to_thread(self.lookup, name)
+
+    def stats(self) -> Dict:
+        return {
+            "saves": self.saves,
+            "deduplicated": self.deduplicated,
+            "bytes_written": self.bytes_written,
+            "pruned": self.pruned,
+            "failures": self.failures,
+        }
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import record_upstream, stage
+
+logger = logging.getLogger(__name__)
+
+# (market, symbol, model, template, compare_periods, since) -> 최신순 행 목록 (동기, 스레드에서 실행)
+FetchFunc = Callable[..., List[Dict[str, Any]]]
+
+LookupKey = Tuple[str, str, str, str, Tuple[str, ...]]
+
+
+def _created_at(row: Dict[str, Any]) -> float:
+    """행의 저장 시각(unix 초). created_at 을 읽지 못하면 보고서 생성 시각"""
+    value = row.get("created_at")
+    if value:
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return float((row.get("report") or {}).get("created") or 0)
+
+
+class RecentReportLookup:
+    """Supabase reports 테이블을 읽는 read-through 조회 (앞단에 작은 로컬 LRU)
+
+    같은 시장/종목/모델/템플릿/비교 기간으로 max_age 초 안에 저장된 보고서가 있으면
+    Perplexity 를 다시 호출하지 않고 그 보고서를 돌려준다. 새로 생성한 보고서는 remember() 로
+    LRU 에 넣어, write-behind 저장이 끝나기 전의 반복 요청도 적중한다.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 86400.0,
+        max_entries: int = 256,
+        fetch: Optional[FetchFunc] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            max_age: 재사용할 보고서의 최대 경과 시간(초). 0 이하이면 비활성화
+            max_entries: 로컬 LRU 최대 항목 수
+            fetch: 조회 함수 (기본: SupabaseReportStore.find_recent_reports)
+            clock: 시간 함수 (테스트용)
+        """
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._fetch = fetch
+        self._clock = clock
+        # key -> (저장 시각, 보고서). 끝쪽이 최근 사용
+        self._entries: "OrderedDict[LookupKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> "RecentReportLookup":
+        """환경변수(REPORT_REUSE_MAX_AGE, REPORT_REUSE_LRU_SIZE)로 생성"""
+        return cls(
+            max_age=float(os.getenv("REPORT_REUSE_MAX_AGE", "86400")),
+            max_entries=int(os.getenv("REPORT_REUSE_LRU_SIZE", "256")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age > 0
+
+    @staticmethod
+    def make_key(market: str, symbol: str, model: str, template: str, periods: Sequence[str]) -> LookupKey:
+        return (market, symbol, model, template, tuple(periods))
+
+    def _fetch_rows(
+        self, market: str, symbol: str, model: str, template: str, periods: Sequence[str], since: float
+    ) -> List[Dict[str, Any]]:
+        fetch = self._fetch
+        if fetch is None:
+            from .supabase_service import SupabaseReportStore
+
+            fetch = SupabaseReportStore.find_recent_reports
+        return fetch(
+            market=market, symbol=symbol, model=model, template=template, compare_periods=list(periods), since=since
+        )
+
+    @staticmethod
+    def _matches(report: Dict[str, Any], template: str, periods: Sequence[str]) -> bool:
+        """템플릿과 비교 기간이 같은 보고서인지 (조회 조건과 같은 확인, 두 값이 없는 이전 형식 행은 재사용하지 않음)"""
+        return report.get("template") == template and list(report.get("compare_periods") or []) == list(periods)
+
+    def _get_local(self, key: LookupKey) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        saved_at, report = entry
+        if self._clock() - saved_at > self.max_age:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return report
+
+    def _put_local(self, key: LookupKey, saved_at: float, report: Dict[str, Any]) -> None:
+        self._entries[key] = (saved_at, report)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def find(
+        self, market: str, symbol: str, model: str, template: str, periods: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """유효한 저장 보고서 (없거나 조회 실패 시 None)"""
+        if not self.enabled:
+            return None
+        key = self.make_key(market, symbol, model, template, periods)
+        report = self._get_local(key)
+        if report is not None:
+            self.local_hits += 1
+            return report
+        since = self._clock() - self.max_age
+        try:
+            with stage("report_lookup"):
+                rows = await asyncio.to_thread(self._fetch_rows, market, symbol, model, template, periods, since)
+            record_upstream("supabase", "ok")
+        except Exception as e:
+            self.errors += 1
+            record_upstream("supabase", "error")
+            logger.warning("저장된 보고서 조회 실패", extra={"symbol": symbol, "error": str(e)})
+            return None
+        for row in rows:
+            report = row.get("report") or {}
+            if self._matches(report, template, periods):
+                self.remote_hits += 1
+                self._put_local(key, _created_at(row), report)
+                return report
+        self.misses += 1
+        return None
+
+    def remember(
+        self, market: str, symbol: str, model: str, template: str, periods: Sequence[str], report: Dict[str, Any]
+    ) -> None:
+        """새로 생성한 보고서를 로컬 LRU 에 추가"""
+        if self.enabled and self.max_entries > 0:
+            self._put_local(self.make_key(market, symbol, model, template, periods), self._clock(), report)
+
+    def stats(self) -> Dict:
+        lookups = self.local_hits + self.remote_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": (self.local_hits + self.remote_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .metrics import record_upstream
+
+logger = logging.getLogger(__name__)
+
+# 여러 행을 한 번에 저장하는 동기 함수 (스레드에서 실행)
+InsertFunc = Callable[[List[Dict[str, Any]]], None]
+
+
+class ReportWriter:
+    """분석 보고서 write-behind 저장기
+
+    요청 처리 경로는 enqueue() 로 행을 메모리 대기열에 넣고 바로 반환한다.
+    백그라운드 태스크가 batch_size 건 또는 flush_interval 초 단위로 모아 한 번의 multi-row insert 로
+    저장하고, 실패하면 지수 백오프로 재시도한다. max_retries 회 모두 실패한 배치와 대기열이 가득 차
+    받지 못한 행은 dead-letter JSONL 파일에 남긴다. stop() 은 대기열을 모두 비운 뒤 종료한다.
+    """
+
+    def __init__(
+        self,
+        insert: Optional[InsertFunc] = None,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        dead_letter_path: str = "cache/report_dead_letter.jsonl",
+    ) -> None:
+        """
+        Args:
+            insert: 배치 저장 함수 (기본: SupabaseReportStore.insert_reports)
+            max_queue: 대기열 최대 행 수 (초과분은 dead-letter 로)
+            batch_size: insert 1회에 담을 최대 행 수
+            flush_interval: 첫 행이 들어온 뒤 배치를 채우며 기다리는 최대 시간(초)
+            max_retries: 배치당 최대 시도 횟수
+            backoff: 첫 재시도 대기 시간(초), 시도마다 2배 (최대 max_backoff)
+            dead_letter_path: 저장에 실패한 행을 남길 JSONL 경로
+        """
+        self._insert = insert
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max(1, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.dead_letter_path = dead_letter_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._spills: Set[asyncio.Task] = set()
+        # 모으는 중인 배치와 저장 중인 배치 (종료 시 유실되지 않도록 보관)
+        self._batch: List[Dict[str, Any]] = []
+        self._flushing: Optional[asyncio.Future] = None
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.dead_lettered = 0
+
+    @classmethod
+    def from_env(cls) -> "ReportWriter":
+        """환경변수(REPORT_QUEUE_SIZE, REPORT_BATCH_SIZE, REPORT_FLUSH_INTERVAL, REPORT_MAX_RETRIES,
+        REPORT_DEAD_LETTER)로 생성"""
+        return cls(
+            max_queue=int(os.getenv("REPORT_QUEUE_SIZE", "1000")),
+            batch_size=int(os.getenv("REPORT_BATCH_SIZE", "50")),
+            flush_interval=float(os.getenv("REPORT_FLUSH_INTERVAL", "0.5")),
+            max_retries=int(os.getenv("REPORT_MAX_RETRIES", "5")),
+            dead_letter_path=os.getenv("REPORT_DEAD_LETTER", "cache/report_dead_letter.jsonl"),
+        )
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        if self._insert is not None:
+            self._insert(rows)
+            return
+        from .supabase_service import SupabaseReportStore
+
+        SupabaseReportStore.insert_reports(rows)
+
+    def start(self) -> None:
+        """현재 루프에서 flush 태스크 시작 (이미 실행 중이면 무시)
+
+        루프가 바뀐 경우(lifespan 없는 TestClient 등) 이전 대기열에 남은 행은 새 대기열로 옮긴다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        leftover: List[Dict[str, Any]] = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                leftover.append(self._queue.get_nowait())
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        for row in leftover[: self.max_queue]:
+            self._queue.put_nowait(row)
+        if len(leftover) > self.max_queue:
+            self._spill(leftover[self.max_queue:], "대기열 초과")
+        self._worker = loop.create_task(self._run())
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """행을 대기열에 넣고 즉시 반환 (가득 차면 dead-letter 로 보내고 False)"""
+        self.start()
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("보고서 저장 대기열이 가득 차 dead-letter 로 보냄", extra={"max_queue": self.max_queue})
+            self._spill([row], "대기열 초과")
+            return False
+        self.enqueued += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                row = await self._get(remaining)
+                if row is None:
+                    break
+                self._batch.append(row)
+            batch, self._batch = self._batch, []
+            # 태스크가 취소되어도 저장 중인 배치는 끝까지 진행
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+
+    async def _get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """timeout 초 안에 꺼낸 행 (없으면 None)
+
+        wait_for 는 시간 초과와 취소가 겹치면 취소를 삼킬 수 있어(3.11) stop() 이 멈추므로 wait 를 쓴다.
+        """
+        getter = asyncio.ensure_future(self._queue.get())
+        try:
+            done, _ = await asyncio.wait({getter}, timeout=timeout)
+        except asyncio.CancelledError:
+            if getter.done() and not getter.cancelled():
+                # 이미 꺼낸 행은 버리지 않고 배치에 넣어 stop() 에서 저장
+                self._batch.append(getter.result())
+            else:
+                getter.cancel()
+            raise
+        if not getter.done():
+            getter.cancel()
+        return getter.result() if done else None
+
+    def _drain_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size and self._queue is not None and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self, rows: List[Dict[str, Any]]) -> bool:
+        """배치 저장 (재시도 후에도 실패하면 dead-letter 에 기록하고 False)"""
+        error = ""
+        for attempt in range(self.max_retries):
+            if attempt:
+                self.retries += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            try:
+                await asyncio.to_thread(self._insert_rows, rows)
+            except Exception as e:
+                error = str(e)
+                record_upstream("supabase", "error")
+                logger.warning("보고서 배치 저장 실패", extra={"rows": len(rows), "attempt": attempt + 1, "error": error})
+                continue
+            record_upstream("supabase", "ok")
+            self.batches += 1
+            self.written += len(rows)
+            return True
+        logger.error("보고서 배치 저장 포기, dead-letter 에 기록", extra={"rows": len(rows), "error": error})
+        await asyncio.to_thread(self._write_dead_letter, rows, error)
+        return False
+
+    def _spill(self, rows: List[Dict[str, Any]], error: str) -> None:
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._write_dead_letter, rows, error))
+        self._spills.add(task)
+        task.add_done_callback(self._spills.discard)
+
+    def _write_dead_letter(self, rows: List[Dict[str, Any]], error: str) -> None:
+        """실패한 행을 JSONL 로 추가 기록 (한 줄에 한 행)"""
+        os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+        failed_at = time.time()
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"failed_at": failed_at, "error": error, "row": row}, ensure_ascii=False, default=str) + "\n")
+        self.dead_lettered += len(rows)
+
+    async def flush(self) -> None:
+        """대기열에 남은 행을 지금 저장 (flush 태스크와 별개로 실행)"""
+        while True:
+            batch = self._drain_batch()
+            if not batch:
+                break
+            await self._flush(batch)
+
+    async def stop(self) -> None:
+        """flush 태스크를 멈추고 남은 행을 모두 저장한 뒤 종료 (앱 종료 시 호출)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._flushing is not None and not self._flushing.done():
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        self._flushing = None
+        batch, self._batch = self._batch, []
+        if batch:
+            await self._flush(batch)
+        await self.flush()
+        if self._spills:
+            await asyncio.gather(*list(self._spills), return_exceptions=True)
+        self._loop = None
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+        }
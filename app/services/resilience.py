@@ -0,0 +1,360 @@
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import random
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 응답 상태 (rate limit / 일시적 서버 오류)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 요청 본문이 전송되기 전에 난 오류 (비멱등 요청도 재시도 가능)
+CONNECT_ERRORS: Tuple[Type[Exception], ...] = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamBusyError(RuntimeError):
+    """업스트림을 지금 호출할 수 없음 (retry_after 초 후 재시도 권장)"""
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitError(UpstreamBusyError):
+    """업스트림 rate limit (429) 또는 로컬 속도 제한 대기 한도 초과"""
+
+    status_code = 429
+
+
+class CircuitOpenError(UpstreamBusyError):
+    """연속 실패로 서킷이 열려 호출하지 않음"""
+
+    status_code = 503
+
+
+def retry_after_headers(error: UpstreamBusyError) -> Optional[Dict[str, str]]:
+    """오류 응답에 붙일 Retry-After 헤더 (정수 초, 올림)"""
+    if error.retry_after is None:
+        return None
+    return {"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (now if now is not None else time.time()))
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """attempt 번째 재시도 전 대기 시간 (full jitter 지수 백오프, Retry-After 가 있으면 그 이상)"""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        # 같은 시각에 몰리지 않도록 Retry-After 뒤에 약간의 지터를 더한다
+        delay = retry_after + random.uniform(0, base)
+    return delay
+
+
+class TokenBucket:
+    """초당 rate 개, 최대 burst 개까지 모이는 토큰 버킷 (이벤트 루프 단일 스레드용)
+
+    acquire() 는 토큰을 먼저 예약하고 차례가 올 때까지 잠든다. 그래서 대기 중인 호출은
+    도착 순서대로 1/rate 간격으로 고르게 풀려난다.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        # pause() 로 지정한 시각까지는 토큰을 내주지 않는다
+        self._paused_until = 0.0
+        self.waits = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """토큰 1개를 예약하고 기다려야 할 시간(초)을 반환 (max_wait 초과면 예약하지 않고 RateLimitError)"""
+        now = self._clock()
+        if self.rate <= 0:
+            wait = max(0.0, self._paused_until - now)
+        else:
+            self._refill(now)
+            wait = max(0.0, (1 - self._tokens) / self.rate, self._paused_until - now)
+        if max_wait is not None and wait > max_wait:
+            raise RateLimitError(f"요청이 많아 대기 한도({max_wait:.0f}s)를 넘었습니다.", retry_after=wait)
+        if self.rate > 0:
+            self._tokens -= 1
+        return wait
+
+    async def acquire(self, max_wait: Optional[float] = None) -> None:
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            self.waits += 1
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """업스트림이 Retry-After 를 준 경우 그 시간 동안 같은 키의 호출을 멈춘다"""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class CircuitBreaker:
+    """연속 failure_threshold 회 실패하면 reset_timeout 초 동안 호출을 즉시 거절
+
+    시간이 지나면 호출 하나만 시험으로 통과시키고(half-open), 성공하면 닫고 실패하면 다시 연다.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probing = False
+
+    def before_call(self, name: str = "upstream") -> None:
+        """호출 가능 여부 확인 (열려 있으면 CircuitOpenError)"""
+        if self.failure_threshold <= 0 or self.state == CLOSED:
+            return
+        remaining = self.opened_at + self.reset_timeout - self._clock()
+        if self.state == OPEN and remaining <= 0:
+            self.state = HALF_OPEN
+            self._probing = False
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        raise CircuitOpenError(f"{name} 업스트림 장애로 일시적으로 호출을 중단했습니다.", retry_after=max(remaining, 1.0))
+
+    def release(self) -> None:
+        """시험 호출이 성공/실패로 끝나지 않은 경우(취소 등) 다음 호출이 다시 시험하도록 한다"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failure_threshold <= 0:
+            return
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opens += 1
+            self.state = OPEN
+            self.opened_at = self._clock()
+            self._probing = False
+
+
+class UpstreamPolicy:
+    """업스트림 호출 정책: 키별 토큰 버킷 + 재시도(지터 지수 백오프, Retry-After) + 서킷 브레이커
+
+    키는 Perplexity 는 API 키, 네이버는 호스트다. 서킷은 업스트림 단위로 하나다
+    (키와 무관하게 업스트림이 내려간 경우를 빠르게 실패시키기 위함).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 0.0,
+        burst: int = 1,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        max_wait: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_keys: int = 1024,
+    ) -> None:
+        """
+        Args:
+            name: 업스트림 이름 (로그/메트릭)
+            rate: 키별 초당 요청 수 (0 이하이면 제한 없음)
+            burst: 키별 순간 최대 요청 수
+            max_retries: 재시도 횟수 (첫 시도 제외)
+            backoff: 첫 재시도 대기 기준(초), 시도마다 2배 (지터 적용)
+            max_backoff: 재시도 대기 상한(초). Retry-After 가 이보다 길면 재시도하지 않는다
+            max_wait: 토큰을 기다릴 수 있는 최대 시간(초). 초과 시 RateLimitError
+            failure_threshold: 서킷을 여는 연속 실패 수 (0 이하이면 서킷 비활성)
+            reset_timeout: 서킷이 열린 뒤 시험 호출까지의 시간(초)
+            max_keys: 버킷을 유지할 최대 키 수 (오래 안 쓴 키부터 제거)
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self.max_keys = max_keys
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.calls = 0
+        self.retries = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, name: str, **defaults) -> "UpstreamPolicy":
+        """환경변수({NAME}_RATE_LIMIT, _RATE_BURST, _MAX_RETRIES, _BACKOFF, _MAX_WAIT,
+        _CIRCUIT_THRESHOLD, _CIRCUIT_RESET)로 생성. 지정하지 않은 값은 defaults"""
+        prefix = name.upper()
+
+        def env(key: str, default, cast):
+            value = os.getenv(f"{prefix}_{key}")
+            return cast(value) if value not in (None, "") else default
+
+        base = cls(name, **defaults)
+        return cls(
+            name,
+            rate=env("RATE_LIMIT", base.rate, float),
+            burst=env("RATE_BURST", base.burst, int),
+            max_retries=env("MAX_RETRIES", base.max_retries, int),
+            backoff=env("BACKOFF", base.backoff, float),
+            max_backoff=base.max_backoff,
+            max_wait=env("MAX_WAIT", base.max_wait, float),
+            failure_threshold=env("CIRCUIT_THRESHOLD", base.breaker.failure_threshold, int),
+            reset_timeout=env("CIRCUIT_RESET", base.breaker.reset_timeout, float),
+            max_keys=base.max_keys,
+        )
+
+    def bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(key)
+        return bucket
+
+    async def call(
+        self,
+        key: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """정책을 적용해 send() 실행
+
+        RETRY_STATUSES 응답과 네트워크 오류는 재시도한다.
+        비멱등 요청은 연결 단계 오류와 Retry-After 가 있는 429 만 재시도한다.
+        재시도를 다 쓰면 마지막 응답을 그대로 반환하거나 마지막 예외를 다시 던진다.
+        재시도 대상 응답을 버릴 때는 닫으므로 스트리밍 응답도 쓸 수 있다.
+        """
+        bucket = self.bucket(key)
+        retryable = httpx.TransportError if idempotent else CONNECT_ERRORS
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call(self.name)
+                await bucket.acquire(self.max_wait)
+            except UpstreamBusyError:
+                self.rejected += 1
+                raise
+            self.calls += 1
+            retry_after: Optional[float] = None
+            try:
+                response = await send()
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if not isinstance(e, retryable) or attempt >= self.max_retries:
+                    raise
+                logger.warning("업스트림 호출 실패, 재시도", extra={"upstream": self.name, "attempt": attempt + 1, "error": str(e)})
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                if response.status_code == 429:
+                    # rate limit 은 장애가 아니므로 서킷에는 반영하지 않고, 같은 키의 호출을 잠시 멈춘다
+                    self.breaker.release()
+                    retry_after = parse_retry_after(response.headers.get("retry-after"))
+                    if retry_after is not None:
+                        bucket.pause(retry_after)
+                else:
+                    self.breaker.record_failure()
+                # 비멱등 요청의 5xx 는 이미 처리(과금)됐을 수 있으므로 Retry-After 가 있는 429 만 재시도
+                if not idempotent and (response.status_code != 429 or retry_after is None):
+                    return response
+                if attempt >= self.max_retries or (retry_after is not None and retry_after > self.max_backoff):
+                    return response
+                await response.aclose()
+                logger.warning("업스트림 응답 오류, 재시도",
+                               extra={"upstream": self.name, "attempt": attempt + 1, "status": response.status_code})
+            delay = backoff_delay(attempt, self.backoff, self.max_backoff, retry_after)
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict:
+        return {
+            "rate": self.rate,
+            "keys": len(self._buckets),
+            "calls": self.calls,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "throttled": sum(bucket.waits for bucket in self._buckets.values()),
+            "circuit": self.breaker.state,
+            "circuit_open": int(self.breaker.state != CLOSED),
+            "circuit_opens": self.breaker.opens,
+        }
+
+
+# 업스트림별 기본 정책 (환경변수로 재정의)
+_DEFAULTS: Dict[str, Dict] = {
+    # Perplexity: API 키별. 보고서 생성은 비싸므로 재시도는 적게
+    "perplexity": {"rate": 1.0, "burst": 5, "max_retries": 2, "backoff": 1.0, "max_backoff": 20.0, "max_wait": 30.0},
+    # 네이버: 호스트별. 멱등 GET 이므로 재시도를 조금 더
+    "naver": {"rate": 10.0, "burst": 20, "max_retries": 3, "backoff": 0.2, "max_backoff": 5.0, "max_wait": 10.0},
+}
+
+_policies: Dict[str, UpstreamPolicy] = {}
+
+
+def get_upstream_policy(name: str) -> UpstreamPolicy:
+    """업스트림 이름별 공유 정책 (첫 사용 시 환경변수로 생성)"""
+    policy = _policies.get(name)
+    if policy is None:
+        policy = _policies[name] = UpstreamPolicy.from_env(name, **_DEFAULTS.get(name, {}))
+    return policy
+
+
+def reset_upstream_policies() -> None:
+    """공유 정책 초기화 (환경변수를 바꾼 뒤 다시 읽도록, 테스트/벤치마크용)"""
+    _policies.clear()
+
+
+def upstream_stats() -> Dict:
+    return {name: policy.stats() for name, policy in _policies.items()}
+
+
+def key_fingerprint(secret: str) -> str:
+    """API 키 등 비밀 값을 버킷 키로 쓸 때의 짧은 해시 (원문은 보관하지 않는다)"""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
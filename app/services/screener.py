@@ -0,0 +1,295 @@
+import logging
+import operator
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .financial_cache import FinancialDataCache
+from .financial_table import _CLEAN_PATTERN
+from .table_extractor import statement_period
+
+logger = logging.getLogger(__name__)
+
+OPS: Dict[str, Callable] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_CLEAN_RE = re.compile(_CLEAN_PATTERN)
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(_CLEAN_RE.sub("", str(value)).strip())
+    except ValueError:
+        return np.nan
+
+
+def _ordinal(period: str) -> float:
+    label = statement_period(str(period))
+    return int(label[:4]) * 12 + int(label[5:7]) if label else np.nan
+
+
+@dataclass
+class TickerBlock:
+    """종목 하나의 (기간 x 지표) 값"""
+    stock_code: str
+    freqs: List[str]
+    periods: List[str]
+    ordinals: np.ndarray
+    latest: np.ndarray
+    metrics: List[str]
+    values: np.ndarray
+
+
+def ticker_block(stock_code: str, df: pd.DataFrame) -> Optional[TickerBlock]:
+    """기업실적분석 DataFrame 하나를 기간 x 지표 float 행렬로 변환 (숫자가 아닌 칸은 NaN)
+
+    헤더의 "최근 연간 실적" / "최근 분기 실적" 으로 연간(Y) / 분기(Q) 를 구분한다.
+    """
+    if len(df) < 3 or len(df.columns) < 2:
+        return None
+    cells = df.to_numpy(dtype=object)
+    periods = [str(p) for p in cells[0, 1:]]
+    ordinals = np.array([_ordinal(p) for p in periods], dtype=float)
+    keep = np.flatnonzero(~np.isnan(ordinals))
+    metrics: List[str] = []
+    rows = []
+    for row in cells[2:]:
+        name = row[0]
+        # 같은 지표명이 반복되면 처음 것을 사용
+        if pd.isna(name) or str(name) in metrics:
+            continue
+        metrics.append(str(name))
+        rows.append([_number(row[1 + i]) for i in keep])
+    freqs = ["Q" if "분기" in str(df.columns[1 + i]) else "Y" for i in keep]
+    periods = [periods[i] for i in keep]
+    ordinals = ordinals[keep]
+    # 주기별 최신 확정치 기간
+    actual = np.where([p.endswith("(E)") for p in periods], np.nan, ordinals)
+    latest = np.zeros(len(periods), dtype=bool)
+    for freq in set(freqs):
+        same = np.array([f == freq for f in freqs])
+        if not np.isnan(actual[same]).all():
+            latest |= same & (actual == np.nanmax(actual[same]))
+    values = np.array(rows, dtype=float).reshape(len(metrics), len(periods)).T
+    return TickerBlock(stock_code, freqs, periods, ordinals, latest, metrics, values)
+
+
+@dataclass
+class Panel:
+    """캐시된 전 종목을 모은 (종목 x 기간) 행, 지표 열 패널. values 는 열 단위로 연속(F order)"""
+    stock_codes: np.ndarray
+    freqs: np.ndarray
+    periods: np.ndarray
+    ordinals: np.ndarray
+    latest: np.ndarray
+    metrics: List[str]
+    values: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "Panel":
+        blank = np.array([], dtype=str)
+        return cls(blank, blank, blank, np.array([]), np.array([], dtype=bool), [], np.empty((0, 0)))
+
+    @classmethod
+    def from_blocks(cls, blocks: Sequence[TickerBlock]) -> "Panel":
+        if not blocks:
+            return cls.empty()
+        index: Dict[str, int] = {}
+        for block in blocks:
+            for name in block.metrics:
+                index.setdefault(name, len(index))
+        total = sum(len(block.periods) for block in blocks)
+        values = np.full((total, len(index)), np.nan, order="F")
+        start = 0
+        for block in blocks:
+            end = start + len(block.periods)
+            values[start:end, [index[name] for name in block.metrics]] = block.values
+            start = end
+        return cls(
+            stock_codes=np.array([b.stock_code for b in blocks for _ in b.periods], dtype=str),
+            freqs=np.array([f for b in blocks for f in b.freqs], dtype=str),
+            periods=np.array([p for b in blocks for p in b.periods], dtype=object),
+            ordinals=np.concatenate([b.ordinals for b in blocks]),
+            latest=np.concatenate([b.latest for b in blocks]),
+            metrics=list(index),
+            values=values,
+        )
+
+    def __len__(self) -> int:
+        return len(self.stock_codes)
+
+
+@dataclass
+class ScreenResult:
+    rows: pd.DataFrame
+    metrics: List[str]
+    universe: int
+    matched: int
+    version: int
+    built_at: float
+
+
+class Screener:
+    """캐시된 재무 데이터 전체에서 지표 조건 필터 / 정렬 / 상위 N 개 조회
+
+    캐시의 종목별 DataFrame 을 (종목 x 기간) 행, 지표 열의 float 패널 하나로 모아 두고,
+    조건은 열 단위 numpy 비교로 평가한다. 캐시가 바뀌면 다음 조회에서 패널을 다시 만들며,
+    이전과 같은 DataFrame 인 종목은 변환 결과를 재사용한다.
+    """
+
+    def __init__(self, cache: Callable[[], FinancialDataCache]) -> None:
+        self._cache = cache
+        self._panel = Panel.empty()
+        self._version: Optional[int] = None
+        self._oldest: Optional[str] = None
+        self._built_at = 0.0
+        # 종목 -> (원본 DataFrame, 변환 결과)
+        self._parsed: Dict[str, Tuple[pd.DataFrame, Optional[TickerBlock]]] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.queries = 0
+        self.last_build_seconds = 0.0
+
+    def panel(self) -> Tuple[Panel, int, float]:
+        """최신 패널 (캐시가 바뀌었거나 포함된 항목이 만료되었으면 재구성). 동기 함수이므로 이벤트 루프에서는 to_thread 로 호출한다"""
+        cache = self._cache()
+        with self._lock:
+            version = cache.version
+            # 만료는 version 을 바꾸지 않으므로 가장 오래된 항목의 경과 시간으로 확인
+            oldest_age = cache.age(self._oldest) if self._oldest is not None else None
+            if version != self._version or (oldest_age is not None and oldest_age > cache.ttl):
+                self._rebuild(cache)
+                self._version = version
+            return self._panel, version, self._built_at
+
+    def _rebuild(self, cache: FinancialDataCache) -> None:
+        started = time.perf_counter()
+        items = cache.items()
+        parsed: Dict[str, Tuple[pd.DataFrame, Optional[TickerBlock]]] = {}
+        for code, df in items:
+            previous = self._parsed.get(code)
+            if previous is not None and previous[0] is df:
+                parsed[code] = previous
+                continue
+            try:
+                parsed[code] = (df, ticker_block(code, df))
+            except Exception as e:
+                logger.warning("스크리닝 패널 변환 실패", extra={"stock_code": code, "error": str(e)})
+                parsed[code] = (df, None)
+        # items() 이후 제거된 항목은 age() 가 None 이다
+        self._oldest = max(parsed, key=lambda c: cache.age(c) or 0.0) if parsed else None
+        self._parsed = parsed
+        self._panel = Panel.from_blocks([block for _, block in parsed.values() if block is not None and block.periods])
+        self._built_at = time.time()
+        self.builds += 1
+        self.last_build_seconds = time.perf_counter() - started
+
+    @staticmethod
+    def resolve_metric(panel: Panel, name: str) -> int:
+        """지표 열 번호 (이름이 정확히 같거나 괄호 앞부분이 같은 지표 하나, 예: ROE -> ROE(지배주주))"""
+        if name in panel.metrics:
+            return panel.metrics.index(name)
+        candidates = [i for i, metric in enumerate(panel.metrics) if metric.split("(", 1)[0].strip() == name]
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            names = ", ".join(panel.metrics[i] for i in candidates)
+            raise ValueError(f"지표 이름이 모호합니다: {name} ({names})")
+        raise ValueError(f"알 수 없는 지표: {name}")
+
+    def screen(
+        self,
+        filters: Sequence[Tuple[str, str, float]] = (),
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 50,
+        freq: str = "Y",
+        period: Optional[str] = None,
+        tickers: Optional[Sequence[str]] = None,
+        metrics: Optional[Sequence[str]] = None,
+    ) -> ScreenResult:
+        """조건에 맞는 종목 상위 limit 개 (동기)
+
+        Args:
+            filters: (지표, 연산자, 값) 목록. 모두 만족해야 하며 값이 없는(NaN) 종목은 제외된다
+            sort_by: 정렬 지표 (값이 없는 종목은 뒤로)
+            freq: Y (연간) | Q (분기)
+            period: 기간 (예: 2024.12). 없으면 종목별 최신 확정치 기간
+            tickers: 대상 종목 제한
+            metrics: 결과에 담을 지표 (기본: 조건/정렬 지표)
+        """
+        panel, version, built_at = self.panel()
+        self.queries += 1
+        if not len(panel):
+            return ScreenResult(pd.DataFrame(columns=["stock_code", "period"]), [], 0, 0, version, built_at)
+
+        mask = panel.freqs == freq
+        if period:
+            ordinal = _ordinal(period)
+            if np.isnan(ordinal):
+                raise ValueError(f"기간 형식이 올바르지 않습니다: {period} (예: 2024.12)")
+            mask &= panel.ordinals == ordinal
+        else:
+            mask &= panel.latest
+        if tickers:
+            mask &= np.isin(panel.stock_codes, list(tickers))
+        # 종목마다 주기별 기간은 하나씩이므로 행 수 = 종목 수
+        universe = int(mask.sum())
+
+        used: List[int] = []
+        for name, op, value in filters:
+            if op not in OPS:
+                raise ValueError(f"알 수 없는 연산자: {op} ({' '.join(OPS)})")
+            column = self.resolve_metric(panel, name)
+            used.append(column)
+            with np.errstate(invalid="ignore"):
+                mask &= OPS[op](panel.values[:, column], float(value))
+        matched = np.flatnonzero(mask)
+
+        if sort_by:
+            column = self.resolve_metric(panel, sort_by)
+            used.append(column)
+            keys = panel.values[matched, column]
+            # argsort 는 NaN 을 뒤로 보낸다 (내림차순은 부호를 바꿔 정렬)
+            matched = matched[np.argsort(-keys if descending else keys, kind="stable")]
+        rows = matched[:limit]
+
+        selected = [self.resolve_metric(panel, name) for name in metrics] if metrics else used
+        selected = list(dict.fromkeys(selected))
+        names = [panel.metrics[i] for i in selected]
+        frame = pd.DataFrame({
+            "stock_code": panel.stock_codes[rows],
+            "period": panel.periods[rows],
+            **{name: panel.values[rows, i] for name, i in zip(names, selected)},
+        })
+        return ScreenResult(
+            rows=frame,
+            metrics=names,
+            universe=universe,
+            matched=len(matched),
+            version=version,
+            built_at=built_at,
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "tickers": len(self._parsed),
+            "rows": len(self._panel),
+            "builds": self.builds,
+            "queries": self.queries,
+            "last_build_seconds": self.last_build_seconds,
+        }
@@ -0,0 +1,46 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """같은 키에 대한 동시 비동기 호출을 하나의 실행으로 합친다 (single-flight)
+
+    먼저 들어온 호출이 실행을 시작하고, 실행 중에 들어온 같은 키의 호출은
+    그 결과(또는 예외)를 함께 받는다. 대기자 하나가 취소되어도 공유 실행은 계속된다.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Task[T]"] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[T]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": self.inflight,
+        }
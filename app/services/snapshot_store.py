@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (parquet / feather 저장에 필요)
+except ImportError:  # pragma: no cover - 선택 의존성
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+OFF = "off"
+CSV = "csv"
+PARQUET = "parquet"
+FEATHER = "feather"
+COLUMNAR_MODES = (PARQUET, FEATHER)
+MODES = (OFF, CSV) + COLUMNAR_MODES
+
+# 컬럼형 스냅샷 파일명: 수집 시각(UTC)
+_STAMP_FORMAT = "%Y%m%dT%H%M%S.%fZ"
+_STAMP_RE = re.compile(r"^(\d{8}T\d{6}\.\d{6}Z)\.(parquet|feather)$")
+
+
+@dataclass
+class SnapshotInfo:
+    stock_code: str
+    fetched_at: float
+    path: str
+    format: str
+    size: int
+
+
+class SnapshotStore:
+    """크롤링한 기업실적분석 표의 스냅샷 저장소
+
+    mode:
+        off      저장하지 않음
+        csv      {directory}/{종목코드}_financials.csv 에 최신 스냅샷만 덮어쓰기 (기존 형식).
+                 수집 시각은 옆의 .fetched_at 파일에 기록하며 (.gitignore 대상), 이 파일이 없는 CSV
+                 (체크아웃/배포로 생긴 파일 등)는 스냅샷으로 취급하지 않는다
+        parquet  {directory}/snapshots/{종목코드}/{수집시각}.parquet 로 수집마다 추가 (pyarrow 필요)
+        feather  parquet 과 같고 파일 형식만 Feather
+
+    쓰기는 schedule() 로 백그라운드 스레드에서 실행되어 요청 처리 경로를 막지 않는다.
+    읽기(latest / history)는 동기 함수이므로 이벤트 루프에서는 asyncio.to_thread 로 호출한다.
+    """
+
+    def __init__(self, directory: str = "temp", mode: str = CSV, max_history: int = 0, max_pending: int = 64) -> None:
+        """
+        Args:
+            directory: 저장 디렉토리
+            mode: off | csv | parquet | feather
+            max_history: 컬럼형 모드에서 종목별로 보관할 최대 스냅샷 수 (0 이면 무제한)
+            max_pending: 동시에 대기할 수 있는 백그라운드 쓰기 수 (초과분은 건너뜀)
+        """
+        mode = (mode or OFF).lower()
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 스냅샷 모드: {mode} ({' | '.join(MODES)})")
+        if mode in COLUMNAR_MODES and pyarrow is None:
+            logger.warning("pyarrow 가 없어 스냅샷을 CSV 로 저장합니다.", extra={"requested_mode": mode})
+            mode = CSV
+        self.directory = directory
+        self.mode = mode
+        self.max_history = max_history
+        self.max_pending = max_pending
+        self._pending: Set[asyncio.Task] = set()
+        self._last_path: Dict[str, str] = {}
+        self.writes = 0
+        self.skipped = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls, directory: str = "temp") -> "SnapshotStore":
+        """환경변수(SNAPSHOT_MODE, SNAPSHOT_DIR, SNAPSHOT_MAX_HISTORY)로 생성"""
+        return cls(
+            directory=os.getenv("SNAPSHOT_DIR", directory),
+            mode=os.getenv("SNAPSHOT_MODE", CSV),
+            max_history=int(os.getenv("SNAPSHOT_MAX_HISTORY", "0")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != OFF
+
+    def _csv_path(self, stock_code: str) -> str:
+        return os.path.join(self.directory, f"{stock_code}_financials.csv")
+
+    def _stamp_path(self, stock_code: str) -> str:
+        return self._csv_path(stock_code) + ".fetched_at"
+
+    def _csv_fetched_at(self, stock_code: str) -> Optional[float]:
+        """CSV 스냅샷의 수집 시각 (이 저장소가 기록하지 않았으면 None)"""
+        try:
+            with open(self._stamp_path(stock_code), encoding="utf-8") as f:
+                return float(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _ticker_dir(self, stock_code: str) -> Path:
+        return Path(self.directory) / "snapshots" / stock_code
+
+    def _target_path(self, stock_code: str, fetched_at: float) -> str:
+        """저장할 파일 경로 (CSV 는 종목별 고정, 컬럼형은 수집 시각별)"""
+        if self.mode == CSV:
+            return self._csv_path(stock_code)
+        stamp = datetime.fromtimestamp(fetched_at, tz=timezone.utc).strftime(_STAMP_FORMAT)
+        return str(self._ticker_dir(stock_code) / f"{stamp}.{self.mode}")
+
+    def path_for(self, stock_code: str) -> Optional[str]:
+        """종목의 최신 스냅샷 경로 (저장하지 않는 모드면 None)"""
+        if self.mode == OFF:
+            return None
+        if self.mode == CSV:
+            return self._csv_path(stock_code)
+        if stock_code not in self._last_path:
+            history = self.history(stock_code, limit=1)
+            if history:
+                self._last_path[stock_code] = history[0].path
+        return self._last_path.get(stock_code)
+
+    # 쓰기
+
+    def write(self, stock_code: str, frame: pd.DataFrame, fetched_at: Optional[float] = None) -> Optional[str]:
+        """스냅샷 저장 (동기, 스레드에서 실행)"""
+        if self.mode == OFF:
+            return None
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        path = self._target_path(stock_code, fetched_at)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if self.mode == CSV:
+            tmp = f"{path}.{os.getpid()}.tmp"
+            frame.to_csv(tmp, index=False, encoding="utf-8-sig")
+            os.replace(tmp, path)
+            # 파일 mtime 은 체크아웃/배포 때 바뀌므로 수집 시각은 따로 기록
+            stamp = self._stamp_path(stock_code)
+            with open(f"{stamp}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+                f.write(repr(fetched_at))
+            os.replace(f"{stamp}.{os.getpid()}.tmp", stamp)
+        else:
+            target = Path(path)
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            # 셀 값은 문자열 그대로 보관 (CSV 를 dtype=str 로 읽은 것과 같은 형태)
+            columnar = frame.astype(object).where(frame.notna(), None).astype("string")
+            if self.mode == PARQUET:
+                columnar.to_parquet(tmp, index=False)
+            else:
+                columnar.to_feather(tmp)
+            os.replace(tmp, target)
+            self._prune(stock_code)
+        self._last_path[stock_code] = path
+        self.writes += 1
+        return path
+
+    def schedule(self, stock_code: str, frame: pd.DataFrame, fetched_at: Optional[float] = None) -> Optional[str]:
+        """백그라운드 스레드에서 저장하도록 예약하고 저장될 경로를 즉시 반환"""
+        if self.mode == OFF:
+            return None
+        if len(self._pending) >= self.max_pending:
+            self.skipped += 1
+            logger.warning("스냅샷 쓰기 대기열이 가득 차 건너뜀", extra={"stock_code": stock_code})
+            return self.path_for(stock_code)
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        task = asyncio.get_running_loop().create_task(self._write_in_thread(stock_code, frame, fetched_at))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return self._target_path(stock_code, fetched_at)
+
+    async def _write_in_thread(self, stock_code: str, frame: pd.DataFrame, fetched_at: float) -> None:
+        try:
+            await asyncio.to_thread(self.write, stock_code, frame, fetched_at)
+        except Exception as e:
+            self.failures += 1
+            logger.error("스냅샷 저장 실패", extra={"stock_code": stock_code, "error": str(e)})
+
+    async def flush(self) -> None:
+        """대기 중인 백그라운드 쓰기 완료까지 대기 (앱 종료 시 호출)"""
+        pending = [task for task in self._pending if not task.done()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _prune(self, stock_code: str) -> None:
+        if self.max_history <= 0:
+            return
+        for info in self.history(stock_code)[self.max_history:]:
+            try:
+                os.remove(info.path)
+            except OSError:
+                pass
+
+    # 읽기
+
+    def history(self, stock_code: str, since: Optional[float] = None, limit: Optional[int] = None) -> List[SnapshotInfo]:
+        """종목의 스냅샷 목록 (최신순). CSV 모드는 최신 1건만 존재"""
+        infos: List[SnapshotInfo] = []
+        csv_path = self._csv_path(stock_code)
+        fetched_at = self._csv_fetched_at(stock_code) if self.mode == CSV else None
+        if fetched_at is not None and os.path.exists(csv_path):
+            infos.append(SnapshotInfo(stock_code, fetched_at, csv_path, CSV, os.stat(csv_path).st_size))
+        ticker_dir = self._ticker_dir(stock_code)
+        if self.mode in COLUMNAR_MODES and ticker_dir.is_dir():
+            for path in ticker_dir.iterdir():
+                match = _STAMP_RE.match(path.name)
+                if match is None:
+                    continue
+                fetched_at = datetime.strptime(match.group(1), _STAMP_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+                infos.append(SnapshotInfo(stock_code, fetched_at, str(path), match.group(2), path.stat().st_size))
+        infos.sort(key=lambda info: info.fetched_at, reverse=True)
+        if since is not None:
+            infos = [info for info in infos if info.fetched_at >= since]
+        return infos[:limit] if limit is not None else infos
+
+    @staticmethod
+    def read(info: SnapshotInfo) -> pd.DataFrame:
+        """스냅샷 파일을 문자열 셀 DataFrame 으로 읽기"""
+        if info.format == CSV:
+            return pd.read_csv(info.path, encoding="utf-8-sig", dtype=str)
+        if info.format == PARQUET:
+            frame = pd.read_parquet(info.path)
+        else:
+            frame = pd.read_feather(info.path)
+        return frame.astype(object).where(frame.notna(), float("nan"))
+
+    def latest(self, stock_code: str, max_age: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """최신 스냅샷 (max_age 초보다 오래됐거나 없으면 None)"""
+        if self.mode == OFF:
+            return None
+        since = time.time() - max_age if max_age is not None else None
+        history = self.history(stock_code, since=since, limit=1)
+        if not history:
+            return None
+        try:
+            return self.read(history[0])
+        except Exception as e:
+            logger.warning("스냅샷 읽기 실패", extra={"path": history[0].path, "error": str(e)})
+            return None
+
+    def stats(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "writes": self.writes,
+            "pending": len(self._pending),
+            "skipped": self.skipped,
+            "failures": self.failures,
+        }
@@ -1,5 +1,7 @@
+import json
 import os
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
 
 try:
     from supabase import create_client, Client
@@ -12,7 +14,7 @@ class SupabaseReportStore:
     _client: Optional[Client] = None
 
     @classmethod
-    def _get_client(cls) -> Client:
+    def get_client(cls) -> Client:
         if cls._client is not None:
             return cls._client
         url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
@@ -25,8 +27,26 @@ class SupabaseReportStore:
         return cls._client
 
     @classmethod
-    def save_report(
-        cls,
+    def close(cls) -> None:
+        """클라이언트 연결 정리 (앱 종료 시 호출)"""
+        client, cls._client = cls._client, None
+        session = getattr(getattr(client, "postgrest", None), "session", None)
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    @classmethod
+    def configured(cls) -> bool:
+        """Supabase 접속 정보가 설정되어 있는지"""
+        if cls._client is not None:
+            return True
+        url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
+        return bool(url and os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
+
+    @staticmethod
+    def build_row(
         *,
         market: str,
         symbol: str,
@@ -34,8 +54,8 @@ class SupabaseReportStore:
         sector: Optional[str],
         report: Dict[str, Any],
         user_id: Optional[str] = None,
-    ) -> None:
-        client = cls._get_client()
+    ) -> Dict[str, Any]:
+        """reports 테이블 행 구성"""
         payload: Dict[str, Any] = {
             "market": market,
             "symbol": symbol,
@@ -45,9 +65,63 @@ class SupabaseReportStore:
         }
         if user_id:
             payload["user_id"] = user_id
-        resp = client.table("reports").insert(payload).execute()
+        return payload
+
+    @classmethod
+    def insert_reports(cls, rows: List[Dict[str, Any]]) -> None:
+        """여러 행을 한 번의 insert 로 저장 (동기, 스레드에서 실행)"""
+        client = cls.get_client()
+        resp = client.table("reports").insert(rows).execute()
         # Basic error surface
         if getattr(resp, "error", None):
             raise RuntimeError(str(resp.error))
 
+    @classmethod
+    def save_report(
+        cls,
+        *,
+        market: str,
+        symbol: str,
+        name: str,
+        sector: Optional[str],
+        report: Dict[str, Any],
+        user_id: Optional[str] = None,
+    ) -> None:
+        row = cls.build_row(market=market, symbol=symbol, name=name, sector=sector, report=report, user_id=user_id)
+        cls.insert_reports([row])
+
+    @classmethod
+    def find_recent_reports(
+        cls,
+        *,
+        market: str,
+        symbol: str,
+        model: str,
+        template: str,
+        compare_periods: Sequence[str],
+        since: float,
+        limit: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """since(unix 초) 이후 저장된 같은 시장/종목/모델/템플릿/비교 기간 보고서 (최신순, 동기, 스레드에서 실행)
 
+        (market, symbol, report->>model, created_at) 인덱스를 타는 조회다.
+        템플릿과 비교 기간도 쿼리 조건으로 걸어, 최근 행이 다른 조건의 보고서여도 놓치지 않는다.
+        """
+        client = cls.get_client()
+        resp = (
+            client.table("reports")
+            .select("report,created_at")
+            .eq("market", market)
+            .eq("symbol", symbol)
+            .eq("report->>model", model)
+            .eq("report->>template", template)
+            # jsonb 배열 비교 (순서까지 같아야 함)
+            .eq("report->compare_periods", json.dumps(list(compare_periods), ensure_ascii=False, separators=(",", ":")))
+            .gte("created_at", datetime.fromtimestamp(since, tz=timezone.utc).isoformat())
+            .order("created_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        if getattr(resp, "error", None):
+            raise RuntimeError(str(resp.error))
+        return resp.data or []
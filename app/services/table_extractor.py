@@ -0,0 +1,195 @@
+import re
+from typing import List, Optional, Set
+
+import pandas as pd
+from lxml import html as lxml_html
+from pandas.io.parsers import TextParser
+
+# 네이버 종목 메인 페이지의 기업실적분석 영역 (div.section.cop_analysis > div.sub_section > table)
+_SECTION_CLASSES = {"section", "cop_analysis"}
+_SUB_SECTION_CLASSES = {"sub_section"}
+# class 속성이 있는 <div> 여는 태그 (클래스 목록은 그룹 1)
+_DIV_CLASS_RE = re.compile(r"<div\b[^>]*\bclass\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+_TABLE_END = "</table>"
+_SUB_SECTION_XPATH = ".//div[contains(concat(' ', normalize-space(@class), ' '), ' sub_section ')]//table"
+
+# pandas.read_html 과 같은 공백 정리
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+def _find_div(page: str, classes: Set[str], pos: int = 0) -> Optional[re.Match]:
+    """pos 이후 classes 를 모두 가진 첫 <div> 여는 태그 (CSS 선택자 div.a.b 와 같은 조건)"""
+    for match in _DIV_CLASS_RE.finditer(page, pos):
+        if classes <= set(match.group(1).split()):
+            return match
+    return None
+
+
+def slice_financial_section(page: str) -> Optional[str]:
+    """페이지 문자열에서 기업실적분석 영역 시작부터 첫 표의 끝까지만 잘라낸다 (없으면 None)
+
+    나머지 페이지(수백 KB)는 파싱하지 않는다.
+    """
+    section = _find_div(page, _SECTION_CLASSES)
+    if section is None:
+        return None
+    sub_section = _find_div(page, _SUB_SECTION_CLASSES, section.end())
+    if sub_section is None:
+        return None
+    end = page.find(_TABLE_END, sub_section.end())
+    if end < 0:
+        return None
+    return page[section.start():end + len(_TABLE_END)]
+
+
+def _remove_whitespace(text: str) -> str:
+    return _RE_WHITESPACE.sub(" ", text.strip())
+
+
+def _drop_hidden(table) -> None:
+    """display:none 요소와 <style> 제거 (read_html 의 displayed_only=True 와 동일)"""
+    for elem in table.xpath(".//style"):
+        elem.drop_tree()
+    for elem in table.xpath(".//*[@style]"):
+        if "display:none" in elem.attrib.get("style", "").replace(" ", ""):
+            elem.drop_tree()
+
+
+def _expand_colspan_rowspan(rows) -> List[List[str]]:
+    """<tr> 목록을 텍스트 행으로 변환 (rowspan/colspan 은 셀 값을 복제, read_html 과 같은 규칙)"""
+    all_texts: List[List[str]] = []
+    remainder: List = []  # (index, text, 남은 행 수)
+    for tr in rows:
+        texts: List[str] = []
+        next_remainder: List = []
+        index = 0
+        for td in tr.xpath("./td|./th"):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+            text = _remove_whitespace(td.text_content())
+            rowspan = int(td.get("rowspan") or 1)
+            colspan = int(td.get("colspan") or 1)
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        all_texts.append(texts)
+        remainder = next_remainder
+    while remainder:
+        next_remainder = []
+        texts = []
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        all_texts.append(texts)
+        remainder = next_remainder
+    return all_texts
+
+
+def table_rows(table) -> List[List[str]]:
+    """표 요소를 thead/tbody/tfoot 순서의 텍스트 행 목록으로 변환"""
+    for br in table.xpath(".//br"):
+        br.tail = "\n" + (br.tail or "")
+    header_rows = []
+    for thead in table.xpath(".//thead"):
+        header_rows.extend(thead.xpath("./tr"))
+        if thead.xpath("./td|./th"):
+            header_rows.append(thead)
+    body_rows = table.xpath(".//tbody//tr") + table.xpath("./tr")
+    footer_rows = table.xpath(".//tfoot//tr")
+    if not header_rows:
+        while body_rows and all(cell.tag == "th" for cell in body_rows[0].xpath("./td|./th")):
+            header_rows.append(body_rows.pop(0))
+    rows = (
+        _expand_colspan_rowspan(header_rows)
+        + _expand_colspan_rowspan(body_rows)
+        + _expand_colspan_rowspan(footer_rows)
+    )
+    # 길이가 모자란 행은 빈 문자열로 채운다
+    width = max((len(row) for row in rows), default=0)
+    return [row + [""] * (width - len(row)) for row in rows]
+
+
+def rows_to_frame(rows: List[List[str]]) -> pd.DataFrame:
+    """첫 행을 헤더로 하는 DataFrame (read_html(header=0) 과 같은 타입 추론/천 단위 구분자 처리)"""
+    with TextParser(rows, header=0, index_col=None, skiprows=0, parse_dates=False, thousands=",", decimal=".") as parser:
+        return parser.read()
+
+
+def extract_financial_table(page: str) -> Optional[pd.DataFrame]:
+    """네이버 종목 페이지에서 기업실적분석 표를 DataFrame 으로 추출
+
+    해당 영역만 잘라 lxml(C 파서)로 한 번 파싱하고, 셀 텍스트에서 바로 DataFrame 을 만든다.
+    영역/표를 찾지 못하면 None (호출 측에서 기존 방식으로 처리).
+    """
+    fragment = slice_financial_section(page)
+    if fragment is None:
+        return None
+    # 파서 객체는 스레드 간에 공유하지 않는다 (파싱은 to_thread 워커에서 실행)
+    root = lxml_html.fromstring(fragment, parser=lxml_html.HTMLParser(recover=True))
+    tables = root.xpath(_SUB_SECTION_XPATH)
+    if not tables:
+        return None
+    table = tables[0]
+    if "display:none" in table.get("style", "").replace(" ", ""):
+        return None
+    _drop_hidden(table)
+    rows = table_rows(table)
+    if not rows or not any(text for row in rows for text in row):
+        return None
+    return rows_to_frame(rows).dropna(axis=1, how="all")
+
+
+# 재무제표 페이지(wisereport cF1001) 기간 헤더: "2024/12 (IFRS연결)", "2025/12(E) (IFRS연결)"
+_STATEMENT_PERIOD_RE = re.compile(r"(\d{4})[/.](\d{2})\s*(\(E\))?")
+
+
+def statement_period(text: str) -> Optional[str]:
+    """기간 헤더를 네이버 메인 페이지와 같은 "2024.12" / "2025.12(E)" 형식으로 (기간이 아니면 None)"""
+    match = _STATEMENT_PERIOD_RE.search(text)
+    if match is None:
+        return None
+    return f"{match.group(1)}.{match.group(2)}{match.group(3) or ''}"
+
+
+def extract_statement_table(page: str) -> Optional[pd.DataFrame]:
+    """재무제표 페이지에서 지표 x 기간 표를 추출 (float, 빈 칸은 NaN)
+
+    헤더 행에 기간("YYYY/MM")이 있는 첫 번째 표를 사용한다. 행 이름은 첫 칸, 값은 기간 열.
+    표를 찾지 못하면 None.
+    """
+    root = lxml_html.fromstring(page, parser=lxml_html.HTMLParser(recover=True))
+    for table in root.xpath(".//table"):
+        _drop_hidden(table)
+        rows = table_rows(table)
+        header_index = next(
+            (i for i, row in enumerate(rows) if sum(statement_period(text) is not None for text in row[1:]) >= 2),
+            None,
+        )
+        if header_index is None:
+            continue
+        header = rows[header_index]
+        columns = [(i, statement_period(text)) for i, text in enumerate(header) if i and statement_period(text)]
+        body = [row for row in rows[header_index + 1:] if row and row[0]]
+        if not body:
+            continue
+        frame = pd.DataFrame(
+            [[row[i] for i, _ in columns] for row in body],
+            index=[row[0] for row in body],
+            columns=[period for _, period in columns],
+        )
+        numbers = frame.apply(lambda col: pd.to_numeric(col.str.replace(",", "", regex=False).str.strip(), errors="coerce"))
+        numbers.index.name = "metric"
+        # 같은 지표명/기간이 반복되면 처음 것을 사용
+        numbers = numbers.loc[~numbers.index.duplicated(), ~numbers.columns.duplicated()]
+        return numbers.astype(float)
+    return None
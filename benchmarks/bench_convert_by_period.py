@@ -0,0 +1,108 @@
+"""_convert_to_json_by_period 마이크로 벤치마크
+
+기존 셀 단위 구현(행마다 df.iloc, 셀마다 replace 체인 + float 파싱)과
+컬럼 단위 벡터 구현을 temp/ 재무 CSV 스냅샷에서 비교하고, 출력이 같은지도 확인한다.
+
+    python -m benchmarks.bench_convert_by_period --repeat 200
+"""
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from app.services.naver_crawler import NaverFinancialCrawler
+
+from .stubs import FIXTURE_DIR
+
+PERIODS = ["2022.12", "2023.12", "2024.12", "2024.06", "2025.06"]
+
+
+def legacy_convert_to_json_by_period(df: pd.DataFrame, compare_periods: List[str]) -> List[Dict]:
+    """
+    데이터프레임을 JSON 형식으로 변환
+    df: 재무제표 데이터프레임
+    compare_periods: 비교할 기간 리스트
+    """
+    result = []
+    
+    if len(df) < 1:
+        pass  # print("[Error] 데이터가 충분하지 않습니다.")
+        return []
+    
+    period_row = df.iloc[0]
+    
+    # 요청한 기간과 일치하는 컬럼 찾기
+    matching_columns = []
+    for period in compare_periods:
+        for col_idx, col_value in enumerate(period_row):
+            if str(col_value) == str(period):
+                col_name = df.columns[col_idx]
+                matching_columns.append((period, col_name))
+                break
+        else:
+            pass  # print(f"[Warning] 요청한 기간 '{period}'을 찾을 수 없습니다.")
+    
+    if not matching_columns:
+        pass  # print(f"[Warning] 요청한 기간들이 데이터에 없습니다.")
+        if len(df.columns) > 2:
+            matching_columns = [
+                (period_row.iloc[1], df.columns[1]),
+                (period_row.iloc[2], df.columns[2])
+            ]
+    
+    # 각 매칭된 컬럼에 대해 JSON 데이터 생성
+    for i, (period_value, col_name) in enumerate(matching_columns):
+        period_data = {}
+        original_period = compare_periods[i] if i < len(compare_periods) else str(period_value)
+        
+        for index in range(2, len(df)):
+            row = df.iloc[index]
+            if pd.notna(row.iloc[0]) and pd.notna(row[col_name]):
+                key = f"{original_period} - {row.iloc[0]}"
+                try:
+                    value_str = str(row[col_name]).replace(',', '').replace('원', '').replace('%', '').replace('억', '').strip()
+                    try:
+                        value = float(value_str) if '.' in value_str else int(float(value_str))
+                        period_data[key] = int(value) if isinstance(value, float) and value.is_integer() else float(value)
+                    except (ValueError, TypeError):
+                        period_data[key] = str(row[col_name])
+                except Exception:
+                    period_data[key] = str(row[col_name])
+        
+        if period_data:
+            result.append(period_data)
+    
+    return result
+
+
+def _bench(fn, frames, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for df in frames:
+            fn(df, PERIODS)
+    return (time.perf_counter() - start) / (repeat * len(frames))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = [pd.read_csv(p, encoding="utf-8-sig", dtype=str) for p in sorted(FIXTURE_DIR.glob("*_financials.csv"))]
+    crawler = NaverFinancialCrawler()
+    for df in frames:
+        assert json.dumps(crawler._convert_to_json_by_period(df, PERIODS), ensure_ascii=False) == json.dumps(
+            legacy_convert_to_json_by_period(df, PERIODS), ensure_ascii=False
+        ), "vectorized output differs from legacy output"
+
+    legacy = _bench(legacy_convert_to_json_by_period, frames, args.repeat)
+    vectorized = _bench(crawler._convert_to_json_by_period, frames, args.repeat)
+    print(f"frames={len(frames)} periods={len(PERIODS)} repeat={args.repeat}")
+    print(f"legacy     : {legacy * 1e3:.3f} ms/call")
+    print(f"vectorized : {vectorized * 1e3:.3f} ms/call (speedup x{legacy / vectorized:.1f})")
+
+
+if __name__ == "__main__":
+    main()
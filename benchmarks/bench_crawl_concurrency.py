@@ -0,0 +1,63 @@
+"""/api/financial/crawl 동시성 벤치마크
+
+로컬 네이버 스텁 서버(고정 지연)를 띄우고 N개의 크롤 요청을 동시에 보냈을 때
+전체 소요 시간이 "가장 느린 요청 1건" 수준인지(겹쳐서 실행) 확인한다.
+
+    python -m benchmarks.bench_crawl_concurrency --requests 20 --latency 0.3
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+
+from .stubs import NaverStubServer
+
+
+async def _run(app, codes, concurrent: bool) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(code: str) -> int:
+            res = await client.post(
+                "/api/financial/crawl",
+                json={"stock_code": code, "compare_periods": ["2024.12", "2025.06"]},
+            )
+            return res.status_code
+
+        start = time.perf_counter()
+        if concurrent:
+            statuses = await asyncio.gather(*(one(code) for code in codes))
+        else:
+            statuses = [await one(code) for code in codes]
+        elapsed = time.perf_counter() - start
+    failed = [s for s in statuses if s != 200]
+    if failed:
+        raise SystemExit(f"unexpected status codes: {failed}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.3, help="스텁 서버 응답 지연(초)")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with NaverStubServer(latency=args.latency) as stub:
+        # 앱 import 전에 크롤러가 스텁 서버를 바라보도록 설정
+        os.environ["NAVER_FINANCE_BASE_URL"] = stub.base_url
+        from app.main import app
+
+        codes = [list(stub.pages)[i % len(stub.pages)] for i in range(args.requests)]
+        serial = asyncio.run(_run(app, codes, concurrent=False))
+        concurrent = asyncio.run(_run(app, codes, concurrent=True))
+
+    print(f"requests={args.requests} upstream_latency={args.latency:.2f}s")
+    print(f"serial     : {serial:.3f}s ({serial / args.requests * 1000:.1f} ms/req)")
+    print(f"concurrent : {concurrent:.3f}s (speedup x{serial / concurrent:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""/crawl 응답 직렬화 벤치마크 (기존 형식 vs ?format=columnar)
+
+temp/ 재무 CSV 스냅샷마다 같은 FinancialTable 에서 두 응답 모델을 만들어
+JSON 크기, 모델 생성(검증) + 직렬화 시간, 클라이언트 쪽 JSON 검증(model_validate_json) 시간을 비교한다.
+기존 형식은 FastAPI 와 같이 dict 목록을 응답 모델로 검증한 뒤 직렬화한다.
+
+    python -m benchmarks.bench_financial_payload --repeat 500
+"""
+import argparse
+import time
+from typing import Callable, List
+
+import pandas as pd
+
+from app.models.financial import ColumnarFinancialResponse, FinancialResponse
+from app.services.financial_table import FinancialTable
+
+from .stubs import FIXTURE_DIR
+
+PERIODS = ["2022.12", "2023.12", "2024.12", "2024.06", "2025.06"]
+
+
+def legacy_payload(code: str, table: FinancialTable) -> bytes:
+    return FinancialResponse(
+        stock_code=code, stock_name=None, compare_periods=PERIODS,
+        financial_data=table.to_records(), csv_path=None,
+    ).model_dump_json().encode()
+
+
+def columnar_payload(code: str, table: FinancialTable) -> bytes:
+    return ColumnarFinancialResponse(
+        stock_code=code, stock_name=None, compare_periods=PERIODS,
+        periods=table.periods, metrics=table.metrics, values=table.numeric_values(), csv_path=None,
+    ).model_dump_json().encode()
+
+
+def _bench(fn: Callable, inputs: List, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            fn(*item)
+    return (time.perf_counter() - start) / (repeat * len(inputs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    inputs = []
+    for path in sorted(FIXTURE_DIR.glob("*_financials.csv")):
+        df = pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+        inputs.append((path.name.split("_")[0], FinancialTable.from_frame(df, PERIODS)))
+
+    print(f"tickers={len(inputs)} periods={len(PERIODS)} repeat={args.repeat}")
+    for name, fn, model in (
+        ("legacy", legacy_payload, FinancialResponse),
+        ("columnar", columnar_payload, ColumnarFinancialResponse),
+    ):
+        payloads = [fn(*item) for item in inputs]
+        size = sum(len(p) for p in payloads) / len(payloads)
+        serialize = _bench(fn, inputs, args.repeat)
+        parse = _bench(model.model_validate_json, [(p,) for p in payloads], args.repeat)
+        print(f"{name:9s}: {size:8.0f} bytes/response  serialize {serialize * 1e6:7.1f} us  parse {parse * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
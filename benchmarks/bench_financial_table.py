@@ -0,0 +1,84 @@
+"""재무 표 생성 벤치마크
+
+기존 _build_financial_table (크롤러 JSON 의 "기간 - 지표" 키를 다시 나눠 DataFrame 을 만든 뒤
+to_markdown / to_html / to_csv) 과 크롤러 DataFrame 에서 바로 만든 FinancialTable 의 기본 출력기를
+temp/ 재무 CSV 스냅샷에서 비교한다. to_markdown 은 tabulate 가 필요하므로 없으면 그 항목은 건너뛴다.
+
+    python -m benchmarks.bench_financial_table --repeat 200
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from app.services.financial_table import FinancialTable
+from app.services.naver_crawler import NaverFinancialCrawler
+
+from .stubs import FIXTURE_DIR
+
+PERIODS = ["2022.12", "2023.12", "2024.12", "2024.06", "2025.06"]
+
+
+def legacy_frame(financial_data: List[Dict]) -> pd.DataFrame:
+    """기존 _build_financial_table 의 DataFrame 구성 부분"""
+    rows = {}
+    periods = set()
+    for entry in financial_data:
+        for k, v in entry.items():
+            if ' - ' in k:
+                period, metric = k.split(' - ', 2)
+            else:
+                period, metric = '기간', k
+            periods.add(period)
+            rows.setdefault(metric, {})[period] = v
+    periods = sorted(list(periods))
+    df = pd.DataFrame.from_dict(rows, orient='index')[periods]
+    df.index.name = '지표'
+    return df.reset_index()
+
+
+def _bench(fn: Callable, inputs: List, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            fn(item)
+    return (time.perf_counter() - start) / (repeat * len(inputs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = [pd.read_csv(p, encoding="utf-8-sig", dtype=str) for p in sorted(FIXTURE_DIR.glob("*_financials.csv"))]
+    crawler = NaverFinancialCrawler()
+    records = [crawler._convert_to_json_by_period(df, PERIODS) for df in frames]
+    tables = [FinancialTable.from_frame(df, PERIODS) for df in frames]
+
+    try:
+        import tabulate  # noqa: F401
+    except ImportError:
+        tabulate = None
+
+    cases = {
+        "markdown": (lambda data: legacy_frame(data).to_markdown(index=False), lambda table: table.to_markdown()),
+        "html": (lambda data: legacy_frame(data).to_html(index=False), lambda table: table.to_html()),
+        "csv": (lambda data: legacy_frame(data).to_csv(index=False), lambda table: table.to_csv()),
+    }
+    build = _bench(lambda df: FinancialTable.from_frame(df, PERIODS), frames, args.repeat)
+    print(f"frames={len(frames)} periods={len(PERIODS)} repeat={args.repeat}")
+    print(f"table build (from DataFrame) : {build * 1e3:.3f} ms/call")
+    for name, (legacy_fn, native_fn) in cases.items():
+        native = _bench(native_fn, tables, args.repeat)
+        if name == "markdown" and tabulate is None:
+            print(f"{name:8s} legacy : skipped (tabulate 미설치 - 기존 코드는 '(재무 표 생성 실패)' 반환)")
+            print(f"{name:8s} native : {native * 1e3:.3f} ms/call")
+            continue
+        legacy = _bench(legacy_fn, records, args.repeat)
+        print(f"{name:8s} legacy : {legacy * 1e3:.3f} ms/call")
+        print(f"{name:8s} native : {native * 1e3:.3f} ms/call (speedup x{legacy / native:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""엔드포인트 부하 테스트 (네트워크 없이 로컬 스텁 업스트림 사용)
+
+네이버(픽스처 페이지), Perplexity(지연/스트리밍 설정 가능), Supabase(PostgREST insert) 스텁 서버를 띄우고
+/api/financial/crawl, /api/analysis/analyze, /api/analysis/save_markdown 에 동시 실행 수별로
+요청을 보내 p50/p95/p99 지연과 처리량(RPS)을 보고한다. 앱은 lifespan 을 포함해 같은 프로세스에서
+ASGI 로 호출한다.
+
+    python -m benchmarks.bench_load --concurrency 1,8,32 --requests 64 --output bench.json
+    python -m benchmarks.bench_load --baseline bench.json --tolerance 0.25   # 회귀 시 종료 코드 1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, List, Sequence, Tuple
+
+import httpx
+
+from app.services.resilience import reset_upstream_policies
+
+from .stubs import NaverStubServer, PerplexityStubServer, SupabaseStubServer
+
+SCENARIOS = ("crawl", "analyze", "save_markdown")
+PERIODS = ["2024.12", "2025.06"]
+
+
+@dataclass
+class LevelResult:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    elapsed: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """nearest-rank 백분위수 (정렬된 값)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), int(-(-q * len(sorted_values) // 100))))
+    return sorted_values[rank - 1]
+
+
+async def run_level(
+    scenario: str,
+    send: Callable[[int], Awaitable[int]],
+    concurrency: int,
+    total: int,
+) -> LevelResult:
+    """concurrency 개의 워커가 total 건을 나눠 보내는 closed-loop 부하"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            start = time.perf_counter()
+            try:
+                status = await send(index)
+            except Exception:
+                status = 0
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return LevelResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        requests=total,
+        errors=errors,
+        elapsed=elapsed,
+        rps=total / elapsed if elapsed else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+    )
+
+
+@contextmanager
+def stub_upstreams(
+    naver_latency: float = 0.05,
+    llm_latency: float = 0.3,
+    llm_chunks: int = 20,
+    supabase_latency: float = 0.02,
+) -> Iterator[Tuple[NaverStubServer, PerplexityStubServer, SupabaseStubServer]]:
+    """스텁 서버 3개를 띄우고 앱이 바라보도록 환경변수를 설정 (종료 시 복원)"""
+    with ExitStack() as stack:
+        naver = stack.enter_context(NaverStubServer(latency=naver_latency))
+        perplexity = stack.enter_context(PerplexityStubServer(latency=llm_latency, chunks=llm_chunks))
+        supabase = stack.enter_context(SupabaseStubServer(latency=supabase_latency))
+        overrides = {
+            "NAVER_FINANCE_BASE_URL": naver.base_url,
+            "PERPLEXITY_BASE_URL": perplexity.base_url,
+            "SUPABASE_URL": supabase.base_url,
+            "SUPABASE_SERVICE_ROLE_KEY": "bench-service-role-key",
+            "SERVICE_WARMUP": "false",
+            "ENABLE_SERVER_SAVE": "true",
+            # 스텁은 한 호스트/키로 몰리므로 업스트림 속도 제한은 끄고 측정
+            "NAVER_RATE_LIMIT": "0",
+            "PERPLEXITY_RATE_LIMIT": "0",
+        }
+        previous = {key: os.environ.get(key) for key in overrides}
+        os.environ.update(overrides)
+        reset_upstream_policies()
+        try:
+            yield naver, perplexity, supabase
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            reset_upstream_policies()
+
+
+async def run_suite(
+    scenarios: Sequence[str] = SCENARIOS,
+    levels: Sequence[int] = (1, 8, 32),
+    requests: int = 64,
+    cold: bool = False,
+    naver_latency: float = 0.05,
+    llm_latency: float = 0.3,
+    supabase_latency: float = 0.02,
+) -> List[LevelResult]:
+    """스텁 업스트림 위에서 시나리오 x 동시 실행 수 조합을 측정
+
+    cold 가 참이면 재무 데이터 캐시를 끄고 매 요청 네이버 스텁에서 가져온다.
+    """
+    from app.main import app
+    from app.services.container import services
+    from app.services.financial_cache import FinancialDataCache
+    from app.services.report_files import ReportFileStore
+    from app.services.snapshot_store import SnapshotStore
+    from app.services.supabase_service import SupabaseReportStore
+
+    results: List[LevelResult] = []
+    # save_markdown 보고서와 크롤링 스냅샷은 임시 디렉토리에 저장 (저장소의 temp/ 를 건드리지 않도록)
+    report_files = services.report_files
+    output_dir = tempfile.TemporaryDirectory(prefix="bench-load-")
+
+    with stub_upstreams(naver_latency, llm_latency, supabase_latency=supabase_latency) as (naver, _, _):
+        codes = sorted(naver.pages)
+        crawler = services.crawler
+        original = (crawler.base_url, crawler.cache, crawler.snapshots)
+        crawler.base_url = naver.base_url
+        crawler.cache = FinancialDataCache(ttl=0) if cold else FinancialDataCache()
+        crawler.snapshots = SnapshotStore(os.path.join(output_dir.name, "snapshots"), mode=original[2].mode)
+        services.report_files = ReportFileStore(
+            output_dir.name, compress=report_files.compress, dedupe=report_files.dedupe,
+            max_bytes=report_files.max_bytes, max_age=report_files.max_age,
+        )
+        SupabaseReportStore.close()
+        try:
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+                    async def crawl(i: int) -> int:
+                        res = await client.post("/api/financial/crawl", json={
+                            "stock_code": codes[i % len(codes)], "compare_periods": PERIODS,
+                        })
+                        return res.status_code
+
+                    async def analyze(i: int) -> int:
+                        res = await client.post("/api/analysis/analyze", json={
+                            "stock_code": codes[i % len(codes)],
+                            "stock_name": f"종목{codes[i % len(codes)]}",
+                            "compare_periods": PERIODS,
+                            "api_key": "bench-key",
+                            "use_cache": False,
+                        })
+                        return res.status_code
+
+                    async def save_markdown(i: int) -> int:
+                        res = await client.post("/api/analysis/save_markdown", json={
+                            "content": "# 벤치마크 보고서\n\n" + "본문 " * 2000,
+                            "filename": f"bench-load-{i % 16}.md",
+                        })
+                        return res.status_code
+
+                    senders: Dict[str, Callable[[int], Awaitable[int]]] = {
+                        "crawl": crawl, "analyze": analyze, "save_markdown": save_markdown,
+                    }
+                    for scenario in scenarios:
+                        await senders[scenario](0)  # 워밍업
+                        for concurrency in levels:
+                            results.append(await run_level(scenario, senders[scenario], concurrency, requests))
+        finally:
+            crawler.base_url, crawler.cache, crawler.snapshots = original
+            SupabaseReportStore.close()
+            services.report_files = report_files
+            output_dir.cleanup()
+    return results
+
+
+def compare(results: Sequence[LevelResult], baseline: Sequence[Dict], tolerance: float) -> List[str]:
+    """기준 결과 대비 p95 증가 / RPS 감소가 tolerance 비율을 넘는 항목"""
+    base = {(b["scenario"], b["concurrency"]): b for b in baseline}
+    regressions = []
+    for r in results:
+        b = base.get((r.scenario, r.concurrency))
+        if b is None:
+            continue
+        if r.p95_ms > b["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{r.scenario} c={r.concurrency}: p95 {b['p95_ms']:.1f} -> {r.p95_ms:.1f} ms")
+        if r.rps < b["rps"] * (1 - tolerance):
+            regressions.append(f"{r.scenario} c={r.concurrency}: rps {b['rps']:.1f} -> {r.rps:.1f}")
+        if r.errors > b["errors"]:
+            regressions.append(f"{r.scenario} c={r.concurrency}: errors {b['errors']} -> {r.errors}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="쉼표 구분 시나리오")
+    parser.add_argument("--concurrency", default="1,8,32", help="쉼표 구분 동시 실행 수")
+    parser.add_argument("--requests", type=int, default=64, help="동시 실행 수별 요청 수")
+    parser.add_argument("--cold", action="store_true", help="재무 데이터 캐시 비활성화")
+    parser.add_argument("--naver-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--supabase-latency", type=float, default=0.02)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 회귀 비율")
+    args = parser.parse_args()
+    # 요청별 INFO 로그는 측정값을 흐리므로 경고 이상만 출력
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(run_suite(
+        scenarios=[s for s in args.scenarios.split(",") if s],
+        levels=[int(c) for c in args.concurrency.split(",") if c],
+        requests=args.requests,
+        cold=args.cold,
+        naver_latency=args.naver_latency,
+        llm_latency=args.llm_latency,
+        supabase_latency=args.supabase_latency,
+    ))
+
+    print(f"{'scenario':<14}{'conc':>6}{'reqs':>7}{'err':>5}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r.scenario:<14}{r.concurrency:>6}{r.requests:>7}{r.errors:>5}{r.rps:>9.1f}"
+              f"{r.p50_ms:>10.1f}{r.p95_ms:>10.1f}{r.p99_ms:>10.1f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"results": [asdict(r) for r in results]}, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""프롬프트 렌더링 마이크로 벤치마크
+
+기존 구현(요청마다 템플릿 파일 읽기 + replace 3회 + indent=2 JSON)과
+미리 분해해 둔 템플릿 슬롯에 compact JSON 을 끼우는 구현의 렌더링 시간과 프롬프트 크기를 비교한다.
+재무 데이터는 temp/ 재무 CSV 스냅샷에서 만든다.
+
+    python -m benchmarks.bench_prompt_render --repeat 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from app.services.naver_crawler import NaverFinancialCrawler
+from app.services.prompt_templates import DEFAULT_TEMPLATE_PATH, PromptTemplateRegistry
+
+from .stubs import FIXTURE_DIR
+
+PERIODS = ["2022.12", "2023.12", "2024.12", "2024.06", "2025.06"]
+
+
+def legacy_render(stock_name: str, financial_data: List[Dict]) -> str:
+    """기존 build_prompt 의 템플릿 처리 부분"""
+    with open(DEFAULT_TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        template = f.read()
+    financial_json = json.dumps(financial_data, ensure_ascii=False, indent=2)
+    return (
+        template
+        .replace("[company name]", stock_name)
+        .replace("{financial-json}", financial_json)
+        .replace("YYYY-MM-DD", datetime.now().strftime("%Y-%m-%d"))
+    )
+
+
+def _bench(render: Callable[[str, List[Dict]], str], datasets: List[List[Dict]], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in datasets:
+            render("삼성전자", data)
+    return (time.perf_counter() - start) / (repeat * len(datasets))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    crawler = NaverFinancialCrawler()
+    datasets = [
+        crawler._convert_to_json_by_period(pd.read_csv(p, encoding="utf-8-sig", dtype=str), PERIODS)
+        for p in sorted(FIXTURE_DIR.glob("*_financials.csv"))
+    ]
+    template = PromptTemplateRegistry.from_env().get()
+
+    def compiled_render(stock_name: str, financial_data: List[Dict]) -> str:
+        return template.render(
+            company_name=stock_name,
+            financial_json=json.dumps(financial_data, ensure_ascii=False, separators=(",", ":")),
+            date=datetime.now().strftime("%Y-%m-%d"),
+        )
+
+    legacy_size = sum(len(legacy_render("삼성전자", d).encode("utf-8")) for d in datasets) / len(datasets)
+    compiled_size = sum(len(compiled_render("삼성전자", d).encode("utf-8")) for d in datasets) / len(datasets)
+
+    legacy = _bench(legacy_render, datasets, args.repeat)
+    compiled = _bench(compiled_render, datasets, args.repeat)
+    print(f"datasets={len(datasets)} periods={len(PERIODS)} repeat={args.repeat}")
+    print(f"legacy   : {legacy * 1e6:8.1f} us/render  {legacy_size:8.0f} bytes/prompt")
+    print(
+        f"compiled : {compiled * 1e6:8.1f} us/render  {compiled_size:8.0f} bytes/prompt "
+        f"(speedup x{legacy / compiled:.1f}, size -{(1 - compiled_size / legacy_size) * 100:.0f}%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""스크리닝 벤치마크 (캐시된 종목 수천 개 기준)
+
+temp/ 재무 CSV 스냅샷을 값만 흔들어 복제해 --tickers 개 종목으로 캐시를 채운 뒤,
+패널 최초 구성 / 한 종목 갱신 후 재구성 / 필터+정렬+상위 N 조회 시간을 잰다.
+
+    python -m benchmarks.bench_screen --tickers 3000 --repeat 200
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.financial_cache import FinancialDataCache
+from app.services.screener import Screener
+
+from .stubs import FIXTURE_DIR
+
+FILTERS = [("ROE", ">=", 8), ("PER", "<", 15), ("부채비율", "<", 150)]
+
+
+def _jitter(df: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """숫자 칸에 0.5~1.5 배를 곱한 복사본 (기간/헤더 행은 그대로)"""
+    copy = df.copy()
+    body = copy.iloc[2:, 1:]
+    numbers = body.apply(lambda col: pd.to_numeric(col.str.replace(",", "", regex=False), errors="coerce"))
+    scaled = (numbers * rng.uniform(0.5, 1.5, size=numbers.shape)).round(2)
+    copy.iloc[2:, 1:] = scaled.astype(object).where(scaled.notna(), body)
+    return copy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    templates = [pd.read_csv(p, encoding="utf-8-sig", dtype=str) for p in sorted(FIXTURE_DIR.glob("*_financials.csv"))]
+    cache = FinancialDataCache(ttl=3600, max_entries=args.tickers, max_bytes=1 << 40)
+    for i in range(args.tickers):
+        cache.put(f"{i:06d}", _jitter(templates[i % len(templates)], rng))
+    screener = Screener(lambda: cache)
+
+    start = time.perf_counter()
+    panel, _, _ = screener.panel()
+    print(f"tickers={args.tickers} rows={len(panel)} metrics={len(panel.metrics)}")
+    print(f"initial build : {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    cache.put("000000", _jitter(templates[0], rng))
+    start = time.perf_counter()
+    screener.panel()
+    print(f"rebuild (1 changed): {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        result = screener.screen(FILTERS, sort_by="ROE", limit=50)
+    elapsed = (time.perf_counter() - start) / args.repeat
+    print(f"screen        : {elapsed * 1e3:8.2f} ms  (universe={result.universe} matched={result.matched})")
+
+
+if __name__ == "__main__":
+    main()
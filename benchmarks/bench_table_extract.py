@@ -0,0 +1,82 @@
+"""기업실적분석 표 추출 벤치마크 (파싱 시간 / 최대 메모리)
+
+기존 방식(전체 페이지 BeautifulSoup html.parser -> 영역 문자열화 -> pd.read_html 재파싱)과
+영역만 잘라 lxml 로 한 번 파싱하는 방식을 픽스처 페이지에서 비교하고, 결과가 같은지도 확인한다.
+실제 종목 페이지 크기(수백 KB)에 맞추도록 영역 앞뒤에 다른 섹션 마크업을 채운다.
+
+    python -m benchmarks.bench_table_extract --repeat 20 --page-kb 250
+"""
+import argparse
+import time
+import tracemalloc
+from io import StringIO
+from typing import Callable, List
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from pandas.testing import assert_frame_equal
+
+from app.services.table_extractor import extract_financial_table
+
+from .stubs import load_naver_pages
+
+
+def legacy_parse(html: str) -> pd.DataFrame:
+    """기존 _parse_financial_table 구현"""
+    soup = BeautifulSoup(html, "html.parser")
+    finance_html = soup.select_one("div.section.cop_analysis div.sub_section")
+    dfs = pd.read_html(StringIO(str(finance_html)), header=0)
+    return dfs[0].dropna(axis=1, how="all")
+
+
+def pad_page(page: str, size_kb: int) -> str:
+    """영역 앞뒤에 뉴스/시세 목록 같은 마크업을 채워 페이지 크기를 맞춘다"""
+    row = "<li><a href=\"/item/news_read.nhn?article_id=0001\" class=\"tit\">시장 동향 기사 제목</a><span>2025.06.30</span></li>\n"
+    filler = "<div class=\"section news_section\"><ul>" + row * (size_kb * 1024 // (2 * len(row.encode("utf-8")))) + "</ul></div>"
+    head, sep, tail = page.partition("<div class=\"section cop_analysis\">")
+    return head + filler + sep + tail.replace("</body>", filler + "</body>")
+
+
+def _bench(fn: Callable[[str], pd.DataFrame], pages: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            fn(page)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def _peak_memory(fn: Callable[[str], pd.DataFrame], pages: List[str]) -> int:
+    peak = 0
+    for page in pages:
+        tracemalloc.start()
+        fn(page)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-kb", type=int, default=250, help="패딩 후 페이지 크기(KB), 0 이면 패딩 없음")
+    args = parser.parse_args()
+
+    pages = list(load_naver_pages().values())
+    if args.page_kb:
+        pages = [pad_page(page, args.page_kb) for page in pages]
+    for page in pages:
+        assert_frame_equal(extract_financial_table(page), legacy_parse(page))
+
+    legacy = _bench(legacy_parse, pages, args.repeat)
+    fast = _bench(extract_financial_table, pages, args.repeat)
+    legacy_peak = _peak_memory(legacy_parse, pages)
+    fast_peak = _peak_memory(extract_financial_table, pages)
+    size = sum(len(p.encode("utf-8")) for p in pages) / len(pages) / 1024
+    print(f"pages={len(pages)} avg_size={size:.0f} KB repeat={args.repeat}")
+    print(f"bs4 + read_html : {legacy * 1e3:8.2f} ms/page  peak {legacy_peak / 1024:8.0f} KB (tracemalloc, Python 힙)")
+    print(f"slice + lxml    : {fast * 1e3:8.2f} ms/page  peak {fast_peak / 1024:8.0f} KB "
+          f"(speedup x{legacy / fast:.1f}, memory -{(1 - fast_peak / legacy_peak) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""벤치마크용 로컬 업스트림 스텁 서버
+
+네트워크 없이 크롤러/엔드포인트 성능을 측정하기 위해 temp/*_financials.csv 스냅샷으로부터
+네이버 증권 종목 페이지를 재구성해 서빙하고, Perplexity chat/completions(일반/스트리밍)와
+Supabase PostgREST insert 를 흉내 낸다.
+"""
+import csv
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+FIXTURE_DIR = PROJECT_ROOT / "temp"
+
+
+def _format_cell(value: str) -> str:
+    """네이버 페이지처럼 숫자에 천 단위 구분자를 붙인다"""
+    if re.fullmatch(r"-?\d+", value):
+        return f"{int(value):,}"
+    return value
+
+
+def render_naver_item_page(csv_path: Path) -> str:
+    """재무 CSV 스냅샷을 네이버 종목 메인 페이지(cop_analysis 영역 포함) HTML로 변환"""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    header, periods, accounting, body = rows[0], rows[1], rows[2], rows[3:]
+
+    # "최근 연간 실적", "최근 연간 실적.1" ... -> colspan 그룹
+    groups: List[List] = []
+    for label in header[1:]:
+        base = re.sub(r"\.\d+$", "", label)
+        if groups and groups[-1][0] == base:
+            groups[-1][1] += 1
+        else:
+            groups.append([base, 1])
+
+    out = [
+        "<html><head><title>stub</title></head><body>",
+        "<div id=\"wrap\"><div class=\"section trade_compare\"><table><tr><td>noise</td></tr></table></div>",
+        "<div class=\"section cop_analysis\">",
+        "<div class=\"sub_section\">",
+        "<table class=\"tb_type1 tb_num tb_type1_ifrs\">",
+        "<caption class=\"blind\">기업실적분석 표</caption>",
+        "<thead>",
+        f"<tr><th scope=\"col\" rowspan=\"3\" class=\"h_th2 th_cop_anal1\"><strong>{header[0]}</strong></th>",
+    ]
+    for label, span in groups:
+        out.append(f"<th scope=\"col\" colspan=\"{span}\"><strong>{label}</strong></th>")
+    out.append("</tr><tr>")
+    for period in periods[1:]:
+        out.append(f"<th scope=\"col\">\n\t\t\t\t{period}\n\t\t\t</th>")
+    out.append("</tr><tr>")
+    for acc in accounting[1:]:
+        out.append(f"<th scope=\"col\">{acc}</th>")
+    out.append("</tr></thead><tbody>")
+    for row in body:
+        out.append(f"<tr><th scope=\"row\"><strong>{row[0]}</strong></th>")
+        for value in row[1:]:
+            out.append(f"<td class=\"\">\n\t\t\t\t\t{_format_cell(value)}\n\t\t\t\t</td>")
+        out.append("</tr>")
+    out.append("</tbody></table></div></div></div></body></html>")
+    return "".join(out)
+
+
+def load_naver_pages(fixture_dir: Path = FIXTURE_DIR) -> Dict[str, str]:
+    """stock_code -> 렌더링된 페이지 HTML"""
+    pages = {}
+    for path in sorted(fixture_dir.glob("*_financials.csv")):
+        pages[path.name.split("_")[0]] = render_naver_item_page(path)
+    return pages
+
+
+def render_statement_page(periods: List[str], rows: Dict[str, List[Optional[str]]]) -> str:
+    """재무제표 페이지(주요재무정보) 표 HTML. periods 는 "2024.12" / "2025.12(E)" 형식, 빈 값은 None"""
+    out = ["<div class=\"um_table\"><table class=\"gHead01 all-width\"><thead><tr><th scope=\"col\">주요재무정보</th>"]
+    for period in periods:
+        estimate = "(E)" if period.endswith("(E)") else ""
+        out.append(f"<th scope=\"col\">{period[:7].replace('.', '/')}{estimate}<br/>(IFRS연결)</th>")
+    out.append("</tr></thead><tbody>")
+    for metric, values in rows.items():
+        out.append(f"<tr><th scope=\"row\" class=\"txt\">{metric}</th>")
+        for value in values:
+            out.append(f"<td class=\"num\">{_format_cell(value) if value is not None else '&nbsp;'}</td>")
+        out.append("</tr>")
+    out.append("</tbody></table></div>")
+    return "".join(out)
+
+
+def render_statement_company_page(encparam: str = "stub-encparam") -> str:
+    """재무제표 표 요청에 필요한 encparam 을 담은 기업현황 페이지"""
+    return f"<html><head><script>var param = {{ cmp_cd: '', encparam: '{encparam}' }};</script></head></html>"
+
+
+class _BacklogHTTPServer(ThreadingHTTPServer):
+    # 기본 backlog(5)로는 동시 접속 벤치마크에서 SYN 재전송 지연이 생긴다
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class _StubServer(ABC):
+    """ThreadingHTTPServer 를 백그라운드 스레드로 띄우는 컨텍스트 매니저 (하위 클래스가 요청 핸들러 제공)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.httpd = _BacklogHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def _make_handler(self) -> type:
+        """이 서버의 BaseHTTPRequestHandler 하위 클래스"""
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class NaverStubServer(_StubServer):
+    """/item/main.nhn?code=XXXXXX 요청에 고정 지연 후 픽스처 페이지를 응답"""
+
+    def __init__(self, latency: float = 0.2, pages: Optional[Dict[str, str]] = None, **kwargs) -> None:
+        self.latency = latency
+        self.pages = pages if pages is not None else load_naver_pages()
+        self.request_count = 0
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                code = parse_qs(parsed.query).get("code", [""])[0]
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                page = stub.pages.get(code)
+                if parsed.path != "/item/main.nhn" or page is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = page.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class _JsonHandlerMixin:
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def _send_json(self, status: int, body) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class PerplexityStubServer(_StubServer):
+    """POST /chat/completions 에 고정 지연 후 응답 (stream=true 이면 SSE 로 조각 전송)
+
+    Args:
+        latency: 첫 응답(스트리밍은 첫 조각)까지의 지연(초)
+        chunks: 스트리밍 시 본문을 나눌 조각 수
+        chunk_delay: 스트리밍 조각 사이 지연(초)
+        content: 응답 본문 (분석 보고서 대용)
+    """
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        chunks: int = 20,
+        chunk_delay: float = 0.01,
+        content: str = "# 투자 분석 보고서\n\n" + "재무 지표 요약 문장입니다. " * 200,
+        **kwargs,
+    ) -> None:
+        self.latency = latency
+        self.chunks = max(1, chunks)
+        self.chunk_delay = chunk_delay
+        self.content = content
+        self.request_count = 0
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _pieces(self) -> List[str]:
+        size = -(-len(self.content) // self.chunks)
+        return [self.content[i:i + size] for i in range(0, len(self.content), size)]
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(_JsonHandlerMixin, BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = self._read_json() or {}
+                with stub._lock:
+                    stub.request_count += 1
+                if urlparse(self.path).path != "/chat/completions":
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                time.sleep(stub.latency)
+                meta = {
+                    "model": payload.get("model", "sonar-pro"),
+                    "created": int(time.time()),
+                    "citations": ["https://example.com/report"],
+                    "usage": {"prompt_tokens": 1500, "completion_tokens": 800, "total_tokens": 2300},
+                }
+                if not payload.get("stream"):
+                    self._send_json(200, {"choices": [{"message": {"role": "assistant", "content": stub.content}}], **meta})
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                pieces = stub._pieces()
+                for index, piece in enumerate(pieces):
+                    chunk = {"choices": [{"delta": {"content": piece}}]}
+                    if index == len(pieces) - 1:
+                        chunk.update(meta)
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(stub.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        return Handler
+
+
+class SupabaseStubServer(_StubServer):
+    """PostgREST insert(POST /rest/v1/<table>) 를 받아 메모리에 저장하는 Supabase 대용 서버"""
+
+    def __init__(self, latency: float = 0.02, **kwargs) -> None:
+        self.latency = latency
+        self.rows: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(_JsonHandlerMixin, BaseHTTPRequestHandler):
+            def do_POST(self):
+                match = re.fullmatch(r"/rest/v1/(\w+)", urlparse(self.path).path)
+                if match is None:
+                    self._send_json(404, {"message": "not found"})
+                    return
+                body = self._read_json()
+                rows = body if isinstance(body, list) else [body]
+                time.sleep(stub.latency)
+                with stub._lock:
+                    table = stub.rows.setdefault(match.group(1), [])
+                    inserted = [{"id": len(table) + i + 1, **row} for i, row in enumerate(rows)]
+                    table.extend(inserted)
+                self._send_json(201, inserted)
+
+        return Handler
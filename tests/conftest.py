@@ -0,0 +1,22 @@
+import pytest
+from app.services import analysis_cache
+from app.services.analysis_cache import AnalysisResultCache
+from app.services.resilience import reset_upstream_policies
+
+
+@pytest.fixture(autouse=True)
+def isolated_analysis_cache(tmp_path, monkeypatch):
+    """테스트마다 비어 있는 Perplexity 응답 캐시 사용"""
+    cache = AnalysisResultCache(str(tmp_path / "perplexity-cache"))
+    monkeypatch.setattr(analysis_cache, "_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_upstream_policies(monkeypatch):
+    """테스트마다 새 업스트림 정책 사용 (재시도 대기 없음)"""
+    for name in ("PERPLEXITY", "NAVER"):
+        monkeypatch.setenv(f"{name}_BACKOFF", "0")
+    reset_upstream_policies()
+    yield
+    reset_upstream_policies()
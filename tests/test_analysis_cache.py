@@ -0,0 +1,72 @@
+import asyncio
+import os
+import time
+
+import httpx
+from app.services.analysis_cache import AnalysisResultCache
+from app.services.perplexity_service import PerplexityService
+
+RESPONSE = {"choices": [{"message": {"content": "report"}}], "model": "sonar-pro", "usage": {"total_tokens": 120}}
+
+
+class TestAnalysisResultCache:
+    def test_key_ignores_stream_flag(self):
+        """스트리밍 여부와 무관하게 같은 프롬프트는 같은 키"""
+        payload = {"model": "sonar-pro", "messages": [{"role": "user", "content": "p"}]}
+        assert AnalysisResultCache.make_key(payload) == AnalysisResultCache.make_key({**payload, "stream": True})
+        assert AnalysisResultCache.make_key(payload) != AnalysisResultCache.make_key({**payload, "model": "sonar"})
+
+    def test_put_get_and_ttl(self, tmp_path):
+        """저장/조회 및 TTL 만료 테스트"""
+        cache = AnalysisResultCache(str(tmp_path), ttl=60)
+        cache.put("ab" * 32, RESPONSE)
+        assert cache.get("ab" * 32) == RESPONSE
+        assert cache.stats()["saved_tokens"] == 120
+
+        path = cache._path("ab" * 32)
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        assert cache.get("ab" * 32) is None
+        assert not path.exists()
+
+    def test_size_bound_evicts_oldest(self, tmp_path):
+        """용량 상한 초과 시 오래된 항목부터 삭제"""
+        cache = AnalysisResultCache(str(tmp_path), max_bytes=250)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, {"content": "x" * 80})
+            stamp = time.time() - 100 + i
+            os.utime(cache._path(key), (stamp, stamp))
+        cache.put("ff" * 32, {"content": "x" * 80})
+
+        assert cache.get(keys[0]) is None
+        assert cache.get("ff" * 32) is not None
+        assert cache.stats()["bytes"] <= 250
+
+
+class TestPerplexityServiceCache:
+    def test_second_call_served_from_cache(self, isolated_analysis_cache):
+        """같은 프롬프트 재요청은 캐시 응답 (usage.cache_hit) / opt-out 시 재호출"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json=RESPONSE)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = PerplexityService("test-key", model="sonar-pro", client=client)
+        data = [{"2024.12 - 매출액": 1}]
+
+        async def run():
+            first = await service.generate_investment_analysis("삼성전자", data, ["2024.12"])
+            second = await service.generate_investment_analysis("삼성전자", data, ["2024.12"])
+            third = await service.generate_investment_analysis("삼성전자", data, ["2024.12"], use_cache=False)
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+
+        assert len(calls) == 2
+        assert first["usage"] == {"total_tokens": 120, "cache_hit": False}
+        assert second["usage"] == {"total_tokens": 120, "cache_hit": True}
+        assert third["usage"]["cache_hit"] is False
+        assert isolated_analysis_cache.stats()["hits"] == 1
@@ -1,9 +1,25 @@
+import asyncio
+import json
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services.container import ServiceContainer, services
+from app.services.financial_table import FinancialTable
+from app.services.perplexity_service import PerplexityService
 
 client = TestClient(app)
 
+
+def _table_fetch(fetch):
+    """(경로, 기간별 dict 목록) 을 돌려주는 가짜 크롤링을 fetch_table 형식으로 감싼다"""
+    async def fetch_table(stock_code, compare_periods):
+        path, records = await fetch(stock_code, compare_periods)
+        return path, FinancialTable.from_records(records) if records else None
+    return fetch_table
+
+
 class TestAPI:
     def test_root_endpoint(self):
         """루트 엔드포인트 테스트"""
@@ -38,3 +54,158 @@ class TestAPI:
         # API 키가 없으면 500 에러가 발생할 것으로 예상
         assert response.status_code in [400, 500]
 
+    def test_analysis_stream_endpoint(self, monkeypatch):
+        """분석 스트리밍(SSE) 엔드포인트 테스트"""
+        async def fake_fetch(stock_code, compare_periods):
+            return None, [{"2024.12 - 매출액": 3008709.0}]
+
+        chunks = [
+            {"choices": [{"delta": {"content": "# 보고서"}}], "model": "sonar-pro"},
+            {"choices": [{"delta": {"content": " 본문"}}], "citations": ["https://example.com"],
+             "usage": {"total_tokens": 10}, "created": 1},
+        ]
+        body = "".join(f"data: {json.dumps(c)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body.encode(), headers={"Content-Type": "text/event-stream"})
+        ))
+        monkeypatch.setattr(services.crawler, "fetch_table", _table_fetch(fake_fetch))
+        monkeypatch.setattr(PerplexityService, "get_client", staticmethod(lambda: mock_client))
+
+        response = client.post(
+            "/api/analysis/analyze/stream",
+            json={
+                "stock_code": "005930",
+                "stock_name": "삼성전자",
+                "compare_periods": ["2024.12"],
+                "api_key": "test-key"
+            }
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [block.split("\n", 1) for block in response.text.strip().split("\n\n")]
+        names = [name.removeprefix("event: ") for name, _ in events]
+        assert names == ["financial", "token", "token", "done"]
+        done = json.loads(events[-1][1].removeprefix("data: "))
+        assert done["citations"] == ["https://example.com"]
+        assert done["usage"] == {"total_tokens": 10, "cache_hit": False}
+        # 업스트림 스트리밍 시간은 헤더 이후에 끝나므로 done 이벤트에 담긴다
+        assert {"crawl", "table", "perplexity"} <= set(done["timings"])
+
+    def test_lifespan_manages_shared_services(self, monkeypatch):
+        """lifespan 에서 공유 서비스 시작/종료 테스트"""
+        monkeypatch.setenv("SERVICE_WARMUP", "false")
+        with TestClient(app) as lifespan_client:
+            assert services.started
+            assert lifespan_client.app.state.services is services
+            assert lifespan_client.get("/api/financial/stats").status_code == 200
+        assert not services.started
+
+    def test_container_reads_settings_at_startup(self, monkeypatch, tmp_path):
+        """환경변수 설정은 생성 시점이 아니라 startup() 에서 읽는다"""
+        monkeypatch.setenv("SERVICE_WARMUP", "false")
+        container = ServiceContainer(save_dir=str(tmp_path / "temp"))
+        monkeypatch.setenv("REPORT_FILES_DIR", str(tmp_path / "reports"))
+        assert not container.configured
+
+        async def run():
+            await container.startup()
+            await container.shutdown()
+
+        asyncio.run(run())
+        assert container.report_files.directory == tmp_path / "reports"
+
+    def test_analysis_batch_endpoint(self, monkeypatch):
+        """배치 분석: 종목별 결과/오류 및 동시 실행 한도 테스트"""
+        in_flight = {"now": 0, "max": 0}
+
+        async def fake_fetch(stock_code, compare_periods):
+            if stock_code == "999999":
+                return None, None
+            return None, [{f"{compare_periods[0]} - 매출액": 1.0}]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+            return httpx.Response(200, json={"choices": [{"message": {"content": "report"}}], "model": "sonar-pro"})
+
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(services.crawler, "fetch_table", _table_fetch(fake_fetch))
+        monkeypatch.setattr(PerplexityService, "get_client", staticmethod(lambda: mock_client))
+
+        items = [
+            {"stock_code": f"00000{i}", "stock_name": f"종목{i}", "compare_periods": ["2024.12"]}
+            for i in range(6)
+        ] + [{"stock_code": "999999", "stock_name": "없음", "compare_periods": ["2024.12"]}]
+        response = client.post(
+            "/api/analysis/analyze/batch",
+            json={"items": items, "api_key": "test-key", "llm_concurrency": 3}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["succeeded"], body["failed"]) == (6, 1)
+        assert body["results"][-1]["status_code"] == 404
+        assert body["results"][0]["result"]["analysis"] == "report"
+        assert in_flight["max"] == 3
+
+    def test_analysis_job_submit_and_poll(self, monkeypatch):
+        """분석 작업 등록 후 롱 폴링으로 결과 조회"""
+        async def fake_fetch(stock_code, compare_periods):
+            return None, [{"2024.12 - 매출액": 1.0}]
+
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"choices": [{"message": {"content": "report"}}], "model": "sonar-pro"})
+        ))
+        monkeypatch.setenv("SERVICE_WARMUP", "false")
+        monkeypatch.setattr(services.crawler, "fetch_table", _table_fetch(fake_fetch))
+        monkeypatch.setattr(PerplexityService, "get_client", staticmethod(lambda: mock_client))
+
+        with TestClient(app) as lifespan_client:
+            submitted = lifespan_client.post(
+                "/api/analysis/jobs",
+                json={
+                    "stock_code": "005930",
+                    "stock_name": "삼성전자",
+                    "compare_periods": ["2024.12"],
+                    "api_key": "test-key"
+                }
+            )
+            assert submitted.status_code == 202
+            job_id = submitted.json()["job_id"]
+
+            polled = lifespan_client.get(f"/api/analysis/jobs/{job_id}", params={"wait": 5}).json()
+            assert polled["status"] == "succeeded"
+            assert polled["result"]["analysis"] == "report"
+            assert {"crawl", "llm", "table", "save"} <= set(polled["timings"])
+
+            assert lifespan_client.get("/api/analysis/jobs/unknown").status_code == 404
+
+    def test_metrics_and_server_timing(self, monkeypatch):
+        """/metrics 노출 및 단계별 Server-Timing 헤더 테스트"""
+        async def fake_fetch(stock_code, compare_periods):
+            return None, [{"2024.12 - 매출액": 1.0}]
+
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"choices": [{"message": {"content": "report"}}], "model": "sonar-pro"})
+        ))
+        monkeypatch.setattr(services.crawler, "fetch_table", _table_fetch(fake_fetch))
+        monkeypatch.setattr(PerplexityService, "get_client", staticmethod(lambda: mock_client))
+
+        response = client.post(
+            "/api/analysis/analyze",
+            json={"stock_code": "005930", "stock_name": "삼성전자", "compare_periods": ["2024.12"],
+                  "api_key": "test-key", "use_cache": False}
+        )
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        for name in ("crawl", "llm", "perplexity", "table", "save", "total"):
+            assert f"{name};dur=" in timing
+
+        metrics = client.get("/metrics")
+        assert metrics.status_code == 200
+        text = metrics.text
+        assert 'investor_http_requests_total{method="POST",route="/api/analysis/analyze",status="200"}' in text
+        assert 'investor_upstream_requests_total{status="200",upstream="perplexity"}' in text
+        assert 'investor_stage_duration_seconds_count{stage="llm"}' in text
+        assert "investor_naver_crawler_cache_hit_ratio" in text
@@ -0,0 +1,37 @@
+import asyncio
+import os
+
+from app.services.container import services
+from benchmarks.bench_load import LevelResult, compare, percentile, run_suite
+
+
+class TestBenchLoad:
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 50) == 0.0
+
+    def test_compare_flags_regressions(self):
+        baseline = [{"scenario": "crawl", "concurrency": 8, "errors": 0, "rps": 100.0, "p95_ms": 10.0}]
+        ok = LevelResult("crawl", 8, 10, 0, 0.1, 95.0, 5.0, 11.0, 12.0)
+        slow = LevelResult("crawl", 8, 10, 1, 0.2, 50.0, 5.0, 20.0, 25.0)
+        assert compare([ok], baseline, 0.25) == []
+        assert len(compare([slow], baseline, 0.25)) == 3
+
+    def test_suite_runs_offline(self):
+        """스텁 업스트림만으로 세 엔드포인트가 오류 없이 측정되는지 (네트워크 불필요)"""
+        save_dir = services.crawler.save_dir
+
+        def listing():
+            return {entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns) for entry in os.scandir(save_dir)}
+
+        before = listing()
+        results = asyncio.run(run_suite(
+            levels=(2,), requests=4, naver_latency=0.0, llm_latency=0.0, supabase_latency=0.0,
+        ))
+        assert [(r.scenario, r.errors) for r in results] == [("crawl", 0), ("analyze", 0), ("save_markdown", 0)]
+        assert all(r.rps > 0 and r.p50_ms <= r.p99_ms for r in results)
+        # 스냅샷은 임시 디렉토리에 저장되어 저장소의 temp/ 는 그대로
+        assert listing() == before
@@ -0,0 +1,61 @@
+"""_convert_to_json_by_period 골든 테스트
+
+tests/golden/convert_to_json_by_period.json 은 셀 단위 구현으로 생성한 기준 출력이다.
+temp/ 의 재무 CSV 스냅샷과 경계값 프레임에 대해 JSON 직렬화 결과가 바이트 단위로 같아야 한다.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.naver_crawler import NaverFinancialCrawler
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+GOLDEN = json.loads((Path(__file__).parent / "golden" / "convert_to_json_by_period.json").read_text(encoding="utf-8"))
+
+PERIOD_CASES = {
+    "half_year": ["2024.06", "2025.06"],
+    "annual": ["2022.12", "2023.12", "2024.12", "2025.12(E)"],
+    "partial": ["1999.12", "2024.12"],
+    "fallback": ["1999.12"],
+    "header_label": ["주요재무정보"],
+}
+
+EDGE_CASES = {
+    "edge_match": ["2024.12", "2025.06"],
+    "edge_fallback": ["X", "Y"],
+    "edge_one": ["2025.06"],
+}
+
+
+def edge_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "항목": ["기간", "IFRS연결", "매출액", "영업이익률", "EPS(원)", None, "빈값", "공백", "지수", "밑줄", "무한", "숫자형", "중복", "중복", "실수형"],
+        "A": ["2024.12", "IFRS연결", "1,234,567", "12.50%", "3,000원", "5", "", "  ", "1e3", "1_000", "inf", 42, "1", "2", 7.0],
+        "B": ["2025.06", "IFRS연결", "12억", "-0.00", "nan", np.nan, "-", "1.", ".5", "1.5e3", "-12.0", 3.25, "x", np.nan, np.nan],
+    })
+
+
+def _dump(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+CSV_CASES = [
+    (path, name)
+    for path in sorted((PROJECT_ROOT / "temp").glob("*_financials.csv"))
+    for name in PERIOD_CASES
+]
+
+
+@pytest.mark.parametrize("path, case", CSV_CASES, ids=[f"{p.stem}:{c}" for p, c in CSV_CASES])
+def test_csv_snapshots_match_golden(path, case):
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+    result = NaverFinancialCrawler()._convert_to_json_by_period(df, PERIOD_CASES[case])
+    assert _dump(result) == _dump(GOLDEN[f"{path.name}:{case}"])
+
+
+@pytest.mark.parametrize("case", list(EDGE_CASES))
+def test_edge_values_match_golden(case):
+    result = NaverFinancialCrawler()._convert_to_json_by_period(edge_frame(), EDGE_CASES[case])
+    assert _dump(result) == _dump(GOLDEN[case])
@@ -0,0 +1,75 @@
+import pandas as pd
+from app.services.financial_cache import FinancialDataCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frame(rows: int = 3) -> pd.DataFrame:
+    return pd.DataFrame({"항목": [f"지표{i}" for i in range(rows)], "2024.12": ["1"] * rows})
+
+
+class TestFinancialDataCache:
+    def test_hit_miss_and_ttl(self):
+        """TTL 만료 및 hit/miss 카운터 테스트"""
+        clock = FakeClock()
+        cache = FinancialDataCache(ttl=10, clock=clock)
+        df = _frame()
+
+        assert cache.get("005930") is None
+        cache.put("005930", df)
+        assert cache.get("005930") is df
+
+        clock.now = 11
+        assert cache.get("005930") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+        assert stats["entries"] == 0 and stats["bytes"] == 0
+
+    def test_lru_eviction_by_entries(self):
+        """항목 수 상한 초과 시 가장 오래 사용하지 않은 항목 제거"""
+        cache = FinancialDataCache(max_entries=2)
+        cache.put("A", _frame())
+        cache.put("B", _frame())
+        cache.get("A")
+        cache.put("C", _frame())
+
+        assert "A" in cache and "C" in cache and "B" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_memory_bound(self):
+        """메모리 상한 초과 시 제거"""
+        size = int(_frame().memory_usage(index=True, deep=True).sum())
+        cache = FinancialDataCache(max_bytes=size * 2)
+        for key in ("A", "B", "C"):
+            cache.put(key, _frame())
+
+        assert len(cache) == 2
+        assert cache.stats()["bytes"] <= size * 2
+
+    def test_disabled(self):
+        """ttl=0 이면 저장하지 않음"""
+        cache = FinancialDataCache(ttl=0)
+        cache.put("A", _frame())
+        assert cache.get("A") is None
+
+    def test_items_and_version(self):
+        """items() 는 만료 항목을 빼고 통계를 바꾸지 않으며, version 은 추가/삭제마다 증가"""
+        clock = FakeClock()
+        cache = FinancialDataCache(ttl=10, clock=clock)
+        cache.put("A", _frame())
+        clock.now = 5
+        cache.put("B", _frame())
+        version = cache.version
+
+        clock.now = 12
+        assert [key for key, _ in cache.items()] == ["B"]
+        assert cache.stats()["hits"] == 0 and cache.version == version
+
+        cache.invalidate("B")
+        assert cache.version > version
@@ -0,0 +1,230 @@
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.container import services
+from app.services.financial_history import FinancialHistory, FinancialHistoryStore, growth_rate, period_ordinal
+from app.services.naver_crawler import NaverFinancialCrawler
+from app.services.table_extractor import extract_statement_table
+from benchmarks.stubs import render_statement_company_page, render_statement_page
+
+# 페이지에 보이는 기간 창 (연간 5개, 마지막은 추정치)
+WINDOW_2024 = ["2020.12", "2021.12", "2022.12", "2023.12", "2024.12(E)"]
+WINDOW_2025 = ["2021.12", "2022.12", "2023.12", "2024.12", "2025.12(E)"]
+VALUES = {
+    "2020.12": ("2368070", "359939"),
+    "2021.12": ("2796048", "516339"),
+    "2022.12": ("3022314", "433766"),
+    "2023.12": ("2589355", "65670"),
+    "2024.12(E)": ("2900000", "300000"),
+    "2024.12": ("3008709", "327260"),
+    "2025.12(E)": ("3189918", "311789"),
+    # 분기
+    "2019.06": ("100", "10"),
+    "2019.09": ("110", "11"),
+    "2019.12": ("120", "12"),
+    "2020.03": ("130", "13"),
+    "2020.06": ("150", "15"),
+}
+
+
+def _page(window):
+    return render_statement_page(window, {
+        "매출액": [VALUES[p][0] for p in window],
+        "영업이익": [VALUES[p][1] for p in window],
+        "부채비율": ["-"] * len(window),
+    })
+
+
+class _Upstream:
+    """기업현황 / 재무제표 표 요청을 흉내 내는 MockTransport (표 요청 수를 센다)"""
+
+    def __init__(self, window, freq="Y"):
+        self.window = window
+        self.freq = freq
+        self.statement_calls = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/c1010001.aspx"):
+            return httpx.Response(200, text=render_statement_company_page("token-1"))
+        assert request.url.params["encparam"] == "token-1"
+        assert request.url.params["freq_typ"] == self.freq
+        self.statement_calls += 1
+        return httpx.Response(200, text=_page(self.window))
+
+
+def _history(tmp_path, upstream, clock=lambda: 1_000_000.0, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    crawler = NaverFinancialCrawler(save_dir=str(tmp_path), client=client, statement_base_url="http://wise.test")
+    store = FinancialHistoryStore(str(tmp_path))
+    return FinancialHistory(lambda: crawler, store, clock=clock, **kwargs)
+
+
+class TestStatementParsing:
+    def test_extract_statement_table(self):
+        frame = extract_statement_table(_page(WINDOW_2024))
+        assert list(frame.columns) == WINDOW_2024
+        assert frame.loc["매출액", "2020.12"] == 2368070.0
+        assert frame.loc["부채비율"].isna().all()
+
+    def test_period_ordinal(self):
+        assert period_ordinal("2024.12") == period_ordinal("2024.12(E)") == period_ordinal("2024/12") == 2024 * 12 + 12
+        assert period_ordinal("주요재무정보") is None
+
+    def test_growth_rate_uses_calendar_predecessor(self):
+        wide = pd.DataFrame([[100.0, 150.0, -50.0]], columns=[2020 * 12 + 12, 2021 * 12 + 12, 2023 * 12 + 12])
+        growth = growth_rate(wide, 12)
+        assert math.isnan(growth.iloc[0, 0])
+        assert growth.iloc[0, 1] == 50.0
+        # 2022.12 가 없으므로 2023.12 는 증감률 없음
+        assert math.isnan(growth.iloc[0, 2])
+
+
+class TestFinancialHistory:
+    def test_first_request_fetches_and_stores(self, tmp_path):
+        upstream = _Upstream(WINDOW_2024)
+        history = _history(tmp_path, upstream)
+
+        series = asyncio.run(history.series("005930", "Y", ["2021.12", "2023.12"]))
+
+        assert upstream.statement_calls == 1 and series.refreshed
+        assert series.periods == ["2021.12", "2023.12"]
+        assert series.metrics == ["매출액", "영업이익"]
+        assert series.values.loc["매출액"].tolist() == [2796048.0, 2589355.0]
+        # 2021.12 는 2020.12 대비, 2023.12 는 2022.12 대비
+        assert series.growth.loc["매출액", "2021.12"] == pytest.approx(18.07, abs=0.01)
+        assert series.growth.loc["영업이익", "2023.12"] == pytest.approx(-84.86, abs=0.01)
+        assert history.store.path("005930", "Y").exists()
+
+    def test_known_periods_are_not_refetched(self, tmp_path):
+        upstream = _Upstream(WINDOW_2024)
+        history = _history(tmp_path, upstream)
+
+        async def run():
+            await history.series("005930", "Y", ["2022.12"])
+            return await history.series("005930", "Y", ["2020.12", "2021.12", "2022.12"])
+
+        series = asyncio.run(run())
+        assert upstream.statement_calls == 1
+        assert not series.refreshed
+        assert series.periods == ["2020.12", "2021.12", "2022.12"]
+
+    def test_new_periods_merge_incrementally(self, tmp_path):
+        """새 기간 요청은 min_refetch 이후 다시 받고, 페이지에서 빠진 과거 기간은 유지"""
+        now = {"t": 1_000_000.0}
+        upstream = _Upstream(WINDOW_2024)
+        history = _history(tmp_path, upstream, clock=lambda: now["t"], min_refetch=3600)
+
+        async def run():
+            await history.series("005930", "Y")
+            upstream.window = WINDOW_2025
+            # min_refetch 이전에는 저장된 추정치로 응답
+            early = await history.series("005930", "Y", ["2024.12"])
+            now["t"] += 7200
+            late = await history.series("005930", "Y", start="2020.12", end="2025.12")
+            return early, late
+
+        early, late = asyncio.run(run())
+        assert upstream.statement_calls == 2
+        assert early.periods == ["2024.12(E)"] and not early.refreshed
+        assert late.refreshed
+        assert late.periods == ["2020.12", "2021.12", "2022.12", "2023.12", "2024.12", "2025.12(E)"]
+        # 추정치는 확정치로 교체
+        assert late.values.loc["매출액", "2024.12"] == 3008709.0
+        assert late.values.loc["매출액", "2020.12"] == 2368070.0
+
+    def test_missing_periods_and_store_reload(self, tmp_path):
+        upstream = _Upstream(WINDOW_2024)
+        asyncio.run(_history(tmp_path, upstream).series("005930", "Y"))
+
+        # 새 인스턴스는 디스크에서 읽고, 저장된 범위보다 오래된 기간은 다시 받지 않는다
+        reloaded = _history(tmp_path, upstream)
+        series = asyncio.run(reloaded.series("005930", "Y", ["2015.12", "2022.12"]))
+        assert upstream.statement_calls == 1
+        assert series.periods == ["2022.12"]
+        assert series.missing_periods == ["2015.12"]
+
+    def test_duplicate_rows_use_first_value(self, tmp_path):
+        """저장된 시계열에 같은 기간/지표가 중복돼도 오류 없이 앞쪽 값을 사용"""
+        upstream = _Upstream(WINDOW_2024)
+        history = _history(tmp_path, upstream)
+        asyncio.run(history.series("005930", "Y"))
+        stored = history.store.load("005930", "Y")
+        duplicate = stored[stored["period"] == "2022.12"].assign(value=1.0)
+        history.store.save("005930", "Y", pd.concat([stored, duplicate], ignore_index=True))
+
+        series = asyncio.run(_history(tmp_path, upstream).series("005930", "Y", ["2022.12"]))
+        assert upstream.statement_calls == 1
+        assert series.values.loc["매출액", "2022.12"] == 3022314.0
+
+    def test_store_lru_is_thread_safe(self, tmp_path):
+        """여러 스레드가 작은 LRU 로 동시에 읽고 써도 오류 없음"""
+        store = FinancialHistoryStore(str(tmp_path), max_entries=2)
+        frame = pd.DataFrame({"period": ["2024.12"], "metric": ["매출액"], "value": [1.0], "fetched_at": [0.0]})
+
+        def work(i):
+            code = f"{i % 8:06d}"
+            store.save(code, "Y", frame)
+            return len(store.load(code, "Y"))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert set(pool.map(work, range(400))) == {1}
+        assert store.stats()["entries"] <= 2
+
+    def test_stale_store_served_when_refresh_fails(self, tmp_path):
+        now = {"t": 1_000_000.0}
+        upstream = _Upstream(WINDOW_2024)
+        history = _history(tmp_path, upstream, clock=lambda: now["t"], max_age=60)
+        asyncio.run(history.series("005930", "Y"))
+
+        def broken(request):
+            return httpx.Response(500)
+
+        history._crawler()._client = httpx.AsyncClient(transport=httpx.MockTransport(broken))
+        now["t"] += 120
+        series = asyncio.run(history.series("005930", "Y"))
+        assert not series.refreshed
+        assert len(series.periods) == 5
+        assert history.stats()["fetch_errors"] == 1
+
+    def test_quarterly_yoy_growth(self, tmp_path):
+        quarters = ["2019.06", "2019.09", "2019.12", "2020.03", "2020.06"]
+        upstream = _Upstream(quarters, freq="Q")
+        series = asyncio.run(_history(tmp_path, upstream).series("005930", "q", ["2020.06"]))
+        assert series.freq == "Q"
+        assert series.growth.loc["매출액", "2020.06"] == pytest.approx(15.38, abs=0.01)
+        assert series.yoy_growth.loc["매출액", "2020.06"] == 50.0
+
+    def test_unknown_freq(self, tmp_path):
+        with pytest.raises(ValueError):
+            asyncio.run(_history(tmp_path, _Upstream(WINDOW_2024)).series("005930", "M"))
+
+
+class TestHistoryEndpoint:
+    def test_history_endpoint(self, tmp_path, monkeypatch):
+        history = _history(tmp_path, _Upstream(WINDOW_2024))
+        monkeypatch.setattr(services, "history", history)
+
+        response = TestClient(app).get("/api/financial/history/005930", params={"periods": "2021.12,2022.12"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["periods"] == ["2021.12", "2022.12"]
+        assert body["metrics"] == ["매출액", "영업이익"]
+        assert body["values"][0] == [2796048.0, 3022314.0]
+        assert body["growth"][0][1] == pytest.approx(8.09, abs=0.01)
+        assert body["yoy_growth"] is None
+        assert body["refreshed"] is True
+
+    def test_history_endpoint_no_data(self, tmp_path, monkeypatch):
+        history = _history(tmp_path, _Upstream(WINDOW_2024))
+        monkeypatch.setattr(services, "history", history)
+
+        response = TestClient(app).get("/api/financial/history/005930", params={"periods": "1999.12"})
+        assert response.status_code == 404
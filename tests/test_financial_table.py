@@ -0,0 +1,116 @@
+from io import StringIO
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.financial import ColumnarFinancialResponse
+from app.services.container import services
+from app.services.financial_table import FinancialTable
+from app.services.naver_crawler import NaverFinancialCrawler
+from benchmarks.stubs import FIXTURE_DIR
+
+PERIODS = ["2024.12", "2025.06"]
+
+
+def _table(periods=PERIODS) -> FinancialTable:
+    df = pd.read_csv(FIXTURE_DIR / "005930_financials.csv", encoding="utf-8-sig", dtype=str)
+    return FinancialTable.from_frame(df, periods)
+
+
+class TestFinancialTable:
+    def test_from_frame_matches_records(self):
+        """표 -> 기존 응답 형식 변환이 크롤러 변환 결과와 같음"""
+        df = pd.read_csv(FIXTURE_DIR / "005930_financials.csv", encoding="utf-8-sig", dtype=str)
+        table = FinancialTable.from_frame(df, PERIODS)
+        assert table.periods == PERIODS
+        assert table.metrics[:2] == ["매출액", "영업이익"]
+        assert table.values[0] == [3008709, 745663]
+        assert table.to_records() == NaverFinancialCrawler()._convert_to_json_by_period(df, PERIODS)
+
+    def test_from_records_roundtrip(self):
+        table = _table()
+        rebuilt = FinancialTable.from_records(table.to_records())
+        assert rebuilt == table
+
+    def test_markdown(self):
+        lines = _table().to_markdown().split("\n")
+        assert lines[0] == "| 지표 | 2024.12 | 2025.06 |"
+        assert lines[1] == "|:---|---:|---:|"
+        assert lines[2] == "| 매출액 | 3008709 | 745663 |"
+        assert len(lines) == 2 + len(_table().metrics)
+
+    def test_markdown_escapes_and_blanks(self):
+        table = FinancialTable(["2024.12"], ["A|B", "없음", "실수"], [["x|y"], [None], [12.5]])
+        assert table.to_markdown().split("\n")[2:] == ["| A\\|B | x\\|y |", "| 없음 |  |", "| 실수 | 12.5 |"]
+
+    def test_html_escapes(self):
+        html = FinancialTable(["2024.12"], ["<b>"], [["a&b"]]).to_html()
+        assert html.startswith("<table><thead>")
+        assert "<th scope=\"row\">&lt;b&gt;</th><td>a&amp;b</td>" in html
+
+    def test_csv_roundtrip(self):
+        table = _table()
+        frame = pd.read_csv(StringIO(table.to_csv()), dtype=str, keep_default_na=False)
+        assert list(frame.columns) == ["지표", *PERIODS]
+        assert frame["지표"].tolist() == table.metrics
+        assert frame.iloc[0].tolist() == ["매출액", "3008709", "745663"]
+
+    def test_empty_table(self):
+        table = FinancialTable()
+        assert not table
+        assert table.to_markdown() == table.to_html() == table.to_csv() == ""
+        assert table.to_records() == []
+
+    def test_numeric_values(self):
+        table = FinancialTable(["2024.12", "2025.06"], ["A", "B"], [[1, "-"], [None, 2.5]])
+        assert table.numeric_values() == [[1, None], [None, 2.5]]
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            _table().render("xlsx")
+
+
+class TestCrawlFormats:
+    @pytest.mark.parametrize("fmt, media_type, head", [
+        ("markdown", "text/markdown", "| 지표 |"),
+        ("html", "text/html", "<table>"),
+        ("csv", "text/csv", "지표,2024.12,2025.06"),
+    ])
+    def test_crawl_renders_table(self, monkeypatch, fmt, media_type, head):
+        async def fake_fetch(stock_code, compare_periods):
+            return None, _table(compare_periods)
+
+        monkeypatch.setattr(services.crawler, "fetch_table", fake_fetch)
+        response = TestClient(app).post(
+            f"/api/financial/crawl?format={fmt}",
+            json={"stock_code": "005930", "compare_periods": PERIODS},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(media_type)
+        assert response.text.startswith(head)
+
+    def test_crawl_rejects_unknown_format(self):
+        response = TestClient(app).post(
+            "/api/financial/crawl?format=xlsx",
+            json={"stock_code": "005930", "compare_periods": PERIODS},
+        )
+        assert response.status_code == 422
+
+    def test_crawl_columnar(self, monkeypatch):
+        """columnar: 기간/지표는 한 번씩, 값은 지표 x 기간 숫자 행렬"""
+        async def fake_fetch(stock_code, compare_periods):
+            return None, FinancialTable(compare_periods, ["매출액", "비고"], [[3008709, 12.5], ["-", None]])
+
+        monkeypatch.setattr(services.crawler, "fetch_table", fake_fetch)
+        response = TestClient(app).post(
+            "/api/financial/crawl?format=columnar",
+            json={"stock_code": "005930", "compare_periods": PERIODS},
+        )
+        assert response.status_code == 200
+        body = ColumnarFinancialResponse.model_validate_json(response.content)
+        assert body.periods == PERIODS
+        assert body.metrics == ["매출액", "비고"]
+        assert body.values == [[3008709, 12.5], [None, None]]
+        assert b'"values":[[3008709.0,12.5],[null,null]]' in response.content
@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import threading
+
+from app.services import http_client
+from app.services.http_client import close_client, get_client
+
+
+class TestGetClient:
+    def test_same_loop_reuses_client(self):
+        async def run():
+            first = get_client("test-reuse")
+            second = get_client("test-reuse")
+            await close_client("test-reuse")
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second and first.is_closed
+
+    def test_other_loop_discards_old_client_with_warning(self, caplog):
+        old = asyncio.run(self._get("test-discard"))
+        with caplog.at_level(logging.WARNING, logger=http_client.__name__):
+            new = asyncio.run(self._get("test-discard"))
+        assert new is not old
+        assert any(record.client == "test-discard" for record in caplog.records)
+        asyncio.run(close_client("test-discard"))
+
+    def test_other_loop_closes_old_client_on_its_loop(self):
+        """이전 루프가 아직 실행 중이면 그 루프에서 닫는다"""
+        owner = asyncio.new_event_loop()
+        thread = threading.Thread(target=owner.run_forever, daemon=True)
+        thread.start()
+        try:
+            old = asyncio.run_coroutine_threadsafe(self._get("test-close"), owner).result(5)
+            new = asyncio.run(self._get("test-close"))
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), owner).result(5)
+            assert new is not old and old.is_closed
+        finally:
+            asyncio.run(close_client("test-close"))
+            owner.call_soon_threadsafe(owner.stop)
+            thread.join(5)
+            owner.close()
+
+    @staticmethod
+    async def _get(name):
+        return get_client(name)
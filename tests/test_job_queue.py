@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from app.services.job_queue import CANCELLED, FAILED, SUCCEEDED, JobQueue, QueueFullError
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestJobQueue:
+    def test_success_records_timings(self):
+        """성공 작업의 결과와 시간 기록 테스트"""
+        async def scenario():
+            queue = JobQueue(workers=1)
+
+            async def work(timings):
+                timings["crawl"] = 0.01
+                return "ok"
+
+            job = await queue.submit(work)
+            await queue.wait(job.id, 1)
+            await queue.stop()
+            return job
+
+        job = run(scenario())
+        assert job.status == SUCCEEDED and job.result == "ok"
+        assert {"queue_wait", "crawl", "run", "total"} <= set(job.timings)
+        assert job.func is None
+
+    def test_http_exception_maps_status(self):
+        """HTTPException 은 상태 코드와 메시지를 보존"""
+        async def scenario():
+            queue = JobQueue(workers=1)
+
+            async def work(timings):
+                raise HTTPException(status_code=404, detail="재무 데이터를 찾을 수 없습니다.")
+
+            job = await queue.submit(work)
+            await queue.wait(job.id, 1)
+            await queue.stop()
+            return job
+
+        job = run(scenario())
+        assert (job.status, job.status_code) == (FAILED, 404)
+        assert "재무 데이터" in job.error
+
+    def test_cancel_queued_and_running(self):
+        """대기 중 / 실행 중 작업 취소 테스트"""
+        async def scenario():
+            queue = JobQueue(workers=1)
+            started = asyncio.Event()
+
+            async def slow(timings):
+                started.set()
+                await asyncio.sleep(10)
+
+            running = await queue.submit(slow)
+            queued = await queue.submit(slow)
+            await started.wait()
+            queue.cancel(queued.id)
+            queue.cancel(running.id)
+            await queue.wait(running.id, 1)
+            await queue.stop()
+            return running, queued
+
+        running, queued = run(scenario())
+        assert running.status == CANCELLED and queued.status == CANCELLED
+        assert queued.started_at is None
+
+    def test_bounded_queue_and_timeout(self):
+        """대기열 상한 및 작업 시간 초과 테스트"""
+        async def scenario():
+            queue = JobQueue(workers=1, max_queue=1, job_timeout=0.05)
+
+            async def slow(timings):
+                await asyncio.sleep(10)
+
+            first = await queue.submit(slow)
+            await asyncio.sleep(0)  # 워커가 첫 작업을 가져가도록
+            await queue.submit(slow)
+            with pytest.raises(QueueFullError):
+                await queue.submit(slow)
+            await queue.wait(first.id, 1)
+            await queue.stop()
+            return first
+
+        first = run(scenario())
+        assert (first.status, first.status_code) == (FAILED, 504)
+
+    def test_stop_cancels_running_task(self):
+        """종료 시 실행 중인 작업은 상태만이 아니라 태스크 자체가 취소된다"""
+        async def scenario():
+            queue = JobQueue(workers=1)
+            started = asyncio.Event()
+            cancelled = asyncio.Event()
+
+            async def slow(timings):
+                started.set()
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            job = await queue.submit(slow)
+            await started.wait()
+            task = job.task
+            await queue.stop()
+            return job, task, cancelled.is_set()
+
+        job, task, cancelled = run(scenario())
+        assert job.status == CANCELLED
+        assert task.done() and task.cancelled() and cancelled
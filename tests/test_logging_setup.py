@@ -0,0 +1,70 @@
+import hashlib
+import json
+import logging
+
+from app import logging_setup
+from app.logging_setup import JsonFormatter, KeyValueFormatter, log_payload
+
+
+class _Collect(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _logger(level: int):
+    logger = logging.getLogger(f"test.logging_setup.{level}")
+    logger.setLevel(level)
+    logger.propagate = False
+    handler = _Collect()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+class TestLogPayload:
+    def test_body_omitted_at_info(self, monkeypatch):
+        """INFO 레벨, 샘플링 0 이면 길이/해시만 기록"""
+        monkeypatch.setattr(logging_setup, "PAYLOAD_SAMPLE_RATE", 0.0)
+        logger, handler = _logger(logging.INFO)
+        log_payload(logger, logging.INFO, "prompt", "prompt", "본문", model="sonar-pro")
+        record = handler.records[0]
+        assert record.prompt_length == 2
+        assert record.prompt_sha256 == hashlib.sha256("본문".encode("utf-8")).hexdigest()
+        assert record.model == "sonar-pro"
+        assert not hasattr(record, "body")
+
+    def test_body_logged_at_debug(self, monkeypatch):
+        monkeypatch.setattr(logging_setup, "PAYLOAD_SAMPLE_RATE", 0.0)
+        logger, handler = _logger(logging.DEBUG)
+        log_payload(logger, logging.INFO, "prompt", "prompt", "본문")
+        assert handler.records[0].body == "본문"
+
+    def test_body_logged_when_sampled(self, monkeypatch):
+        monkeypatch.setattr(logging_setup, "PAYLOAD_SAMPLE_RATE", 1.0)
+        logger, handler = _logger(logging.INFO)
+        log_payload(logger, logging.INFO, "response", "response", "{}")
+        assert handler.records[0].body == "{}"
+
+    def test_disabled_level_skips_hashing(self):
+        logger, handler = _logger(logging.WARNING)
+        log_payload(logger, logging.INFO, "prompt", "prompt", "본문")
+        assert handler.records == []
+
+
+class TestFormatters:
+    def _record(self) -> logging.LogRecord:
+        logger, handler = _logger(logging.INFO)
+        logger.warning("요청한 기간을 찾을 수 없습니다.", extra={"period": "2024.12"})
+        return handler.records[0]
+
+    def test_json_formatter(self):
+        entry = json.loads(JsonFormatter().format(self._record()))
+        assert entry["level"] == "WARNING"
+        assert entry["message"] == "요청한 기간을 찾을 수 없습니다."
+        assert entry["period"] == "2024.12"
+
+    def test_key_value_formatter(self):
+        assert KeyValueFormatter().format(self._record()).endswith("요청한 기간을 찾을 수 없습니다. period=2024.12")
@@ -0,0 +1,70 @@
+import asyncio
+
+from app.services.metrics import MetricsRegistry, bind_timings, server_timing_header, stage
+
+
+class TestMetricsRegistry:
+    def test_counter_and_gauge_render(self):
+        registry = MetricsRegistry(prefix="t")
+        counter = registry.counter("requests_total", "요청 수")
+        counter.inc(status=200)
+        counter.inc(2, status=200)
+        gauge = registry.gauge("in_flight", "동시 처리 수")
+        with gauge.track_inprogress(upstream="naver"):
+            assert gauge.value(upstream="naver") == 1
+        text = registry.render()
+        assert "# TYPE t_requests_total counter" in text
+        assert 't_requests_total{status="200"} 3' in text
+        assert 't_in_flight{upstream="naver"} 0' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry(prefix="t")
+        histogram = registry.histogram("latency_seconds", "지연", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, stage="llm")
+        text = registry.render()
+        assert 't_latency_seconds_bucket{stage="llm",le="0.1"} 1' in text
+        assert 't_latency_seconds_bucket{stage="llm",le="1.0"} 2' in text
+        assert 't_latency_seconds_bucket{stage="llm",le="+Inf"} 3' in text
+        assert 't_latency_seconds_count{stage="llm"} 3' in text
+        assert histogram.count(stage="llm") == 3
+
+    def test_register_stats_flattens_numbers(self):
+        registry = MetricsRegistry(prefix="t")
+        registry.register_stats("cache", lambda: {"hits": 3, "hit_ratio": 0.75, "ttl": None, "jobs": {"queued": 1}})
+        text = registry.render()
+        assert "t_cache_hits 3" in text
+        assert "t_cache_hit_ratio 0.75" in text
+        assert "t_cache_jobs_queued 1" in text
+        assert "t_cache_ttl" not in text
+
+
+class TestStageTimings:
+    def test_stage_records_into_bound_timings(self):
+        timings = {}
+        with bind_timings(timings):
+            with stage("crawl"):
+                pass
+            with stage("crawl"):
+                pass
+        with stage("outside"):
+            pass
+        assert set(timings) == {"crawl"}
+
+    def test_stage_inside_thread_and_task(self):
+        """to_thread / 태스크로 실행된 단계도 요청의 timings 에 모임"""
+        def parse():
+            with stage("parse"):
+                return 1
+
+        async def scenario():
+            timings = {}
+            with bind_timings(timings):
+                await asyncio.to_thread(parse)
+                await asyncio.create_task(asyncio.to_thread(parse))
+            return timings
+
+        assert list(asyncio.run(scenario())) == ["parse"]
+
+    def test_server_timing_header(self):
+        assert server_timing_header({"crawl": 0.0123}, total=0.5) == "crawl;dur=12.3, total;dur=500.0"
@@ -1,6 +1,10 @@
+import asyncio
+
+import httpx
 import pytest
 import pandas as pd
 from app.services.naver_crawler import NaverFinancialCrawler
+from benchmarks.stubs import FIXTURE_DIR, render_naver_item_page
 
 class TestNaverFinancialCrawler:
     def test_init(self):
@@ -26,3 +30,72 @@ class TestNaverFinancialCrawler:
         assert '2024.06 - 매출액' in result[0]
         assert '2025.06 - 매출액' in result[1]
 
+
+    def test_fetch_financials_with_injected_client(self, tmp_path):
+        """주입한 AsyncClient 로 비동기 크롤링 테스트"""
+        page = render_naver_item_page(FIXTURE_DIR / "005930_financials.csv")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.params["code"] == "005930"
+            return httpx.Response(200, text=page)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        crawler = NaverFinancialCrawler(save_dir=str(tmp_path), base_url="http://naver.test", client=client)
+
+        csv_path, result = asyncio.run(crawler.fetch_financials("005930", ["2024.12", "2025.06"]))
+
+        assert csv_path.endswith("005930_financials.csv")
+        assert result[0]["2024.12 - 매출액"] == 3008709
+        assert result[1]["2025.06 - 영업이익"] == 46761
+
+    def test_cached_frame_serves_other_periods(self, tmp_path):
+        """같은 종목의 다른 기간 요청은 캐시된 프레임에서 응답"""
+        page = render_naver_item_page(FIXTURE_DIR / "005930_financials.csv")
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url)
+            return httpx.Response(200, text=page)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        crawler = NaverFinancialCrawler(save_dir=str(tmp_path), client=client)
+
+        async def run():
+            first = await crawler.fetch_financials("005930", ["2024.12"])
+            second = await crawler.fetch_financials("005930", ["2023.12", "2025.06"])
+            return first, second
+
+        (_, first), (_, second) = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert "2024.12 - 매출액" in first[0]
+        assert "2023.12 - 매출액" in second[0]
+        assert crawler.cache.stats()["hits"] == 1
+
+    def test_concurrent_fetches_are_coalesced(self, tmp_path):
+        """같은 종목 동시 요청은 한 번의 네트워크 요청을 공유"""
+        page = render_naver_item_page(FIXTURE_DIR / "005930_financials.csv")
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text=page)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        crawler = NaverFinancialCrawler(save_dir=str(tmp_path), client=client)
+
+        async def run():
+            return await asyncio.gather(
+                crawler.fetch_financials("005930", ["2024.12"]),
+                crawler.fetch_financials("005930", ["2025.06"]),
+                crawler.fetch_financials("005930", ["2023.12", "2024.12"]),
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert "2024.12 - 매출액" in results[0][1][0]
+        assert "2025.06 - 매출액" in results[1][1][0]
+        assert len(results[2][1]) == 2
+        assert crawler.stats()["singleflight"]["coalesced"] == 2
@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+import pytest
+from app.services.perplexity_service import PerplexityService
+
+
+def _service(handler) -> PerplexityService:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return PerplexityService("test-key", model="sonar-pro", client=client)
+
+
+def _generate(service: PerplexityService):
+    return asyncio.run(service.generate_investment_analysis("삼성전자", [{"2024.12 - 매출액": 1}], ["2024.12"]))
+
+
+class TestPerplexityService:
+    def test_generate_success(self):
+        """정상 응답 및 요청 헤더 테스트"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["Authorization"] == "Bearer test-key"
+            return httpx.Response(200, json={"choices": [{"message": {"content": "report"}}], "model": "sonar-pro"})
+
+        data = _generate(_service(handler))
+        assert data["choices"][0]["message"]["content"] == "report"
+
+    @pytest.mark.parametrize(
+        "status, exc",
+        [(400, ValueError), (401, PermissionError), (429, RuntimeError), (503, RuntimeError)],
+    )
+    def test_status_code_mapping(self, status, exc):
+        """HTTP 상태 코드별 예외 매핑 테스트"""
+        service = _service(lambda request: httpx.Response(status, json={"error": {"message": "bad"}}))
+        with pytest.raises(exc):
+            _generate(service)
+
+    def test_network_error(self):
+        """네트워크 오류는 RuntimeError 로 변환"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("boom", request=request)
+
+        with pytest.raises(RuntimeError, match="네트워크 오류"):
+            _generate(_service(handler))
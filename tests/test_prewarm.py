@@ -0,0 +1,124 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.container import services
+from app.services.naver_crawler import NaverFinancialCrawler
+from app.services.prewarm import PrewarmScheduler, parse_tickers
+from app.services.snapshot_store import SnapshotStore
+from benchmarks.stubs import load_naver_pages
+
+
+def _crawler(tmp_path, calls=None, fail=()):
+    pages = load_naver_pages()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        code = request.url.params["code"]
+        if calls is not None:
+            calls.append(code)
+        if code in fail or code not in pages:
+            return httpx.Response(404)
+        return httpx.Response(200, text=pages[code])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return NaverFinancialCrawler(save_dir=str(tmp_path), base_url="http://naver.test", client=client,
+                                 snapshots=SnapshotStore(str(tmp_path), mode="off"))
+
+
+class TestPrewarmScheduler:
+    def test_parse_tickers(self):
+        assert parse_tickers("005930, 000660 005930,,") == ["005930", "000660"]
+        assert parse_tickers("") == []
+
+    def test_disabled_without_tickers(self, tmp_path):
+        crawler = _crawler(tmp_path)
+        scheduler = PrewarmScheduler(lambda: crawler, [])
+
+        async def run():
+            scheduler.start()
+            await scheduler.stop()
+
+        asyncio.run(run())
+        assert not scheduler.enabled
+        assert scheduler.snapshot()["tickers"] == []
+
+    def test_cycle_warms_cache(self, tmp_path):
+        """한 바퀴 후 모든 종목이 캐시에 있고 이후 요청은 네트워크를 쓰지 않음"""
+        calls = []
+        crawler = _crawler(tmp_path, calls)
+        scheduler = PrewarmScheduler(lambda: crawler, ["005930", "000370", "005380"], concurrency=2)
+
+        async def run():
+            await scheduler.run_cycle()
+            return await crawler.fetch_financials("005930", ["2024.12"])
+
+        _, result = asyncio.run(run())
+
+        assert sorted(calls) == ["000370", "005380", "005930"]
+        assert result[0]["2024.12 - 매출액"] == 3008709
+        status = scheduler.snapshot()
+        assert status["cycles"] == 1
+        assert all(t["warm"] and t["last_success"] for t in status["tickers"])
+        assert scheduler.stats()["warm"] == 3
+
+    def test_cycle_refreshes_cached_tickers(self, tmp_path):
+        """이미 캐시에 있어도 매 바퀴 네트워크에서 다시 가져와 만료를 늦춤"""
+        calls = []
+        crawler = _crawler(tmp_path, calls)
+        scheduler = PrewarmScheduler(lambda: crawler, ["005930"])
+
+        async def run():
+            await scheduler.run_cycle()
+            await scheduler.run_cycle()
+
+        asyncio.run(run())
+        assert calls == ["005930", "005930"]
+
+    def test_failures_are_reported_per_ticker(self, tmp_path):
+        crawler = _crawler(tmp_path, fail=("000370",))
+        scheduler = PrewarmScheduler(lambda: crawler, ["005930", "000370"])
+
+        async def run():
+            await scheduler.run_cycle()
+            await scheduler.run_cycle()
+
+        asyncio.run(run())
+        by_code = {t["stock_code"]: t for t in scheduler.snapshot()["tickers"]}
+        assert by_code["005930"]["warm"] and by_code["005930"]["consecutive_failures"] == 0
+        assert not by_code["000370"]["warm"]
+        assert by_code["000370"]["consecutive_failures"] == 2
+        assert "404" in by_code["000370"]["last_error"]
+        assert scheduler.stats()["failing"] == 1
+
+    def test_background_loop_runs_and_stops(self, tmp_path):
+        calls = []
+        crawler = _crawler(tmp_path, calls)
+        scheduler = PrewarmScheduler(lambda: crawler, ["005930"], interval=0.01)
+
+        async def run():
+            scheduler.start()
+            while scheduler.cycles < 2:
+                await asyncio.sleep(0.01)
+            await scheduler.stop()
+
+        asyncio.run(run())
+        assert len(calls) >= 2
+        assert scheduler.snapshot()["next_run_at"] is None
+
+
+class TestPrewarmEndpoint:
+    def test_status_endpoint(self, tmp_path, monkeypatch):
+        crawler = _crawler(tmp_path)
+        scheduler = PrewarmScheduler(lambda: crawler, ["005930", "000370"])
+        asyncio.run(scheduler.run_cycle())
+        monkeypatch.setattr(services, "prewarm", scheduler)
+
+        response = TestClient(app).get("/api/financial/prewarm/status")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["enabled"] and body["cycles"] == 1
+        assert [t["stock_code"] for t in body["tickers"]] == ["005930", "000370"]
+        assert all(t["warm"] for t in body["tickers"])
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+from app.services.perplexity_service import PerplexityService
+from app.services.prompt_templates import PromptTemplate, PromptTemplateRegistry
+
+
+class TestPromptTemplate:
+    def test_render_fills_all_slots(self):
+        """자리표시자가 여러 번 나와도 모두 치환"""
+        template = PromptTemplate("t", "[company name] / YYYY-MM-DD\n{financial-json}\n[company name]")
+        assert template.slot_names == ["company_name", "date", "financial_json", "company_name"]
+        rendered = template.render(company_name="삼성전자", financial_json='{"a":1}', date="2025-01-01")
+        assert rendered == '삼성전자 / 2025-01-01\n{"a":1}\n삼성전자'
+
+    def test_values_are_not_substituted_again(self):
+        """치환된 값 안의 자리표시자 문자열은 그대로 둔다"""
+        template = PromptTemplate("t", "{financial-json} YYYY-MM-DD")
+        rendered = template.render(company_name="x", financial_json='["YYYY-MM-DD"]', date="2025-01-01")
+        assert rendered == '["YYYY-MM-DD"] 2025-01-01'
+
+    def test_matches_legacy_replace_chain(self):
+        """기본 템플릿 렌더링 결과가 기존 replace 체인과 같음"""
+        registry = PromptTemplateRegistry.from_env()
+        template = registry.get()
+        text = template.path.read_text(encoding="utf-8")
+        legacy = text.replace("[company name]", "LG").replace("{financial-json}", "[]").replace("YYYY-MM-DD", "2025-01-01")
+        assert template.render(company_name="LG", financial_json="[]", date="2025-01-01") == legacy
+
+
+class TestPromptTemplateRegistry:
+    def test_cached_without_reload(self, tmp_path):
+        """reload 가 꺼져 있으면 파일이 바뀌어도 로드된 템플릿 유지"""
+        path = tmp_path / "a.md"
+        path.write_text("v1 [company name]", encoding="utf-8")
+        registry = PromptTemplateRegistry()
+        registry.register("a", path)
+        registry.preload()
+        path.write_text("v2 [company name]", encoding="utf-8")
+        os.utime(path, (1, 1))
+        assert registry.get("a").render(company_name="x") == "v1 x"
+
+    def test_reload_on_mtime_change(self, tmp_path):
+        """reload 가 켜져 있으면 수정 시각이 바뀐 템플릿을 다시 읽음"""
+        path = tmp_path / "a.md"
+        path.write_text("v1 [company name]", encoding="utf-8")
+        registry = PromptTemplateRegistry(reload=True)
+        registry.register("a", path)
+        first = registry.get("a")
+        assert registry.get("a") is first
+        path.write_text("v2 [company name]", encoding="utf-8")
+        os.utime(path, (1, 1))
+        assert registry.get("a").render(company_name="x") == "v2 x"
+
+    def test_template_dir_from_env(self, tmp_path, monkeypatch):
+        """PROMPT_TEMPLATE_DIR 의 *.md 는 파일명으로 등록"""
+        (tmp_path / "short.md").write_text("[company name] 요약", encoding="utf-8")
+        monkeypatch.setenv("PROMPT_TEMPLATE_DIR", str(tmp_path))
+        registry = PromptTemplateRegistry.from_env()
+        assert "short" in registry.names()
+        assert registry.get("short").render(company_name="LG") == "LG 요약"
+
+    def test_unknown_template(self):
+        registry = PromptTemplateRegistry()
+        with pytest.raises(KeyError):
+            registry.get("missing")
+
+
+class TestBuildPrompt:
+    def test_compact_financial_json(self):
+        """재무 데이터는 공백 없는 JSON 으로 삽입"""
+        service = PerplexityService("test-key", model="sonar-pro")
+        prompt = service.build_prompt("삼성전자", [{"2024.12 - 매출액": 1}], stock_code="005930")
+        assert '[{"2024.12 - 매출액":1}]' in prompt
+        assert "종목코드: 005930" in prompt
+
+    def test_unknown_template_is_value_error(self):
+        """없는 템플릿 이름은 ValueError (API 에서 400)"""
+        service = PerplexityService("test-key", model="sonar-pro")
+        with pytest.raises(ValueError):
+            service.build_prompt("삼성전자", [], template="missing")
@@ -0,0 +1,136 @@
+import asyncio
+import gzip
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.container import services
+from app.services.report_files import OBJECTS_DIR, ReportFileStore, safe_report_name
+
+
+def _age(path, seconds):
+    """파일 수정 시각을 seconds 초 전으로"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestReportFileStore:
+    def test_safe_report_name(self):
+        assert safe_report_name(None) == "investment-report.md"
+        assert safe_report_name("../../etc/report") == "report.md"
+        assert safe_report_name("a\\..\\b.md") == "b.md"
+        with pytest.raises(ValueError):
+            safe_report_name("../.hidden.md")
+
+    def test_overwrite_is_atomic_and_leaves_no_temp_files(self, tmp_path):
+        store = ReportFileStore(str(tmp_path))
+        asyncio.run(store.save("report.md", "첫 번째"))
+        saved = asyncio.run(store.save("report.md", "두 번째"))
+
+        assert (tmp_path / "report.md").read_text(encoding="utf-8") == "두 번째"
+        assert saved.name == "report.md" and not saved.deduplicated
+        assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+        assert [info.name for info in store.entries()] == ["report.md"]
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        store = ReportFileStore(str(tmp_path))
+        first = asyncio.run(store.save("a.md", "# 같은 보고서"))
+        second = asyncio.run(store.save("b.md", "# 같은 보고서"))
+
+        assert second.deduplicated and first.sha256 == second.sha256
+        assert os.path.samefile(tmp_path / "a.md", tmp_path / "b.md")
+        assert len(list((tmp_path / OBJECTS_DIR).iterdir())) == 1
+        assert store.stats()["deduplicated"] == 1
+
+    def test_unreferenced_objects_are_collected(self, tmp_path):
+        store = ReportFileStore(str(tmp_path))
+        store.write("a.md", "old")
+        for blob in (tmp_path / OBJECTS_DIR).iterdir():
+            _age(blob, 3600)
+        store.write("a.md", "new")
+
+        blobs = list((tmp_path / OBJECTS_DIR).iterdir())
+        assert len(blobs) == 1 and blobs[0].read_text() == "new"
+
+    def test_gzip(self, tmp_path):
+        store = ReportFileStore(str(tmp_path), compress=True)
+        saved = store.write("report", "압축 " * 100)
+
+        assert saved.name == "report.md.gz"
+        assert gzip.decompress((tmp_path / "report.md.gz").read_bytes()).decode("utf-8") == "압축 " * 100
+        assert store.entries()[0].compressed
+
+    def test_retention_by_age_and_size(self, tmp_path):
+        store = ReportFileStore(str(tmp_path), dedupe=False, max_bytes=250, max_age=3600)
+        store.write("expired.md", "x" * 10)
+        _age(tmp_path / "expired.md", 7200)
+        store.write("old.md", "o" * 100)
+        _age(tmp_path / "old.md", 60)
+        store.write("mid.md", "m" * 100)
+        _age(tmp_path / "mid.md", 30)
+
+        # 만료된 보고서와, 크기 상한을 넘겨 가장 오래된 보고서가 지워진다
+        store.write("new.md", "n" * 100)
+        assert sorted(info.name for info in store.entries()) == ["mid.md", "new.md"]
+        assert store.stats()["pruned"] == 2
+
+    def test_deduplicated_names_keep_their_own_save_time(self, tmp_path):
+        """같은 원본을 공유하는 이름도 각자의 저장 시각으로 정렬/정리된다"""
+        now = {"t": 1000.0}
+        store = ReportFileStore(str(tmp_path), max_age=3600, clock=lambda: now["t"])
+        store.write("a.md", "같은 내용")
+        now["t"] += 3000
+        store.write("b.md", "다른 내용")
+        now["t"] += 100
+        store.write("c.md", "같은 내용")
+        assert [info.name for info in asyncio.run(store.list())] == ["c.md", "b.md", "a.md"]
+
+        # a.md 만 보관 기간을 넘겼다 (c.md 저장이 a.md 의 시각을 바꾸지 않음)
+        now["t"] += 1000
+        store.write("d.md", "새 내용")
+        assert sorted(info.name for info in store.entries()) == ["b.md", "c.md", "d.md"]
+        assert (tmp_path / "c.md").read_text(encoding="utf-8") == "같은 내용"
+        assert "a.md" not in ReportFileStore(str(tmp_path)).saved_times()
+
+    def test_just_saved_report_is_kept(self, tmp_path):
+        store = ReportFileStore(str(tmp_path), max_bytes=10)
+        store.write("big.md", "b" * 100)
+        assert [info.name for info in store.entries()] == ["big.md"]
+
+
+class TestReportFileEndpoints:
+    def test_save_list_download(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(services, "report_files", ReportFileStore(str(tmp_path)))
+        client = TestClient(app)
+
+        response = client.post("/api/analysis/save_markdown", json={"content": "# 보고서", "filename": "r1"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["saved"] is True and body["path"].endswith("r1.md")
+
+        listed = client.get("/api/analysis/reports").json()
+        assert [item["name"] for item in listed] == ["r1.md"]
+
+        download = client.get("/api/analysis/reports/r1.md")
+        assert download.status_code == 200
+        assert download.text == "# 보고서"
+        assert download.headers["content-type"].startswith("text/markdown")
+        assert client.get("/api/analysis/reports/missing.md").status_code == 404
+
+    def test_download_gzip(self, tmp_path, monkeypatch):
+        store = ReportFileStore(str(tmp_path), compress=True)
+        store.write("r1.md", "# 압축 보고서")
+        monkeypatch.setattr(services, "report_files", store)
+
+        response = TestClient(app).get("/api/analysis/reports/r1.md.gz")
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "# 압축 보고서"
+
+    def test_invalid_filename(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(services, "report_files", ReportFileStore(str(tmp_path)))
+        response = TestClient(app).post("/api/analysis/save_markdown", json={"content": "x", "filename": ".md"})
+        assert response.status_code == 400
@@ -0,0 +1,159 @@
+import asyncio
+
+from app.api import analysis as analysis_api
+from app.models.analysis import AnalysisRequest
+from app.services.container import services
+from app.services.report_lookup import RecentReportLookup
+from app.services.supabase_service import SupabaseReportStore
+
+PERIODS = ["2024.12", "2025.06"]
+TEMPLATE = "invest-by-perplexity-api2"
+
+
+def _report(**overrides):
+    report = {
+        "analysis": "저장된 분석",
+        "financial_table": "| 항목 |",
+        "citations": ["https://example.com"],
+        "model": "sonar-pro",
+        "usage": {"total_tokens": 1200},
+        "created": 1760000000,
+        "template": TEMPLATE,
+        "compare_periods": PERIODS,
+    }
+    report.update(overrides)
+    return report
+
+
+class FakeFetch:
+    def __init__(self, rows=None, error=None):
+        self.rows = rows or []
+        self.error = error
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error:
+            raise self.error
+        return self.rows
+
+
+class TestRecentReportLookup:
+    def test_remote_hit_is_cached_locally(self):
+        fetch = FakeFetch([{"report": _report(), "created_at": "2025-10-09T08:00:00+00:00"}])
+        lookup = RecentReportLookup(max_age=10**9, fetch=fetch)
+
+        async def run():
+            first = await lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)
+            second = await lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first["analysis"] == second["analysis"] == "저장된 분석"
+        assert len(fetch.calls) == 1
+        assert fetch.calls[0]["market"] == "KOSPI" and fetch.calls[0]["model"] == "sonar-pro"
+        # 템플릿과 비교 기간도 조회 조건으로 넘긴다
+        assert fetch.calls[0]["template"] == TEMPLATE and fetch.calls[0]["compare_periods"] == PERIODS
+        assert lookup.stats()["remote_hits"] == 1 and lookup.stats()["local_hits"] == 1
+
+    def test_skips_rows_with_other_periods_or_template(self):
+        fetch = FakeFetch([
+            {"report": _report(compare_periods=["2023.12"])},
+            {"report": _report(template="other")},
+            {"report": {"analysis": "이전 형식", "model": "sonar-pro"}},
+        ])
+        lookup = RecentReportLookup(fetch=fetch)
+        assert asyncio.run(lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)) is None
+        assert lookup.stats()["misses"] == 1
+
+    def test_freshness_window(self):
+        now = [1000.0]
+        fetch = FakeFetch()
+        lookup = RecentReportLookup(max_age=60, fetch=fetch, clock=lambda: now[0])
+        lookup.remember("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS, _report())
+        assert asyncio.run(lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)) is not None
+        assert fetch.calls == []
+
+        now[0] += 61
+        assert asyncio.run(lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)) is None
+        # Supabase 조회는 창(max_age) 안의 행만 요청
+        assert fetch.calls[0]["since"] == now[0] - 60
+
+    def test_lru_bound(self):
+        lookup = RecentReportLookup(max_entries=2, fetch=FakeFetch())
+        for code in ("000001", "000002", "000003"):
+            lookup.remember("KOSPI", code, "sonar-pro", TEMPLATE, PERIODS, _report())
+        assert lookup.stats()["entries"] == 2
+        assert asyncio.run(lookup.find("KOSPI", "000001", "sonar-pro", TEMPLATE, PERIODS)) is None
+
+    def test_errors_fall_through(self):
+        lookup = RecentReportLookup(fetch=FakeFetch(error=RuntimeError("boom")))
+        assert asyncio.run(lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)) is None
+        assert lookup.stats()["errors"] == 1
+
+    def test_disabled(self):
+        fetch = FakeFetch([{"report": _report()}])
+        lookup = RecentReportLookup(max_age=0, fetch=fetch)
+        assert asyncio.run(lookup.find("KOSPI", "005930", "sonar-pro", TEMPLATE, PERIODS)) is None
+        assert fetch.calls == []
+
+
+class FakeQuery:
+    """supabase 쿼리 빌더 호출을 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args))
+            return self
+        return record
+
+    def execute(self):
+        return type("Response", (), {"data": [], "error": None})()
+
+
+class TestFindRecentReports:
+    def test_filters_in_query(self, monkeypatch):
+        query = FakeQuery()
+        monkeypatch.setattr(SupabaseReportStore, "get_client", classmethod(lambda cls: query))
+        SupabaseReportStore.find_recent_reports(
+            market="KOSPI", symbol="005930", model="sonar-pro", template=TEMPLATE, compare_periods=PERIODS, since=0
+        )
+        assert ("eq", ("report->>template", TEMPLATE)) in query.calls
+        assert ("eq", ("report->compare_periods", '["2024.12","2025.06"]')) in query.calls
+        assert ("limit", (1,)) in query.calls
+
+
+class TestAnalysisReuse:
+    def _request(self, **overrides):
+        data = {
+            "stock_code": "005930", "stock_name": "삼성전자", "compare_periods": PERIODS,
+            "api_key": "test-key", "model": "sonar-pro",
+        }
+        data.update(overrides)
+        return AnalysisRequest(**data)
+
+    def test_saved_report_skips_generation(self, monkeypatch):
+        """저장된 보고서가 있으면 크롤링/Perplexity 호출 없이 반환"""
+        fetch = FakeFetch([{"report": _report()}])
+        monkeypatch.setattr(services, "report_lookup", RecentReportLookup(fetch=fetch))
+        monkeypatch.setattr(SupabaseReportStore, "configured", classmethod(lambda cls: True))
+
+        async def no_crawl(request):
+            raise AssertionError("crawl should be skipped")
+
+        monkeypatch.setattr(analysis_api, "_crawl_financial_data", no_crawl)
+        response = asyncio.run(analysis_api._run_analysis(self._request()))
+        assert response.analysis == "저장된 분석"
+        assert response.usage["cache_source"] == "supabase"
+        assert response.usage["total_tokens"] == 1200
+
+    def test_force_refresh_bypasses_lookup(self, monkeypatch):
+        fetch = FakeFetch([{"report": _report()}])
+        monkeypatch.setattr(services, "report_lookup", RecentReportLookup(fetch=fetch))
+        monkeypatch.setattr(SupabaseReportStore, "configured", classmethod(lambda cls: True))
+        saved = asyncio.run(analysis_api._find_saved_report(self._request(force_refresh=True), "sonar-pro"))
+        assert saved is None
+        assert fetch.calls == []
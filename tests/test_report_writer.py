@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+
+from app.services.report_writer import ReportWriter
+
+
+class FakeInsert:
+    """insert 호출을 기록하고, 앞의 fail_times 회는 실패하는 가짜 저장 함수"""
+
+    def __init__(self, fail_times: int = 0, delay: float = 0.0) -> None:
+        self.fail_times = fail_times
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, rows):
+        with self._lock:
+            self.calls.append(list(rows))
+            attempt = len(self.calls)
+        if self.delay:
+            threading.Event().wait(self.delay)
+        if attempt <= self.fail_times:
+            raise RuntimeError("temporary failure")
+
+
+def _writer(insert, tmp_path, **kwargs) -> ReportWriter:
+    kwargs.setdefault("flush_interval", 0.05)
+    kwargs.setdefault("backoff", 0.001)
+    return ReportWriter(insert=insert, dead_letter_path=str(tmp_path / "dead.jsonl"), **kwargs)
+
+
+class TestReportWriter:
+    def test_batches_rows(self, tmp_path):
+        """대기열에 쌓인 행은 batch_size 단위의 multi-row insert 로 저장"""
+        insert = FakeInsert()
+        writer = _writer(insert, tmp_path, batch_size=4)
+
+        async def run():
+            for i in range(10):
+                assert writer.enqueue({"symbol": str(i)})
+            await asyncio.sleep(0.2)
+            await writer.stop()
+
+        asyncio.run(run())
+        assert [len(rows) for rows in insert.calls] == [4, 4, 2]
+        assert [row["symbol"] for rows in insert.calls for row in rows] == [str(i) for i in range(10)]
+        stats = writer.stats()
+        assert stats["written"] == 10 and stats["batches"] == 3 and stats["queue_depth"] == 0
+
+    def test_retry_then_success(self, tmp_path):
+        insert = FakeInsert(fail_times=2)
+        writer = _writer(insert, tmp_path, max_retries=3)
+
+        async def run():
+            writer.enqueue({"symbol": "005930"})
+            await writer.stop()
+
+        asyncio.run(run())
+        assert len(insert.calls) == 3
+        assert writer.stats()["retries"] == 2
+        assert writer.stats()["written"] == 1
+        assert not (tmp_path / "dead.jsonl").exists()
+
+    def test_dead_letter_after_retries(self, tmp_path):
+        insert = FakeInsert(fail_times=100)
+        writer = _writer(insert, tmp_path, max_retries=2)
+
+        async def run():
+            writer.enqueue({"symbol": "005930", "report": {"analysis": "본문"}})
+            await writer.stop()
+
+        asyncio.run(run())
+        lines = (tmp_path / "dead.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        entry = json.loads(lines[0])
+        assert entry["row"]["report"]["analysis"] == "본문"
+        assert entry["error"] == "temporary failure"
+        assert writer.stats()["dead_lettered"] == 1
+
+    def test_queue_full_spills_to_dead_letter(self, tmp_path):
+        insert = FakeInsert()
+        writer = _writer(insert, tmp_path, max_queue=2, flush_interval=10)
+
+        async def run():
+            # flush 태스크가 첫 행을 꺼내기 전에 대기열을 채운다
+            results = [writer.enqueue({"symbol": str(i)}) for i in range(3)]
+            await writer.stop()
+            return results
+
+        assert asyncio.run(run()) == [True, True, False]
+        assert writer.stats()["dead_lettered"] == 1
+        assert sum(len(rows) for rows in insert.calls) == 2
+
+    def test_stop_waits_for_in_flight_batch(self, tmp_path):
+        """저장 중인 배치와 아직 모으는 중인 행 모두 종료 전에 저장"""
+        insert = FakeInsert(delay=0.1)
+        writer = _writer(insert, tmp_path, batch_size=1, flush_interval=0)
+
+        async def run():
+            writer.enqueue({"symbol": "a"})
+            await asyncio.sleep(0.02)  # 첫 배치 저장 중
+            writer.enqueue({"symbol": "b"})
+            await writer.stop()
+
+        asyncio.run(run())
+        assert writer.stats()["written"] == 2
+
+    def test_stop_keeps_row_dequeued_during_cancel(self, tmp_path):
+        """배치를 모으는 중 꺼낸 직후 취소되어도 그 행은 저장"""
+        insert = FakeInsert()
+        writer = _writer(insert, tmp_path, batch_size=10, flush_interval=10)
+
+        async def run():
+            writer.enqueue({"symbol": "a"})
+            await asyncio.sleep(0.02)  # 첫 행을 꺼내 다음 행을 기다리는 중
+            writer.enqueue({"symbol": "b"})
+            await writer.stop()
+
+        asyncio.run(run())
+        assert [row["symbol"] for rows in insert.calls for row in rows] == ["a", "b"]
+
+    def test_enqueue_returns_immediately(self, tmp_path):
+        """응답 경로는 저장 지연을 기다리지 않는다"""
+        insert = FakeInsert(delay=0.3)
+        writer = _writer(insert, tmp_path)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            writer.enqueue({"symbol": "005930"})
+            elapsed = loop.time() - start
+            await writer.stop()
+            return elapsed
+
+        assert asyncio.run(run()) < 0.05
+        assert writer.stats()["written"] == 1
@@ -0,0 +1,271 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.container import services
+from app.services.naver_crawler import NaverFinancialCrawler
+from app.services.perplexity_service import PerplexityService
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitError,
+    TokenBucket,
+    UpstreamPolicy,
+    get_upstream_policy,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _policy(**kwargs) -> UpstreamPolicy:
+    kwargs.setdefault("backoff", 0)
+    return UpstreamPolicy("test", **kwargs)
+
+
+def _call(policy: UpstreamPolicy, handler, idempotent: bool = True) -> httpx.Response:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        async with client:
+            return await policy.call("key", lambda: client.get("http://upstream.test/"), idempotent=idempotent)
+
+    return asyncio.run(run())
+
+
+class TestTokenBucket:
+    def test_burst_then_spaced(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    def test_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=1, clock=clock)
+        assert bucket.reserve() == 0.0
+        clock.now += 1.0
+        assert bucket.reserve() == 0.0
+
+    def test_max_wait_rejects_without_reserving(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=1, clock=clock)
+        bucket.reserve()
+        with pytest.raises(RateLimitError):
+            bucket.reserve(max_wait=0.5)
+        assert bucket.reserve(max_wait=2.0) == 1.0
+
+    def test_pause(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, burst=10, clock=clock)
+        bucket.pause(3.0)
+        assert bucket.reserve() == 3.0
+
+    def test_unlimited(self):
+        bucket = TokenBucket(rate=0, burst=1)
+        assert all(bucket.reserve() == 0.0 for _ in range(100))
+
+
+class TestCircuitBreaker:
+    def test_open_half_open_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError) as info:
+            breaker.before_call()
+        assert info.value.retry_after == 10
+
+        clock.now += 10
+        breaker.before_call()  # 시험 호출 하나만 통과
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+        breaker.before_call()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now += 5
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.opens == 2
+
+
+class TestRetryAfter:
+    def test_seconds_and_date(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == 10.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestUpstreamPolicy:
+    def test_retries_transient_status(self):
+        statuses = iter([503, 502, 200])
+        response = _call(_policy(max_retries=2), lambda request: httpx.Response(next(statuses)))
+        assert response.status_code == 200
+
+    def test_returns_last_response_when_retries_exhausted(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        policy = _policy(max_retries=1)
+        assert _call(policy, handler).status_code == 503
+        assert len(calls) == 2
+        assert policy.stats()["retries"] == 1
+
+    def test_long_retry_after_is_not_waited(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429, headers={"Retry-After": "120"})
+
+        policy = _policy(max_retries=3, max_backoff=5, max_wait=1)
+        assert _call(policy, handler).status_code == 429
+        assert len(calls) == 1
+        # 같은 키의 다음 호출은 Retry-After 동안 멈추므로 max_wait 를 넘어 바로 거절
+        with pytest.raises(RateLimitError):
+            _call(policy, handler)
+        assert len(calls) == 1
+
+    def test_short_retry_after_is_honored(self):
+        statuses = iter([429, 200])
+        response = _call(_policy(max_retries=1), lambda request: httpx.Response(next(statuses), headers={"Retry-After": "0"}))
+        assert response.status_code == 200
+
+    def test_non_idempotent_read_errors_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ReadTimeout("slow", request=request)
+
+        with pytest.raises(httpx.ReadTimeout):
+            _call(_policy(max_retries=3), handler, idempotent=False)
+        assert len(calls) == 1
+
+    def test_non_idempotent_5xx_not_retried(self):
+        """비멱등 요청은 5xx 를 재시도하지 않고, Retry-After 가 있는 429 만 재시도"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(502)
+
+        assert _call(_policy(max_retries=3), handler, idempotent=False).status_code == 502
+        assert len(calls) == 1
+
+        statuses = iter([429, 200])
+        response = _call(
+            _policy(max_retries=1),
+            lambda request: httpx.Response(next(statuses), headers={"Retry-After": "0"}),
+            idempotent=False,
+        )
+        assert response.status_code == 200
+
+        calls.clear()
+
+        def no_header(request):
+            calls.append(request)
+            return httpx.Response(429)
+
+        assert _call(_policy(max_retries=3), no_header, idempotent=False).status_code == 429
+        assert len(calls) == 1
+
+    def test_connect_errors_retried(self):
+        attempts = iter([True, False])
+
+        def handler(request):
+            if next(attempts):
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        assert _call(_policy(max_retries=1), handler, idempotent=False).status_code == 200
+
+    def test_circuit_fails_fast(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        policy = _policy(max_retries=0, failure_threshold=2, reset_timeout=60)
+        _call(policy, handler)
+        _call(policy, handler)
+        with pytest.raises(CircuitOpenError):
+            _call(policy, handler)
+        assert len(calls) == 2
+        assert policy.stats()["circuit_open"] == 1
+
+    def test_rate_limit_rejects_beyond_max_wait(self):
+        policy = _policy(rate=1.0, burst=1, max_wait=0.1)
+        _call(policy, lambda request: httpx.Response(200))
+        with pytest.raises(RateLimitError):
+            _call(policy, lambda request: httpx.Response(200))
+        assert policy.stats()["rejected"] == 1
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("DEMO_RATE_LIMIT", "3.5")
+        monkeypatch.setenv("DEMO_CIRCUIT_THRESHOLD", "0")
+        policy = UpstreamPolicy.from_env("demo", rate=1.0, burst=4)
+        assert policy.rate == 3.5 and policy.burst == 4
+        assert policy.breaker.failure_threshold == 0
+
+
+class TestUpstreamIntegration:
+    def test_perplexity_429_becomes_rate_limit_error(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(429, headers={"Retry-After": "90"}, json={"error": {"message": "slow down"}})
+        ))
+        service = PerplexityService("test-key", model="sonar-pro", client=client)
+        with pytest.raises(RateLimitError) as info:
+            asyncio.run(service.generate_investment_analysis("삼성전자", [], ["2024.12"], use_cache=False))
+        assert info.value.retry_after == 90
+
+    def test_naver_circuit_opens(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        crawler = NaverFinancialCrawler(save_dir=str(tmp_path), base_url="http://naver.test", client=client)
+        threshold = get_upstream_policy("naver").breaker.failure_threshold
+
+        async def run():
+            for code in range(threshold + 1):
+                await crawler.fetch_frame(f"{code:06d}")
+
+        # 연속 실패가 threshold 회가 되면 더 호출하지 않고 503 용 오류를 전달
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(run())
+        assert len(calls) == threshold
+
+    def test_api_maps_busy_errors(self, monkeypatch):
+        async def busy(stock_code, compare_periods):
+            raise CircuitOpenError("naver 업스트림 장애", retry_after=12.3)
+
+        monkeypatch.setattr(services.crawler, "fetch_table", busy)
+        response = TestClient(app).post("/api/financial/crawl", json={
+            "stock_code": "005930", "stock_name": "삼성전자", "compare_periods": ["2024.12"],
+        })
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "13"
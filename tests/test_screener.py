@@ -0,0 +1,140 @@
+import math
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.container import services
+from app.services.financial_cache import FinancialDataCache
+from app.services.screener import Screener, ticker_block
+
+ANNUAL = ["2022.12", "2023.12", "2024.12", "2025.12(E)"]
+QUARTERS = ["2024.12", "2025.03", "2025.06", "2025.09(E)"]
+
+
+def _frame(roe, per, sales=("1,000", "1,100", "1,200", "1,300")):
+    """네이버 기업실적분석 표와 같은 모양의 DataFrame (연간 4개 + 분기 4개)"""
+    columns = ["주요재무정보"] + [f"최근 연간 실적.{i}" for i in range(4)] + [f"최근 분기 실적.{i}" for i in range(4)]
+    rows = [
+        ["주요재무정보", *ANNUAL, *QUARTERS],
+        ["주요재무정보"] + ["IFRS연결"] * 8,
+        ["매출액", *sales, "300", "310", "320", "330"],
+        ["ROE(지배주주)", *roe, "1", "2", "3", "4"],
+        ["PER(배)", *per, "-", "-", "-", "-"],
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _screener(frames):
+    now = {"t": 1000.0}
+    cache = FinancialDataCache(ttl=60, clock=lambda: now["t"])
+    for code, df in frames.items():
+        cache.put(code, df)
+    return Screener(lambda: cache), cache, now
+
+
+FRAMES = {
+    "000001": _frame(["10", "12", "15.5", "20"], ["8", "9", "10", "7"]),
+    "000002": _frame(["5", "6", "7", "30"], ["20", "25", "30", "15"]),
+    "000003": _frame(["20", "18", "-", "25"], ["5", "6", "-", "4"]),
+}
+
+
+class TestTickerBlock:
+    def test_rows_per_period(self):
+        block = ticker_block("000001", FRAMES["000001"])
+        assert block.periods == ANNUAL + QUARTERS
+        assert block.freqs == ["Y"] * 4 + ["Q"] * 4
+        assert block.latest.tolist() == [False, False, True, False, False, False, True, False]
+        assert block.metrics == ["매출액", "ROE(지배주주)", "PER(배)"]
+        assert block.values[:4, 0].tolist() == [1000.0, 1100.0, 1200.0, 1300.0]
+        assert math.isnan(block.values[-1, 2])
+
+
+class TestScreener:
+    def test_filter_sort_limit_on_latest_actual(self):
+        screener, _, _ = _screener(FRAMES)
+        result = screener.screen([("ROE", ">=", 6)], sort_by="PER", descending=False, limit=1)
+        # 000003 은 최신 확정치(2024.12) 값이 없어 제외
+        assert result.universe == 3 and result.matched == 2
+        assert result.metrics == ["ROE(지배주주)", "PER(배)"]
+        assert result.rows["stock_code"].tolist() == ["000001"]
+        assert result.rows["PER(배)"].tolist() == [10.0]
+
+    def test_explicit_period_and_tickers(self):
+        screener, _, _ = _screener(FRAMES)
+        result = screener.screen(
+            [("ROE", ">", 15)], sort_by="ROE", period="2022.12", tickers=["000001", "000003"], metrics=["매출액"]
+        )
+        assert result.universe == 2
+        assert result.rows["stock_code"].tolist() == ["000003"]
+        assert result.rows.columns.tolist() == ["stock_code", "period", "매출액"]
+
+    def test_sort_puts_missing_values_last(self):
+        screener, _, _ = _screener(FRAMES)
+        result = screener.screen(sort_by="PER", period="2024.12")
+        assert result.rows["stock_code"].tolist() == ["000002", "000001", "000003"]
+
+    def test_quarterly(self):
+        screener, _, _ = _screener(FRAMES)
+        result = screener.screen([("매출액", "==", 320)], freq="Q")
+        assert result.matched == 3
+        assert set(result.rows["period"]) == {"2025.06"}
+
+    def test_unknown_metric(self):
+        screener, _, _ = _screener(FRAMES)
+        with pytest.raises(ValueError):
+            screener.screen([("없는지표", ">", 0)])
+
+    def test_panel_rebuilt_only_when_cache_changes(self):
+        screener, cache, now = _screener(FRAMES)
+        screener.screen()
+        screener.screen()
+        assert screener.builds == 1
+
+        cache.put("000004", _frame(["40", "40", "40", "40"], ["1", "1", "1", "1"]))
+        result = screener.screen(sort_by="ROE")
+        assert screener.builds == 2
+        assert result.rows["stock_code"].iloc[0] == "000004"
+
+        # 만료된 종목은 다음 조회에서 빠진다
+        now["t"] += 120
+        assert screener.screen().universe == 0
+        assert screener.builds == 3
+
+    def test_rebuild_tolerates_entry_removed_during_build(self, monkeypatch):
+        """패널을 만드는 사이 캐시에서 빠진 종목이 있어도 재구성 실패 없음"""
+        screener, cache, _ = _screener(FRAMES)
+        age = cache.age
+        monkeypatch.setattr(cache, "age", lambda key: None if key == "000002" else age(key))
+        assert screener.screen().universe == 3
+        assert screener.builds == 1
+
+
+class TestScreenEndpoint:
+    def test_screen_endpoint(self, monkeypatch):
+        screener, cache, _ = _screener(FRAMES)
+        monkeypatch.setattr(services, "screener", screener)
+
+        response = TestClient(app).post("/api/financial/screen", json={
+            "filters": [{"metric": "ROE", "op": ">", "value": 6}],
+            "sort_by": "ROE",
+        })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["metrics"] == ["ROE(지배주주)"]
+        assert body["rows"] == [
+            {"stock_code": "000001", "period": "2024.12", "values": [15.5]},
+            {"stock_code": "000002", "period": "2024.12", "values": [7.0]},
+        ]
+        assert body["universe"] == 3 and body["matched"] == 2
+        assert body["cache_version"] == cache.version
+
+    def test_screen_endpoint_bad_metric(self, monkeypatch):
+        screener, _, _ = _screener(FRAMES)
+        monkeypatch.setattr(services, "screener", screener)
+
+        response = TestClient(app).post("/api/financial/screen", json={"sort_by": "없는지표"})
+        assert response.status_code == 400
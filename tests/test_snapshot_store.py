@@ -0,0 +1,100 @@
+import asyncio
+import os
+import time
+
+import httpx
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from app.services import snapshot_store
+from app.services.naver_crawler import NaverFinancialCrawler
+from app.services.snapshot_store import SnapshotStore
+from benchmarks.stubs import FIXTURE_DIR
+
+
+def _frame() -> pd.DataFrame:
+    return pd.read_csv(FIXTURE_DIR / "005930_financials.csv", encoding="utf-8-sig", dtype=str)
+
+
+class TestSnapshotStore:
+    def test_csv_roundtrip(self, tmp_path):
+        """CSV 모드: 기존 경로에 최신 스냅샷만 보관"""
+        store = SnapshotStore(str(tmp_path), mode="csv")
+        path = store.write("005930", _frame())
+        assert path == os.path.join(str(tmp_path), "005930_financials.csv")
+        store.write("005930", _frame())
+        assert len(store.history("005930")) == 1
+        assert_frame_equal(store.latest("005930"), _frame())
+
+    def test_latest_respects_max_age(self, tmp_path):
+        store = SnapshotStore(str(tmp_path), mode="csv")
+        path = store.write("005930", _frame(), fetched_at=time.time() - 3600)
+        # 파일 mtime 이 아니라 기록한 수집 시각 기준
+        os.utime(path)
+        assert store.latest("005930", max_age=600) is None
+        assert store.latest("005930", max_age=7200) is not None
+
+    def test_csv_not_written_by_store_is_ignored(self, tmp_path):
+        """체크아웃/배포로 생긴 CSV (수집 시각 기록 없음)는 mtime 이 최신이어도 스냅샷이 아님"""
+        _frame().to_csv(tmp_path / "005930_financials.csv", index=False, encoding="utf-8-sig")
+        store = SnapshotStore(str(tmp_path), mode="csv")
+        assert store.history("005930") == []
+        assert store.latest("005930", max_age=600) is None
+
+    def test_off_mode(self, tmp_path):
+        store = SnapshotStore(str(tmp_path), mode="off")
+        assert store.write("005930", _frame()) is None
+        assert store.path_for("005930") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            SnapshotStore(str(tmp_path), mode="xlsx")
+
+    def test_columnar_falls_back_to_csv_without_pyarrow(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot_store, "pyarrow", None)
+        assert SnapshotStore(str(tmp_path), mode="parquet").mode == "csv"
+
+    def test_schedule_writes_in_background(self, tmp_path):
+        """schedule 은 즉시 경로를 반환하고 flush 후 파일이 존재"""
+        store = SnapshotStore(str(tmp_path), mode="csv")
+
+        async def run():
+            path = store.schedule("005930", _frame())
+            await store.flush()
+            return path
+
+        path = asyncio.run(run())
+        assert os.path.exists(path)
+        assert store.stats()["writes"] == 1
+
+    @pytest.mark.parametrize("mode", ["parquet", "feather"])
+    def test_columnar_history_is_append_only(self, tmp_path, mode):
+        pytest.importorskip("pyarrow")
+        store = SnapshotStore(str(tmp_path), mode=mode, max_history=2)
+        now = time.time()
+        for offset in (300, 200, 100):
+            store.write("005930", _frame(), fetched_at=now - offset)
+        history = store.history("005930")
+        assert [round(now - info.fetched_at) for info in history] == [100, 200]
+        assert store.path_for("005930") == history[0].path
+        assert_frame_equal(store.read(history[0]), _frame())
+
+
+class TestCrawlerSnapshots:
+    def test_fresh_snapshot_feeds_cache(self, tmp_path):
+        """캐시 유효 시간 안의 스냅샷이 있으면 네트워크 요청 없이 응답"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("network should not be used")
+
+        store = SnapshotStore(str(tmp_path), mode="csv")
+        store.write("005930", _frame())
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        crawler = NaverFinancialCrawler(save_dir=str(tmp_path), client=client, snapshots=store)
+
+        path, result = asyncio.run(crawler.fetch_financials("005930", ["2024.12"]))
+
+        assert path == store.path_for("005930")
+        assert result[0]["2024.12 - 매출액"] == 3008709
+        assert "005930" in crawler.cache
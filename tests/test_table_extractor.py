@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+from pandas.testing import assert_frame_equal
+
+from app.services.naver_crawler import NaverFinancialCrawler
+from app.services.table_extractor import extract_financial_table, slice_financial_section
+from benchmarks.stubs import load_naver_pages
+
+PAGES = load_naver_pages()
+
+
+def _read_html_oracle(page: str) -> pd.DataFrame:
+    """기존 방식: BeautifulSoup 으로 영역 선택 후 pd.read_html"""
+    section = BeautifulSoup(page, "html.parser").select_one("div.section.cop_analysis div.sub_section")
+    return pd.read_html(StringIO(str(section)), header=0)[0].dropna(axis=1, how="all")
+
+
+def _page(table: str) -> str:
+    return (
+        "<html><body><div class='section trade_compare'><table><tr><td>noise</td></tr></table></div>"
+        f"<div class='section cop_analysis'><div class='sub_section'>{table}</div></div>"
+        "<div><table><tr><td>after</td></tr></table></div></body></html>"
+    )
+
+
+class TestTableExtractor:
+    @pytest.mark.parametrize("code", sorted(PAGES))
+    def test_matches_read_html_on_fixtures(self, code):
+        """픽스처 페이지에서 기존 read_html 결과와 같은 DataFrame"""
+        assert_frame_equal(extract_financial_table(PAGES[code]), _read_html_oracle(PAGES[code]))
+
+    def test_colspan_rowspan_br_and_hidden(self):
+        """rowspan/colspan 복제, <br> 줄바꿈, display:none 제거, 천 단위 구분자"""
+        page = _page(
+            "<table><thead>"
+            "<tr><th rowspan='2'>항목</th><th colspan='2'>연간<br>실적</th><th style='display: none'>숨김</th></tr>"
+            "<tr><th>2023.12</th><th>2024.12</th></tr>"
+            "</thead><tbody>"
+            "<tr><th>매출액</th><td>1,000</td><td>  2,500\n </td></tr>"
+            "<tr><th>영업이익</th><td>-</td><td></td></tr>"
+            "</tbody></table>"
+        )
+        assert_frame_equal(extract_financial_table(page), _read_html_oracle(page))
+
+    def test_slice_stops_at_first_table(self):
+        fragment = slice_financial_section(_page("<table><tr><td>a</td></tr></table>"))
+        assert fragment.startswith("<div class='section cop_analysis'>")
+        assert fragment.endswith("</table>")
+        assert "after" not in fragment
+
+    def test_section_requires_both_classes(self):
+        """cop_analysis 클래스만 있는 다른 영역은 건너뛰고 div.section.cop_analysis 를 찾는다"""
+        decoy = "<div class='cop_analysis_wrap'><div class='cop_analysis'><div class='sub_section'>" \
+                "<table><tr><th>가짜</th></tr><tr><td>1</td></tr></table></div></div></div>"
+        page = _page("<table><tr><th>항목</th></tr><tr><td>매출액</td></tr></table>").replace("<body>", "<body>" + decoy)
+        assert "가짜" not in slice_financial_section(page)
+        assert_frame_equal(extract_financial_table(page), _read_html_oracle(page))
+
+    def test_missing_section(self):
+        assert extract_financial_table("<html><body><table><tr><td>x</td></tr></table></body></html>") is None
+        with pytest.raises(ValueError):
+            NaverFinancialCrawler._parse_financial_table("<html><body></body></html>")